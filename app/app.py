@@ -5,15 +5,36 @@ from dotenv import load_dotenv
 import os
 
 # Import our modules
-from models.schemas import SessionKeys, RiskAssessment, ScoreAssessment
-from utils.data_loader import load_data, load_sample_data, get_controls_for_risk
+from models.schemas import (SessionKeys, RiskAssessment, ScoreAssessment, ImplementationStatus,
+                            IMPLEMENTATION_STATUS_LABELS)
+from utils.data_loader import (load_data, load_sample_data, load_risk_index, load_control_coverage,
+                               load_scoring_index, get_controls_for_risk, get_register)
 from utils.llm_utils import (
-    get_llm_capability_analysis,
-    get_llm_risk_analysis,
     get_application_description,
     analyze_public_repo,
 )
-from utils.session_utils import initialize_session_state, initialize_control_implementation
+from utils.diagnostics import report_diagnostics
+from utils.session_utils import (
+    JOB_CANCEL_PAGES,
+    JOB_PAGES,
+    initialize_session_state,
+    get_control_status_table,
+    build_assessment_from_session,
+    restore_assessment_to_session,
+    get_store_owner,
+    get_tracked_job_id,
+    track_job,
+    untrack_job,
+    reattach_job_from_query_params,
+    build_risk_job_params,
+    restore_job_inputs,
+    apply_job_result,
+)
+from core.jobs import CANCELLED, FAILED, SUCCEEDED, get_job_runner, job_key
+from core.coverage import WEIGHTINGS
+from core.risk_view import risk_page_model
+from core.export import EXPORT_FORMATS
+from core.store import get_assessment_store
 # Import will be done inside the function to avoid relative import issues
 from datetime import datetime
 
@@ -305,11 +326,8 @@ def capability_identification_page():
     
     # Initialize capability analysis if not done
     if SessionKeys.CAPABILITY_ANALYSIS not in st.session_state:
-        st.info("🔍 Analyzing application to identify applicable capabilities...")
-        analysis_result = get_llm_capability_analysis(st.session_state.application_info, capabilities)
-        st.session_state[SessionKeys.CAPABILITY_ANALYSIS] = analysis_result
-        st.session_state[SessionKeys.SELECTED_CAPABILITIES] = analysis_result.applicable_capabilities.copy()
-        st.rerun()
+        run_llm_job('capabilities', {'application_info': dict(st.session_state.application_info)},
+                    "🔍 Analyzing application to identify applicable capabilities...")
     
     # Show AI reasoning
     if SessionKeys.CAPABILITY_ANALYSIS in st.session_state:
@@ -411,57 +429,40 @@ def risk_assessment_page():
         st.stop()
     
     # Determine applicable risks based on selected capabilities
+    selected_capabilities = st.session_state[SessionKeys.SELECTED_CAPABILITIES]
     if SessionKeys.APPLICABLE_RISKS not in st.session_state:
-        # Get ALL component and design risks
-        component_design_risk_ids = []
-        for risk_id, risk_data in risks.items():
-            if (risk_data.get('components') or risk_data.get('design')) and not risk_data.get('capabilities'):
-                component_design_risk_ids.append(risk_id)
-
-        # Get ALL capability-specific risks for selected capabilities
-        capability_risk_ids = []
-        for risk_id, risk_data in risks.items():
-            if risk_data.get('capabilities'):
-                # Check if any of the risk's capabilities are in the selected capabilities
-                risk_capabilities = risk_data.get('capabilities', [])
-                if any(cap_id in st.session_state[SessionKeys.SELECTED_CAPABILITIES] for cap_id in risk_capabilities):
-                    capability_risk_ids.append(risk_id)
-
-        # Combine all applicable risks
-        all_applicable_risks = component_design_risk_ids + capability_risk_ids
-        st.session_state[SessionKeys.APPLICABLE_RISKS] = all_applicable_risks
-        
+        # Component/design risks plus capability-specific risks for the selection
+        all_applicable_risks = load_risk_index().applicable_risks(selected_capabilities)
         
         # Now get LLM contextualization for all these risks
-        st.info("🔍 Analyzing risks and generating contextualization... This can take up to a couple of minutes.")
-        analysis_result = get_llm_risk_analysis(
-            st.session_state.application_info,
-            st.session_state[SessionKeys.SELECTED_CAPABILITIES],
-            capabilities,
-            risks,
-            components,
-            design,
-            all_applicable_risks
-        )
-        st.session_state[SessionKeys.RISK_ASSESSMENTS] = analysis_result.risk_assessments
-        st.session_state.analysis_reasoning = analysis_result.reasoning
+        run_llm_job('risks', build_risk_job_params(all_applicable_risks, all_applicable_risks),
+                    "🔍 Analyzing risks and generating contextualization... This can take up to a couple of minutes.")
+    elif st.session_state.get(SessionKeys.ASSESSED_CAPABILITIES) != sorted(selected_capabilities):
+        # Capability selection changed: only contextualize newly applicable risks,
+        # drop risks that no longer apply and keep (possibly edited) assessments for the rest
+        all_applicable_risks = load_risk_index().applicable_risks(selected_capabilities)
+        existing_assessments = st.session_state.get(SessionKeys.RISK_ASSESSMENTS, {})
+        new_risk_ids = [risk_id for risk_id in all_applicable_risks if risk_id not in existing_assessments]
+
+        updated_assessments = {
+            risk_id: existing_assessments[risk_id]
+            for risk_id in all_applicable_risks
+            if risk_id in existing_assessments
+        }
+        if new_risk_ids:
+            run_llm_job('risks', build_risk_job_params(all_applicable_risks, new_risk_ids),
+                        f"🔍 Capability selection changed. Analyzing {len(new_risk_ids)} newly applicable risks...")
+
+        st.session_state[SessionKeys.APPLICABLE_RISKS] = all_applicable_risks
+        st.session_state[SessionKeys.RISK_ASSESSMENTS] = updated_assessments
+        st.session_state[SessionKeys.ASSESSED_CAPABILITIES] = sorted(selected_capabilities)
         st.rerun()
     
     # Risk Assessment Interface
     if SessionKeys.APPLICABLE_RISKS in st.session_state and st.session_state[SessionKeys.APPLICABLE_RISKS]:
-        # Organize risks by type (component/design vs capability-specific)
-        component_design_risks = []
-        capability_risks = []
-
-        for risk_id in st.session_state[SessionKeys.APPLICABLE_RISKS]:
-            if risk_id in risks:
-                risk_data = risks[risk_id]
-                # Store both risk_id and risk_data as a tuple
-                risk_info = (risk_id, risk_data)
-                if (risk_data.get('components') or risk_data.get('design')) and not risk_data.get('capabilities'):
-                    component_design_risks.append(risk_info)
-                else:
-                    capability_risks.append(risk_info)
+        # Card contents and scores, rebuilt only when the register, risks or assessments are replaced
+        model = risk_page_model(st.session_state, get_register(), st.session_state[SessionKeys.APPLICABLE_RISKS],
+                                st.session_state[SessionKeys.RISK_ASSESSMENTS])
         
         # Show AI reasoning
         if 'analysis_reasoning' in st.session_state:
@@ -469,250 +470,335 @@ def risk_assessment_page():
             st.info(st.session_state.analysis_reasoning)
         
         # Capability-specific risks
-        if capability_risks:
-            with st.expander(f"### Capability-Specific Risks ({len(capability_risks)} risks)", expanded=True):
-                for risk_id, risk_data in capability_risks:
-                    risk_category_info = "Unknown"
-                    for cap_id in risk_data.get('capabilities', []):
-                        if cap_id in capabilities:
-                            cap_data = capabilities[cap_id]
-                            risk_category_info = f"{cap_data['category']} - {cap_data['name']}"
-                            break
-                
-                    with st.container():
-                        st.markdown("---")
-                        col_risk, col_likelihood, col_impact = st.columns([1, 1, 1])
-                        
-                        with col_risk:
-                            st.markdown(f"**{risk_data['name']}** ({risk_category_info})")
-                            st.caption(risk_data['description'])
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                if hasattr(assessment, 'context'):
-                                    st.info(f"💡 {assessment.context}")
-                        
-                        with col_likelihood:
-                            st.markdown("**Likelihood**")
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                likelihood_score = assessment.likelihood.score
-                                likelihood_reasoning = assessment.likelihood.reasoning
-                                
-                                new_likelihood_score = st.selectbox(
-                                    "Score",
-                                    options=[1, 2, 3, 4, 5],
-                                    index=likelihood_score-1,
-                                    key=f"likelihood_score_{risk_id}",
-                                    format_func=lambda x: f"{['🟢', '🟡', '🟠', '🔴', '🔴'][x-1]} {x} - {['Very Low', 'Low', 'Medium', 'High', 'Very High'][x-1]}"
-                                )
-                                new_likelihood_reasoning = st.text_area(
-                                    "Reasoning",
-                                    value=likelihood_reasoning,
-                                    height=80,
-                                    key=f"likelihood_reasoning_{risk_id}"
-                                )
-                                
-                                # Update session state if changed
-                                if new_likelihood_score != likelihood_score or new_likelihood_reasoning != likelihood_reasoning:
-                                    if SessionKeys.RISK_ASSESSMENTS not in st.session_state:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS] = {}
-                                    if risk_id not in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=assessment.context,
-                                            likelihood=ScoreAssessment(score=new_likelihood_score, reasoning=new_likelihood_reasoning),
-                                            impact=assessment.impact
-                                        )
-                                    else:
-                                        # Update existing assessment
-                                        existing = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=existing.context,
-                                            likelihood=ScoreAssessment(score=new_likelihood_score, reasoning=new_likelihood_reasoning),
-                                            impact=ScoreAssessment(score=existing.impact.score, reasoning=existing.impact.reasoning)
-                                        )
-                        
-                        with col_impact:
-                            st.markdown("**Impact**")
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                impact_score = assessment.impact.score
-                                impact_reasoning = assessment.impact.reasoning
-                                
-                                new_impact_score = st.selectbox(
-                                    "Score",
-                                    options=[1, 2, 3, 4, 5],
-                                    index=impact_score-1,
-                                    key=f"impact_score_{risk_id}",
-                                    format_func=lambda x: f"{['🟢', '🟡', '🟠', '🔴', '🔴'][x-1]} {x} - {['Very Low', 'Low', 'Medium', 'High', 'Very High'][x-1]}"
-                                )
-                                new_impact_reasoning = st.text_area(
-                                    "Reasoning",
-                                    value=impact_reasoning,
-                                    height=80,
-                                    key=f"impact_reasoning_{risk_id}"
-                                )
-                                
-                                # Update session state if changed
-                                if new_impact_score != impact_score or new_impact_reasoning != impact_reasoning:
-                                    if SessionKeys.RISK_ASSESSMENTS not in st.session_state:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS] = {}
-                                    if risk_id not in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=assessment.context,
-                                            likelihood=assessment.likelihood,
-                                            impact=ScoreAssessment(score=new_impact_score, reasoning=new_impact_reasoning)
-                                        )
-                                    else:
-                                        # Update existing assessment
-                                        existing = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=existing.context,
-                                            likelihood=ScoreAssessment(score=existing.likelihood.score, reasoning=existing.likelihood.reasoning),
-                                            impact=ScoreAssessment(score=new_impact_score, reasoning=new_impact_reasoning)
-                                        )
+        if model.capability_cards:
+            with st.expander(f"### Capability-Specific Risks ({len(model.capability_cards)} risks)", expanded=True):
+                for card in model.capability_cards:
+                    risk_card(card)
         
         # Component and Design risks
-        if component_design_risks:
-            with st.expander(f"### Component & Design Risks ({len(component_design_risks)} risks)", expanded=True):
-                for risk_id, risk_data in component_design_risks:
-                    with st.container():
-                        st.markdown("---")
-                        col_risk, col_likelihood, col_impact = st.columns([1, 1, 1])
-                    
-                        with col_risk:
-                            st.markdown(f"**{risk_data['name']}** (Component/Design)")
-                            st.caption(risk_data['description'])
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                if hasattr(assessment, 'context'):
-                                    st.info(f"💡 {assessment.context}")
-                    
-                        with col_likelihood:
-                            st.markdown("**Likelihood**")
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                likelihood_score = assessment.likelihood.score
-                                likelihood_reasoning = assessment.likelihood.reasoning
-                                
-                                new_likelihood_score = st.selectbox(
-                                    "Score",
-                                    options=[1, 2, 3, 4, 5],
-                                    index=likelihood_score-1,
-                                    key=f"likelihood_score_{risk_id}",
-                                    format_func=lambda x: f"{['🟢', '🟡', '🟠', '🔴', '🔴'][x-1]} {x} - {['Very Low', 'Low', 'Medium', 'High', 'Very High'][x-1]}"
-                                )
-                                new_likelihood_reasoning = st.text_area(
-                                    "Reasoning",
-                                    value=likelihood_reasoning,
-                                    height=80,
-                                    key=f"likelihood_reasoning_{risk_id}"
-                                )
-                                
-                                # Update session state if changed
-                                if new_likelihood_score != likelihood_score or new_likelihood_reasoning != likelihood_reasoning:
-                                    if SessionKeys.RISK_ASSESSMENTS not in st.session_state:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS] = {}
-                                    if risk_id not in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=assessment.context,
-                                            likelihood=ScoreAssessment(score=new_likelihood_score, reasoning=new_likelihood_reasoning),
-                                            impact=assessment.impact
-                                        )
-                                    else:
-                                        # Update existing assessment
-                                        existing = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=existing.context,
-                                            likelihood=ScoreAssessment(score=new_likelihood_score, reasoning=new_likelihood_reasoning),
-                                            impact=ScoreAssessment(score=existing.impact.score, reasoning=existing.impact.reasoning)
-                                        )
-                        
-                        with col_impact:
-                            st.markdown("**Impact**")
-                            if SessionKeys.RISK_ASSESSMENTS in st.session_state and risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                impact_score = assessment.impact.score
-                                impact_reasoning = assessment.impact.reasoning
-                                
-                                new_impact_score = st.selectbox(
-                                    "Score",
-                                    options=[1, 2, 3, 4, 5],
-                                    index=impact_score-1,
-                                    key=f"impact_score_{risk_id}",
-                                    format_func=lambda x: f"{['🟢', '🟡', '🟠', '🔴', '🔴'][x-1]} {x} - {['Very Low', 'Low', 'Medium', 'High', 'Very High'][x-1]}"
-                                )
-                                new_impact_reasoning = st.text_area(
-                                    "Reasoning",
-                                    value=impact_reasoning,
-                                    height=80,
-                                    key=f"impact_reasoning_{risk_id}"
-                                )
-                                
-                                # Update session state if changed
-                                if new_impact_score != impact_score or new_impact_reasoning != impact_reasoning:
-                                    if SessionKeys.RISK_ASSESSMENTS not in st.session_state:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS] = {}
-                                    if risk_id not in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=assessment.context,
-                                            likelihood=assessment.likelihood,
-                                            impact=ScoreAssessment(score=new_impact_score, reasoning=new_impact_reasoning)
-                                        )
-                                    else:
-                                        # Update existing assessment
-                                        existing = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                                        st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id] = RiskAssessment(
-                                            context=existing.context,
-                                            likelihood=ScoreAssessment(score=existing.likelihood.score, reasoning=existing.likelihood.reasoning),
-                                            impact=ScoreAssessment(score=new_impact_score, reasoning=new_impact_reasoning)
-                                        )
-        
-        # Control Thresholds
-        st.markdown("---")
-        st.markdown("### Control Thresholds")
-        col_likelihood, col_impact = st.columns(2)
-        
-        with col_likelihood:
-            likelihood_threshold = st.slider(
-                "Minimum Likelihood Score for Controls",
-                min_value=1,
-                max_value=5,
-                value=st.session_state.get('likelihood_threshold', 4),
-                help="Risks with likelihood scores at or above this threshold will be considered for controls"
-            )
-        
-        with col_impact:
-            impact_threshold = st.slider(
-                "Minimum Impact Score for Controls",
-                min_value=1,
-                max_value=5,
-                value=st.session_state.get('impact_threshold', 4),
-                help="Risks with impact scores at or above this threshold will be considered for controls"
-            )
-        
-        # Calculate high-priority risks
-        high_priority_risks = []
-        for risk_id in st.session_state[SessionKeys.APPLICABLE_RISKS]:
-            if risk_id in st.session_state[SessionKeys.RISK_ASSESSMENTS]:
-                assessment = st.session_state[SessionKeys.RISK_ASSESSMENTS][risk_id]
-                if (assessment.likelihood.score >= likelihood_threshold and 
-                    assessment.impact.score >= impact_threshold):
-                    high_priority_risks.append(risk_id)
-        
-        # Display summary
-        st.info(f"**{len(high_priority_risks)} out of {len(st.session_state[SessionKeys.APPLICABLE_RISKS])} risks** meet the threshold criteria and will be analyzed for controls.")
+        if model.component_design_cards:
+            with st.expander(f"### Component & Design Risks ({len(model.component_design_cards)} risks)", expanded=True):
+                for card in model.component_design_cards:
+                    risk_card(card)
         
-        # Store thresholds in session state
-        st.session_state.likelihood_threshold = likelihood_threshold
-        st.session_state.impact_threshold = impact_threshold
-        st.session_state.high_priority_risks = high_priority_risks
-        
-        # Continue to Controls button
-        if st.button("Continue to Controls", type="primary", use_container_width=True, key="continue_to_controls_btn"):
-            st.session_state.page = "controls"
+        threshold_panel()
+
+
+# How often a page waiting on a background LLM job polls its progress
+JOB_POLL_INTERVAL = "1s"
+
+
+def run_llm_job(kind, params, message):
+    """Wait on the background job of an LLM stage, submitting it unless this session already tracks it.
+
+    The job runs on the shared worker pool, so this run only renders its
+    progress and stops; the progress panel reruns the app once the job is done.
+    """
+    runner = get_job_runner()
+    owner = get_store_owner()
+    job_id = get_tracked_job_id()
+    job = runner.get(job_id, owner) if job_id else None
+    if job is None or job.kind != kind or job.key != job_key(kind, params):
+        if job is not None and not job.finished:
+            # The stage's inputs changed since this job was submitted
+            runner.cancel(job.id, owner)
+        track_job(runner.submit(kind, params, owner))
+    st.info(message)
+    llm_job_panel()
+    st.stop()
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def llm_job_panel():
+    """Progress of the tracked background job; applies its result and reruns the app when it finishes."""
+    runner = get_job_runner()
+    owner = get_store_owner()
+    job_id = get_tracked_job_id()
+    job = runner.get(job_id, owner) if job_id else None
+    if job is None:
+        st.error("The background analysis could not be found. It may have expired.")
+        if st.button("Start Over", key="job_start_over_btn"):
+            untrack_job()
+            st.session_state.page = "application_assessment"
+            st.rerun()
+        return
+
+    if job.status == SUCCEEDED:
+        apply_job_result(job)
+        untrack_job()
+        st.rerun()
+    elif job.status == CANCELLED:
+        untrack_job()
+        st.session_state.page = JOB_CANCEL_PAGES[job.kind]
+        st.rerun()
+    elif job.status == FAILED:
+        st.error(f"The analysis failed: {job.error}")
+        if st.button("Retry", key="job_retry_btn"):
+            untrack_job()
+            restore_job_inputs(job)
+            st.session_state.page = JOB_PAGES[job.kind]
             st.rerun()
+    else:
+        st.progress(job.progress, text=job.message or "Waiting for a free worker...")
+        st.caption("The analysis runs in the background: you can reload this page or come back to it later.")
+        if st.button("Cancel", key="job_cancel_btn", disabled=job.cancel_requested):
+            runner.cancel(job.id, owner)
+        job_partial_results(job)
+
+
+def job_partial_results(job):
+    """Table of the risks a running 'risks' job has assessed so far."""
+    received = (job.partial or {}).get('risk_assessments') or {}
+    if not received:
+        return
+    risks = get_register().risks
+    rows = []
+    for risk_id, assessment in received.items():
+        assessment = assessment if isinstance(assessment, dict) else {}
+        likelihood, impact = assessment.get('likelihood'), assessment.get('impact')
+        rows.append({
+            'Risk': risk_id,
+            'Name': risks.get(risk_id, {}).get('name', ''),
+            'Likelihood': likelihood.get('score') if isinstance(likelihood, dict) else None,
+            'Impact': impact.get('score') if isinstance(impact, dict) else None,
+        })
+    # A fixed label keeps the expander open across polls
+    with st.expander("Risks assessed so far", expanded=False):
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+def background_job_page():
+    """Page shown when a new session reattaches to a background job from the page URL."""
+    st.title("🤖 ARCvisor: Agentic Risk & Capability (ARC) Framework Advisor")
+    st.info("🔍 Resuming the analysis that was running in the background...")
+    llm_job_panel()
+
+
+SCORE_LABELS = ['Very Low', 'Low', 'Medium', 'High', 'Very High']
+SCORE_ICONS = ['🟢', '🟡', '🟠', '🔴', '🔴']
+
+def update_risk_assessment(risk_id, field):
+    """Widget callback: store an edited likelihood or impact score/reasoning for one risk."""
+    assessments = st.session_state[SessionKeys.RISK_ASSESSMENTS]
+    existing = assessments[risk_id]
+    edited = ScoreAssessment(score=st.session_state[f"{field}_score_{risk_id}"],
+                             reasoning=st.session_state[f"{field}_reasoning_{risk_id}"])
+    assessments[risk_id] = updated = RiskAssessment(
+        context=existing.context,
+        likelihood=edited if field == 'likelihood' else existing.likelihood,
+        impact=edited if field == 'impact' else existing.impact,
+    )
+    if is_high_priority(existing) != is_high_priority(updated):
+        # The risk card's fragment reruns the whole app, so the threshold panel picks up the change
+        st.session_state.threshold_panel_stale = True
+    model = st.session_state.get('risk_page_model')
+    if model is not None and model.risk_assessments is assessments:
+        model.scores.set_score(risk_id, field, edited.score)
+
+
+def is_high_priority(assessment):
+    """Whether a risk assessment meets the current likelihood and impact thresholds."""
+    return (assessment.likelihood.score >= st.session_state.get('likelihood_threshold', 4)
+            and assessment.impact.score >= st.session_state.get('impact_threshold', 4))
+
+
+def update_control_implementation(risk_id, control_id, field):
+    """Widget callback: store an edited implementation status or text of one control."""
+    table = get_control_status_table(get_register())
+    value = st.session_state[f"implementation_{field}_{risk_id}_{control_id}"]
+    if field == 'status':
+        table.set(risk_id, control_id, status=value)
+    else:
+        table.set(risk_id, control_id, text=value)
+
+
+@st.fragment
+def risk_card(card):
+    """One risk with its editable likelihood and impact; edits rerun only this card.
+
+    An edit that moves the risk across the high-priority thresholds reruns the
+    whole app instead, so the threshold panel stays current.
+    """
+    if st.session_state.pop('threshold_panel_stale', False):
+        st.rerun(scope="app")
+    with st.container():
+        st.markdown("---")
+        col_risk, col_likelihood, col_impact = st.columns([1, 1, 1])
+        assessment = st.session_state.get(SessionKeys.RISK_ASSESSMENTS, {}).get(card.risk_id)
+
+        with col_risk:
+            st.markdown(f"**{card.name}** ({card.label})")
+            st.caption(card.description)
+            if assessment is not None and hasattr(assessment, 'context'):
+                st.info(f"💡 {assessment.context}")
+
+        if assessment is None:
+            return
+        for column, field, title in ((col_likelihood, 'likelihood', "**Likelihood**"), (col_impact, 'impact', "**Impact**")):
+            with column:
+                st.markdown(title)
+                score = getattr(assessment, field)
+                st.selectbox(
+                    "Score",
+                    options=[1, 2, 3, 4, 5],
+                    index=score.score-1,
+                    key=f"{field}_score_{card.risk_id}",
+                    format_func=lambda x: f"{SCORE_ICONS[x-1]} {x} - {SCORE_LABELS[x-1]}",
+                    on_change=update_risk_assessment,
+                    args=(card.risk_id, field),
+                )
+                st.text_area(
+                    "Reasoning",
+                    value=score.reasoning,
+                    height=80,
+                    key=f"{field}_reasoning_{card.risk_id}",
+                    on_change=update_risk_assessment,
+                    args=(card.risk_id, field),
+                )
+
+
+@st.fragment
+def threshold_panel():
+    """Threshold sliders and the high-priority summary; slider changes rerun only this panel."""
+    model = st.session_state.get('risk_page_model')
+    if model is None:
+        return
+
+    # Control Thresholds
+    st.markdown("---")
+    st.markdown("### Control Thresholds")
+    col_likelihood, col_impact = st.columns(2)
+    
+    with col_likelihood:
+        likelihood_threshold = st.slider(
+            "Minimum Likelihood Score for Controls",
+            min_value=1,
+            max_value=5,
+            value=st.session_state.get('likelihood_threshold', 4),
+            help="Risks with likelihood scores at or above this threshold will be considered for controls"
+        )
+    
+    with col_impact:
+        impact_threshold = st.slider(
+            "Minimum Impact Score for Controls",
+            min_value=1,
+            max_value=5,
+            value=st.session_state.get('impact_threshold', 4),
+            help="Risks with impact scores at or above this threshold will be considered for controls"
+        )
+    
+    # Calculate high-priority risks as array masks over the score matrix
+    applicable_risks = model.applicable_risks
+    scores = model.scores
+    high_priority_risks = scores.high_priority(likelihood_threshold, impact_threshold, applicable_risks)
+    
+    # Display summary
+    st.info(f"**{len(high_priority_risks)} out of {len(applicable_risks)} risks** meet the threshold criteria and will be analyzed for controls.")
+    st.markdown(heatmap_markdown(scores.heatmap(scores.index.mask(applicable_risks)),
+                                 likelihood_threshold, impact_threshold))
+    if high_priority_risks:
+        plan = load_control_coverage().cover(high_priority_risks)
+        st.caption(f"A minimal set of {len(plan.controls)} controls covers {plan.covered_mask.bit_count()} of these risks"
+                   + (f" ({len(plan.uncovered)} have no controls in the register)." if plan.uncovered else "."))
+    
+    # Store thresholds in session state
+    st.session_state.likelihood_threshold = likelihood_threshold
+    st.session_state.impact_threshold = impact_threshold
+    st.session_state.high_priority_risks = high_priority_risks
+    
+    # Continue to Controls button
+    if st.button("Continue to Controls", type="primary", use_container_width=True, key="continue_to_controls_btn"):
+        st.session_state.page = "controls"
+        st.rerun()
         
 
+
+def heatmap_markdown(heatmap, likelihood_threshold, impact_threshold):
+    """Render a 5x5 likelihood x impact count matrix as a Markdown table.
+
+    Cells meeting both thresholds are shown in bold.
+    """
+    lines = ["| Likelihood \\ Impact | 1 | 2 | 3 | 4 | 5 |", "|---|---|---|---|---|---|"]
+    for likelihood in range(5, 0, -1):
+        cells = []
+        for impact in range(1, 6):
+            count = int(heatmap[likelihood - 1, impact - 1])
+            in_scope = likelihood >= likelihood_threshold and impact >= impact_threshold
+            cells.append(f"**{count}**" if in_scope else str(count))
+        lines.append(f"| **{likelihood}** | {' | '.join(cells)} |")
+    return "\n".join(lines)
+
+
+COVERAGE_WEIGHTING_LABELS = {
+    'count': "Fewest controls",
+    'level': "Prefer essential (Level 0) controls",
+}
+
+
+def control_coverage_panel(high_priority_risks, risks, controls):
+    """Minimal control set covering the high-priority risks, and what single controls add."""
+    coverage = load_control_coverage()
+
+    with st.expander("🧩 Minimal Control Set", expanded=True):
+        weighting = st.radio(
+            "Optimize for",
+            options=list(WEIGHTINGS),
+            format_func=lambda key: COVERAGE_WEIGHTING_LABELS[key],
+            horizontal=True,
+            key="coverage_weighting",
+        )
+        target_mask = coverage.mask_of(high_priority_risks)
+        candidates = [ctrl_id for ctrl_id in coverage.control_ids if coverage.covers(ctrl_id, target_mask)]
+        implemented = st.multiselect(
+            "Controls already implemented",
+            options=candidates,
+            format_func=lambda ctrl_id: f"{ctrl_id}: {controls[ctrl_id]['name']}",
+            key="coverage_implemented",
+            help="These are kept in the set; the remaining risks are covered with as few additional controls as possible.",
+        )
+
+        plan = coverage.cover(high_priority_risks, weighting, required=implemented)
+        listed = len(set(ctrl_id for risk_id in high_priority_risks for ctrl_id in risks.get(risk_id, {}).get('controls', ())))
+        st.write(f"**{len(plan.controls)} controls** cover {plan.covered_mask.bit_count()} of the "
+                 f"{len(high_priority_risks)} high-priority risks ({listed} distinct controls are listed below).")
+        if plan.uncovered:
+            st.warning(f"No control in the register covers: {', '.join(plan.uncovered)}")
+        st.dataframe(
+            [
+                {
+                    'Control': ctrl_id,
+                    'Name': controls[ctrl_id]['name'],
+                    'Level': str(controls[ctrl_id].get('level', '')),
+                    'Implemented': ctrl_id in implemented,
+                    'Risks covered': ', '.join(plan.covers[ctrl_id]),
+                }
+                for ctrl_id in plan.controls
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        # What a single control adds, beyond the controls already implemented
+        implemented_mask = 0
+        for ctrl_id in implemented:
+            implemented_mask |= coverage.covers(ctrl_id, target_mask)
+        probe = st.selectbox(
+            "What does adding a control cover?",
+            options=candidates,
+            format_func=lambda ctrl_id: f"{ctrl_id}: {controls[ctrl_id]['name']}",
+            index=None,
+            placeholder="Choose a control",
+            key="coverage_probe",
+        )
+        if probe:
+            addresses = coverage.covers(probe, target_mask)
+            adds = coverage.covers(probe, target_mask, implemented_mask)
+            st.caption(f"{probe} addresses {addresses.bit_count()} of the high-priority risks "
+                       f"({', '.join(coverage.risks_in(addresses))}); {adds.bit_count()} of them "
+                       f"are not yet covered by implemented controls"
+                       + (f" ({', '.join(coverage.risks_in(adds))})." if adds else "."))
+
+
 def controls_page():
     """Fourth page: Controls"""
     st.title("🤖 ARCvisor: Agentic Risk & Capability (ARC) Framework Advisor")
@@ -724,27 +810,28 @@ def controls_page():
             st.session_state.page = "risk_assessment"
             st.rerun()
     with header_col2:
+        export_format = st.selectbox(
+            "Export format",
+            options=list(EXPORT_FORMATS),
+            format_func=lambda key: EXPORT_FORMATS[key].label,
+            key="export_format_select",
+        )
         if st.button("📄 Export Assessment", type="secondary"):
             try:
                 # Import here to avoid relative import issues
-                from utils.export_utils import export_assessment_to_word
-                doc = export_assessment_to_word()
-                if doc is None:
+                from utils.export_utils import export_assessment
+                export_bytes = export_assessment(export_format)
+                if export_bytes is None:
                     st.error("Failed to create document. Please try again.")
                     return
                 
-                # Save to bytes
-                from io import BytesIO
-                doc_buffer = BytesIO()
-                doc.save(doc_buffer)
-                doc_buffer.seek(0)
-                
                 # Download button
+                file_format = EXPORT_FORMATS[export_format]
                 st.download_button(
-                    label="Download Word Document",
-                    data=doc_buffer.getvalue(),
-                    file_name=f"risk_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    label=f"Download {file_format.label}",
+                    data=export_bytes,
+                    file_name=f"risk_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_format.extension}",
+                    mime=file_format.mime_type
                 )
             except Exception as e:
                 st.error(f"Error generating document: {str(e)}")
@@ -764,6 +851,10 @@ def controls_page():
     if 'high_priority_risks' in st.session_state and st.session_state.high_priority_risks:
         # Show threshold summary
         st.info(f"Showing controls for **{len(st.session_state.high_priority_risks)} high-priority risks** (Likelihood ≥ {st.session_state.get('likelihood_threshold', 4)} AND Impact ≥ {st.session_state.get('impact_threshold', 4)})")
+        control_coverage_panel(st.session_state.high_priority_risks, risks, controls)
+        # Filled in after the controls below, so it reflects this run's status changes
+        residual_summary = st.container()
+        status_table = get_control_status_table(get_register())
 
         for risk_id in st.session_state.high_priority_risks:
             if risk_id in risks:
@@ -804,27 +895,43 @@ def controls_page():
                                 st.write(control['description'])
                             
                             with col_implementation:
-                                # Editable text box for control implementation
-                                control_key = f"control_implementation_{risk_id}_{control['id']}"
-                                default_text = "I did not implement this control. I accept all residual risk."
-                                
-                                # Initialize session state for this control if not exists
-                                initialize_control_implementation(risk_id, control['id'], default_text)
+                                statuses = list(ImplementationStatus)
+                                st.selectbox(
+                                    "Implementation status",
+                                    options=statuses,
+                                    index=statuses.index(status_table.status(risk_id, control['id'])),
+                                    format_func=lambda key: IMPLEMENTATION_STATUS_LABELS[key],
+                                    key=f"implementation_status_{risk_id}_{control['id']}",
+                                    on_change=update_control_implementation,
+                                    args=(risk_id, control['id'], 'status'),
+                                )
                                 
+                                # Editable text box for control implementation
                                 st.write("**Your Implementation Status:**")
-                                implementation_text = st.text_area(
+                                st.text_area(
                                     f"Describe how you have implemented this control and remaining residual risks.",
-                                    value=st.session_state[control_key],
+                                    value=status_table.text(risk_id, control['id']),
                                     height=150,
                                     key=f"implementation_text_{risk_id}_{control['id']}",
-                                    help="Describe what you have implemented for this control, or leave the default text if not implemented."
+                                    help="Describe what you have implemented for this control, or leave the default text if not implemented.",
+                                    on_change=update_control_implementation,
+                                    args=(risk_id, control['id'], 'text'),
                                 )
-                                
-                                # Update session state when text changes
-                                if implementation_text != st.session_state[control_key]:
-                                    st.session_state[control_key] = implementation_text
                 else:
                     st.warning("No specific controls found for this risk.")
+
+        with residual_summary:
+            high_priority_risks = st.session_state.high_priority_risks
+            scoring_index = load_scoring_index()
+            scores = scoring_index.matrix([st.session_state.get(SessionKeys.RISK_ASSESSMENTS, {})],
+                                          [status_table.status_codes()])
+            in_scope = scoring_index.mask(high_priority_risks)
+            inherent = float(scores.inherent()[0][in_scope].sum())
+            residual = float(scores.residual()[0][in_scope].sum())
+            col_inherent, col_residual = st.columns(2)
+            col_inherent.metric("Inherent risk (likelihood × impact, total)", f"{inherent:.0f}")
+            col_residual.metric("Residual risk after controls", f"{residual:.1f}",
+                                delta=f"{residual - inherent:.1f}", delta_color="inverse")
     else:
         if SessionKeys.APPLICABLE_RISKS in st.session_state and st.session_state[SessionKeys.APPLICABLE_RISKS]:
             st.info("No risks meet the current threshold criteria for controls. Adjust the thresholds in the Risk Assessment page to see controls for lower-priority risks.")
@@ -832,11 +939,147 @@ def controls_page():
             st.info("Please complete the risk assessment to view controls.")
 
 
+def assessment_store_sidebar():
+    """Sidebar: save the current assessment, or resume a saved one."""
+    with st.sidebar:
+        st.subheader("💾 Saved Assessments")
+
+        try:
+            store = get_assessment_store()
+        except Exception as e:
+            st.error(f"Assessment store unavailable: {str(e)}")
+            return
+        owner = get_store_owner()
+
+        # Save the current assessment
+        assessment_name = st.text_input(
+            "Assessment name",
+            value=st.session_state.get(SessionKeys.ASSESSMENT_NAME, ""),
+            placeholder="Defaults to the application description",
+            key="assessment_name_input",
+        )
+        can_save = SessionKeys.APPLICATION_INFO in st.session_state
+        if st.button("Save Assessment", use_container_width=True, disabled=not can_save, key="save_assessment_btn"):
+            try:
+                register = get_register()
+                assessment = build_assessment_from_session(register)
+                assessment_id = store.save(
+                    assessment,
+                    owner=owner,
+                    name=assessment_name,
+                    assessment_id=st.session_state.get(SessionKeys.ASSESSMENT_ID),
+                    register_version=register.version,
+                )
+                st.session_state[SessionKeys.ASSESSMENT_ID] = assessment_id
+                st.session_state[SessionKeys.ASSESSMENT_NAME] = assessment_name
+                st.success("Assessment saved.")
+            except Exception as e:
+                st.error(f"Error saving assessment: {str(e)}")
+
+        # Resume a saved assessment
+        name_filter = st.text_input("Find by name", key="assessment_name_filter").strip()
+        try:
+            saved = store.list_assessments(owner, name=name_filter or None, limit=50)
+        except Exception as e:
+            st.error(f"Error listing saved assessments: {str(e)}")
+            return
+
+        if not saved:
+            st.caption("No saved assessments yet.")
+            return
+
+        labels = {
+            row['id']: f"{row['name']} — {datetime.fromtimestamp(row['updated_at']).strftime('%Y-%m-%d %H:%M')} ({row['risk_count']} risks)"
+            for row in saved
+        }
+        selected_id = st.selectbox("Saved", options=list(labels), format_func=labels.get, key="saved_assessment_select")
+
+        resume_col, delete_col = st.columns(2)
+        with resume_col:
+            if st.button("Resume", use_container_width=True, key="resume_assessment_btn"):
+                assessment = store.load(selected_id, owner)
+                if assessment is None:
+                    st.error("Saved assessment not found.")
+                else:
+                    restore_assessment_to_session(assessment)
+                    st.session_state[SessionKeys.ASSESSMENT_ID] = selected_id
+                    st.session_state[SessionKeys.ASSESSMENT_NAME] = next(
+                        row['name'] for row in saved if row['id'] == selected_id
+                    )
+                    # Widget keyed state must be reset before the widget is rendered again
+                    st.session_state.pop("assessment_name_input", None)
+                    st.rerun()
+        with delete_col:
+            if st.button("Delete", use_container_width=True, key="delete_assessment_btn"):
+                store.delete(selected_id, owner)
+                if st.session_state.get(SessionKeys.ASSESSMENT_ID) == selected_id:
+                    st.session_state.pop(SessionKeys.ASSESSMENT_ID, None)
+                st.rerun()
+
+
+# Most recently saved assessments included in the portfolio overview
+PORTFOLIO_LIMIT = 500
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def portfolio_scores(owner, revision, register_version):
+    """Score matrix of an owner's most recently saved assessments.
+
+    Cached process-wide and keyed by the owner's store revision and the
+    register version, so the assessments are decoded once per change rather
+    than once per session.
+    """
+    store = get_assessment_store()
+    saved = store.list_assessments(owner, limit=PORTFOLIO_LIMIT)
+    assessments = [assessment for assessment in (store.load(row['id'], owner) for row in saved)
+                   if assessment is not None]
+    return load_scoring_index().portfolio(assessments)
+
+
+def portfolio_sidebar():
+    """Sidebar: heatmap and residual risk across this owner's saved assessments, when switched on."""
+    with st.sidebar:
+        if not st.toggle("📊 Portfolio Overview", key="portfolio_enabled"):
+            return
+        try:
+            store = get_assessment_store()
+            owner = get_store_owner()
+            revision = store.revision(owner)
+        except Exception as e:
+            st.error(f"Assessment store unavailable: {str(e)}")
+            return
+        if not revision[0]:
+            st.caption("No saved assessments yet.")
+            return
+
+        scores = portfolio_scores(owner, revision, get_register().version)
+        likelihood_threshold = st.slider("Minimum likelihood", 1, 5, 4, key="portfolio_likelihood_threshold")
+        impact_threshold = st.slider("Minimum impact", 1, 5, 4, key="portfolio_impact_threshold")
+        high_priority = scores.threshold_mask(likelihood_threshold, impact_threshold)
+        st.markdown(heatmap_markdown(scores.heatmap(), likelihood_threshold, impact_threshold))
+        st.caption(f"{int(high_priority.sum())} high-priority risk ratings across {len(scores)} assessments")
+
+        st.markdown("**Highest average residual risk**")
+        for risk_id, average, count in scores.top_residual():
+            st.caption(f"{risk_id}: {average:.1f} ({count} assessments)")
+
+
 def main():
     """Main application entry point."""
     
     # Initialize session state
     initialize_session_state()
+
+    # A reloaded page resumes waiting on the background job named in its URL
+    job = reattach_job_from_query_params()
+    if job is not None:
+        restore_job_inputs(job)
+        st.session_state.page = "background_job"
+    report_diagnostics(st.session_state.pop(SessionKeys.JOB_DIAGNOSTICS, []))
+
+    # Save / resume controls
+    assessment_store_sidebar()
+    portfolio_sidebar()
     
     # Route to appropriate page
     if st.session_state.page == "application_assessment":
@@ -847,6 +1090,8 @@ def main():
         risk_assessment_page()
     elif st.session_state.page == "controls":
         controls_page()
+    elif st.session_state.page == "background_job":
+        background_job_page()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""Command-line entry point for headless batch assessments.
+
+Usage (from the repository root):
+    python app/batch_assess.py applications.yaml -o results.jsonl --workers 4 --llm-concurrency 8
+"""
+
+import argparse
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from core.batch import load_application_profiles, run_batch, write_results
+
+
+def main(argv=None) -> int:
+    """Parse arguments and run the batch."""
+    parser = argparse.ArgumentParser(description="Run the ARC assessment pipeline for a portfolio of applications.")
+    parser.add_argument("profiles", help="JSONL or YAML file of application profiles (sample_data.yaml fields)")
+    parser.add_argument("-o", "--output", default="assessment_results.jsonl", help="JSONL file to write results to")
+    parser.add_argument("--workers", type=int, default=4, help="Applications assessed concurrently")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="Maximum LLM calls in flight (0 for no limit)")
+    parser.add_argument("--likelihood-threshold", type=int, default=4, help="Minimum likelihood score for controls")
+    parser.add_argument("--impact-threshold", type=int, default=4, help="Minimum impact score for controls")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+    args = parser.parse_args(argv)
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    profiles = load_application_profiles(args.profiles)
+    print(f"Assessing {len(profiles)} applications with {args.workers} workers...")
+
+    started = time.perf_counter()
+    failures = 0
+
+    def _report(results):
+        nonlocal failures
+        for result in results:
+            if result.get('status') == 'ok':
+                print(f"  ✓ {result['name']}: {len(result['high_priority_risks'])} high-priority risks")
+            else:
+                failures += 1
+                print(f"  ✗ {result['name']}: {result.get('error')}")
+            yield result
+
+    count = write_results(_report(run_batch(
+        profiles,
+        max_workers=args.workers,
+        llm_concurrency=args.llm_concurrency or None,
+        likelihood_threshold=args.likelihood_threshold,
+        impact_threshold=args.impact_threshold,
+        use_cache=not args.no_cache,
+    )), args.output)
+
+    print(f"Wrote {count} results to {args.output} in {time.perf_counter() - started:.1f}s ({failures} failed)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Command-line entry point for exporting saved assessments into one zip archive.
+
+Usage (from the repository root):
+    python app/bulk_export.py --name "Citizen enquiry bot" -o exports.zip --formats docx,csv
+    python app/bulk_export.py --since 2025-01-01 -o q1.zip --workers 8
+
+The CLI is an administrative tool: it reads every owner's saved assessments
+unless --owner is given.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from core.bulk_export import export_assessments_zip
+from core.export import EXPORT_FORMATS
+from core.store import get_assessment_store
+
+
+def main(argv=None) -> int:
+    """Parse arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export saved ARC assessments into a single zip archive.")
+    parser.add_argument("ids", nargs="*", type=int, help="IDs of saved assessments (default: all matching the filters)")
+    parser.add_argument("-o", "--output", default="assessments.zip", help="Zip archive to write")
+    parser.add_argument("--owner", help="Only export assessments of this owner key (default: every owner)")
+    parser.add_argument("--name", help="Only export assessments with this exact name")
+    parser.add_argument("--since", help="Only export assessments saved on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only export assessments saved before this date (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=10000, help="Maximum number of assessments")
+    parser.add_argument("--formats", default="docx",
+                        help=f"Comma-separated export formats ({', '.join(EXPORT_FORMATS)})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    formats = [export_format.strip() for export_format in args.formats.split(",") if export_format.strip()]
+    unknown = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    store = get_assessment_store()
+    if args.ids:
+        selected = [(assessment_id, f"assessment-{assessment_id}") for assessment_id in args.ids]
+    else:
+        rows = store.list_assessments(
+            owner=args.owner,
+            name=args.name,
+            since=datetime.strptime(args.since, "%Y-%m-%d").timestamp() if args.since else None,
+            until=datetime.strptime(args.until, "%Y-%m-%d").timestamp() if args.until else None,
+            limit=args.limit,
+        )
+        selected = [(row['id'], row['name']) for row in rows]
+
+    if not selected:
+        print("No saved assessments match.")
+        return 1
+    print(f"Exporting {len(selected)} assessments as {', '.join(formats)}...")
+
+    missing = 0
+
+    def _payloads():
+        nonlocal missing
+        # Payloads are read lazily so only the in-flight ones are held in memory
+        for assessment_id, name in selected:
+            payload = store.load_payload(assessment_id, owner=args.owner)
+            if payload is None:
+                missing += 1
+                print(f"  ✗ {name}: not found")
+                continue
+            yield name, payload
+
+    started = time.perf_counter()
+    report = export_assessments_zip(_payloads(), args.output, formats=formats, max_workers=args.workers)
+
+    failures = missing
+    for entry in report:
+        if entry['error']:
+            failures += 1
+            print(f"  ✗ {entry['name']} [{entry['format']}]: {entry['error']}")
+        else:
+            print(f"  ✓ {entry['name']} [{entry['format']}]: {entry['bytes']} bytes in {entry['seconds'] * 1000:.0f} ms")
+
+    written = sum(1 for entry in report if not entry['error'])
+    print(f"Wrote {written} documents to {args.output} in {time.perf_counter() - started:.1f}s "
+          f"({failures} failed)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
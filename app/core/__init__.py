@@ -0,0 +1 @@
+# Streamlit-independent core library for the Agentic Risk Capability Framework
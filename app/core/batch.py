@@ -0,0 +1,186 @@
+"""Headless batch assessment engine for application portfolios."""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import yaml
+
+from core.controls import get_controls_for_risk
+from core.diagnostics import Diagnostics
+from core.llm import analyze_capabilities, analyze_risks, generate_description, set_llm_concurrency
+from core.register import load_register
+
+# Application profile fields, as in sample_data.yaml
+PROFILE_FIELDS = ('description', 'components', 'data_classification', 'public_facing',
+                  'criticality', 'pii_data', 'human_in_loop', 'repo_url', 'repo_analysis')
+
+
+def load_application_profiles(path: str) -> List[Dict[str, Any]]:
+    """Load application profiles from a JSONL or YAML file.
+
+    JSONL files hold one profile object per line. YAML files may hold a list
+    of profiles, a mapping of application name to profile, or a single
+    profile under ``sample_application`` as in sample_data.yaml.
+
+    Args:
+        path: Path of the profiles file
+
+    Returns:
+        List of profile dictionaries, each with a ``name``
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            raw = [json.loads(line) for line in f if line.strip()]
+        else:
+            raw = yaml.safe_load(f) or []
+
+    if isinstance(raw, dict):
+        if 'sample_application' in raw:
+            raw = {'sample_application': raw['sample_application']}
+        raw = [dict(profile, name=profile.get('name', name)) for name, profile in raw.items()]
+
+    profiles = []
+    for position, profile in enumerate(raw, 1):
+        if not isinstance(profile, dict):
+            raise ValueError(f"Profile {position} in {path} is not a mapping")
+        profile = dict(profile)
+        profile.setdefault('name', f"application-{position}")
+        profiles.append(profile)
+    return profiles
+
+
+def assess_application(profile: Dict[str, Any], likelihood_threshold: int = 4, impact_threshold: int = 4,
+                       use_cache: bool = True) -> Dict[str, Any]:
+    """Run the description -> capabilities -> risks -> controls pipeline for one application.
+
+    Args:
+        profile: Application profile (sample_data.yaml fields plus ``name``)
+        likelihood_threshold: Minimum likelihood score for a high-priority risk
+        impact_threshold: Minimum impact score for a high-priority risk
+        use_cache: When False, bypass the LLM response cache
+
+    Returns:
+        Structured assessment result for the application. Messages raised along
+        the way are listed under ``diagnostics``; any error marks the result
+        with status ``error``.
+    """
+    register = load_register()
+    capabilities, risks, controls, components, design = register.as_tuple()
+    application_info = {field: profile.get(field, '') for field in PROFILE_FIELDS}
+    diagnostics = Diagnostics()
+    diagnostics.extend(register.diagnostics)
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    description = generate_description(application_info, use_cache=use_cache,
+                                       diagnostics=diagnostics.for_stage('description'))
+    timings['description'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    capability_analysis = analyze_capabilities(application_info, capabilities, use_cache=use_cache,
+                                               diagnostics=diagnostics.for_stage('capabilities'))
+    timings['capabilities'] = time.perf_counter() - started
+
+    selected_capabilities = capability_analysis.applicable_capabilities
+    applicable_risks = register.index.applicable_risks(selected_capabilities)
+
+    started = time.perf_counter()
+    risk_analysis = analyze_risks(
+        application_info, selected_capabilities, capabilities, risks, components, design,
+        applicable_risks, use_cache=use_cache, diagnostics=diagnostics.for_stage('risks')
+    )
+    timings['risks'] = time.perf_counter() - started
+
+    controls_diagnostics = diagnostics.for_stage('controls')
+    high_priority_risks = []
+    for risk_id in applicable_risks:
+        assessment = risk_analysis.risk_assessments.get(risk_id)
+        if (assessment and assessment.likelihood.score >= likelihood_threshold
+                and assessment.impact.score >= impact_threshold):
+            high_priority_risks.append({
+                'risk_id': risk_id,
+                'name': risks[risk_id]['name'],
+                'likelihood': assessment.likelihood.score,
+                'impact': assessment.impact.score,
+                'controls': get_controls_for_risk(risk_id, risks, controls, controls_diagnostics),
+            })
+
+    errors = [item.message for item in diagnostics if item.level == 'error']
+    result = {
+        'name': profile['name'],
+        'status': 'error' if errors else 'ok',
+        'register_version': register.version,
+        'application_info': application_info,
+        'application_description': description,
+        'capability_analysis': capability_analysis.model_dump(),
+        'applicable_risks': applicable_risks,
+        'risk_assessments': {
+            risk_id: assessment.model_dump()
+            for risk_id, assessment in risk_analysis.risk_assessments.items()
+        },
+        'risk_analysis_reasoning': risk_analysis.reasoning,
+        'thresholds': {'likelihood': likelihood_threshold, 'impact': impact_threshold},
+        'high_priority_risks': high_priority_risks,
+        'timings': timings,
+        'diagnostics': [item.model_dump() for item in diagnostics],
+    }
+    if errors:
+        result['error'] = '; '.join(errors)
+    return result
+
+
+def run_batch(profiles: Iterable[Dict[str, Any]], max_workers: int = 4, llm_concurrency: Optional[int] = 8,
+              likelihood_threshold: int = 4, impact_threshold: int = 4,
+              use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+    """Assess many applications concurrently, yielding results as they finish.
+
+    Applications run on a thread pool; the LLM concurrency budget is shared by
+    all of them (including the parallel risk batches inside each application).
+    A failing application yields an error result instead of stopping the batch.
+
+    Args:
+        profiles: Application profiles to assess
+        max_workers: Number of applications assessed at once
+        llm_concurrency: Maximum LLM calls in flight across the batch (None for no limit)
+        likelihood_threshold: Minimum likelihood score for a high-priority risk
+        impact_threshold: Minimum impact score for a high-priority risk
+        use_cache: When False, bypass the LLM response cache
+
+    Yields:
+        One structured result per application, in completion order
+    """
+    set_llm_concurrency(llm_concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(assess_application, profile, likelihood_threshold, impact_threshold, use_cache): profile
+                for profile in profiles
+            }
+            for future in as_completed(futures):
+                profile = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield {'name': profile.get('name'), 'status': 'error', 'error': str(e)}
+    finally:
+        set_llm_concurrency(None)
+
+
+def write_results(results: Iterable[Dict[str, Any]], path: str) -> int:
+    """Write batch results as JSON Lines, flushing after every application.
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            f.flush()
+            count += 1
+    return count
@@ -0,0 +1,124 @@
+"""Parallel export of many assessments into a single zip archive."""
+
+import json
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from core.export import EXPORT_FORMATS, render_assessment
+from core.register import load_register
+from core.store import deserialize_assessment, serialize_assessment
+from models.schemas import Assessment
+
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _archive_stem(name: str, position: int) -> str:
+    """File name stem for an assessment inside the archive (unique by position)."""
+    stem = _UNSAFE_NAME_RE.sub("_", name).strip("._")[:60] or "assessment"
+    return f"{position:04d}-{stem}"
+
+
+def _render_worker(name: str, payload: bytes, formats: Sequence[str],
+                   data_dir: Optional[str]) -> Tuple[str, Dict[str, bytes], Dict[str, float], Dict[str, str]]:
+    """Render one assessment in every requested format (runs in a worker process).
+
+    The assessment travels as its compressed store payload to keep
+    inter-process traffic small; the register is loaded once per worker.
+
+    Returns:
+        Tuple of (name, rendered bytes by format, seconds by format, errors by format)
+    """
+    outputs: Dict[str, bytes] = {}
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    try:
+        assessment = deserialize_assessment(payload)
+        register = load_register(data_dir)
+    except Exception as e:
+        return name, outputs, timings, {export_format: f"Could not load assessment: {e}" for export_format in formats}
+
+    for export_format in formats:
+        started = time.perf_counter()
+        try:
+            outputs[export_format] = render_assessment(assessment, export_format, register)
+        except Exception as e:
+            errors[export_format] = str(e)
+        timings[export_format] = time.perf_counter() - started
+    return name, outputs, timings, errors
+
+
+def export_assessments_zip(assessments: Iterable[Tuple[str, Union[Assessment, bytes]]],
+                           output: Union[str, BinaryIO], formats: Sequence[str] = ('docx',),
+                           max_workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                           data_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Render assessments concurrently in a process pool and stream them into one zip.
+
+    Documents are written to the archive as soon as they are rendered, and at
+    most max_in_flight assessments are queued or rendering at any time, so
+    memory stays bounded however many assessments are exported. A failing
+    document is reported and skipped without stopping the batch. The report
+    is also stored in the archive as export_report.json.
+
+    Args:
+        assessments: (name, Assessment or compressed store payload) pairs
+        output: Path or writable binary file object for the zip archive
+        formats: Keys of core.export.EXPORT_FORMATS to render for each assessment
+        max_workers: Worker processes (defaults to the CPU count)
+        max_in_flight: Maximum assessments submitted but not yet written (defaults to 2x workers)
+        data_dir: Register data directory (defaults to the bundled register)
+
+    Returns:
+        One report entry per document: name, format, file, seconds, bytes and error
+    """
+    unknown = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)}. Choose from: {', '.join(EXPORT_FORMATS)}")
+
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    max_in_flight = max(1, max_in_flight or 2 * max_workers)
+    report: List[Dict[str, Any]] = []
+
+    def _write(archive: zipfile.ZipFile, future: Future, stem: str) -> None:
+        try:
+            name, outputs, timings, errors = future.result()
+        except Exception as e:
+            # The worker process itself failed (e.g. it was killed)
+            report.extend({'name': stem, 'format': export_format, 'file': None, 'seconds': 0.0,
+                           'bytes': 0, 'error': str(e) or type(e).__name__} for export_format in formats)
+            return
+        for export_format in formats:
+            entry = {'name': name, 'format': export_format, 'file': None,
+                     'seconds': round(timings.get(export_format, 0.0), 4), 'bytes': 0,
+                     'error': errors.get(export_format)}
+            data = outputs.get(export_format)
+            if data is not None:
+                entry['file'] = f"{stem}.{EXPORT_FORMATS[export_format].extension}"
+                entry['bytes'] = len(data)
+                archive.writestr(entry['file'], data)
+            report.append(entry)
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict[Future, str] = {}
+        for position, (name, assessment) in enumerate(assessments, 1):
+            payload = assessment if isinstance(assessment, bytes) else serialize_assessment(assessment)
+            future = executor.submit(_render_worker, name, payload, tuple(formats), data_dir)
+            pending[future] = _archive_stem(name, position)
+
+            while len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _write(archive, future, pending.pop(future))
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _write(archive, future, pending.pop(future))
+
+        archive.writestr('export_report.json', json.dumps(report, indent=2))
+
+    return report
@@ -0,0 +1,181 @@
+"""Compact per-assessment table of control implementation statuses.
+
+One byte per risk-control pair of the register (positions from
+core.scoring.ScoringIndex) holds the status code, and implementation text is
+kept only where it differs from the default sentence. Pairs are addressed
+through the register's shared position index, so a session stores no
+per-pair key strings at all.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.scoring import STATUS_CODES, ScoringIndex
+from models.schemas import Assessment, ImplementationStatus, DEFAULT_CONTROL_IMPLEMENTATION
+
+# Code of a pair without a recorded status (its status is inferred from its text)
+UNSET = 255
+
+_STATUSES: Tuple[ImplementationStatus, ...] = tuple(STATUS_CODES)
+
+# (risk ID, control ID, status or None if unset, implementation text)
+ControlEntry = Tuple[str, str, Optional[ImplementationStatus], str]
+
+
+class ControlStatusTable:
+    """Implementation status and text of every risk-control pair of one assessment.
+
+    Attributes:
+        version: Register version the pair positions belong to
+        codes: One status code per risk-control pair (UNSET if not recorded)
+        texts: Implementation text by pair position, only where it is not the default
+    """
+
+    def __init__(self, index: ScoringIndex, version: str):
+        """Create an empty table.
+
+        Args:
+            index: Risk-control pair positions of the register
+            version: Register version
+        """
+        self.index: Optional[ScoringIndex] = index
+        self.version = version
+        self.codes = bytearray([UNSET]) * len(index.edge_risk)
+        self.texts: Dict[int, str] = {}
+
+    def __getstate__(self) -> Dict[str, object]:
+        # The register index is shared and rebuilt on load; only the table itself is serialized
+        return {'version': self.version, 'codes': self.codes, 'texts': self.texts}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self.index = None
+
+    def attach(self, index: ScoringIndex) -> None:
+        """Re-bind a deserialized table to the register index of its version."""
+        self.index = index
+
+    def _position(self, risk_id: str, control_id: str) -> Optional[int]:
+        return self.index.edge_position.get((risk_id, control_id))
+
+    def status(self, risk_id: str, control_id: str) -> ImplementationStatus:
+        """Return the status of a control, inferred from its text if none was recorded.
+
+        Mirrors Assessment.control_status(): unrecorded controls are partially
+        implemented if their text was changed from the default.
+        """
+        position = self._position(risk_id, control_id)
+        if position is None:
+            return ImplementationStatus.NOT_IMPLEMENTED
+        code = self.codes[position]
+        if code != UNSET:
+            return _STATUSES[code]
+        return ImplementationStatus.PARTIAL if position in self.texts else ImplementationStatus.NOT_IMPLEMENTED
+
+    def text(self, risk_id: str, control_id: str) -> str:
+        """Return the implementation text of a control, or the default text."""
+        position = self._position(risk_id, control_id)
+        return self.texts.get(position, DEFAULT_CONTROL_IMPLEMENTATION)
+
+    def set(self, risk_id: str, control_id: str, status: Optional[ImplementationStatus] = None,
+            text: Optional[str] = None) -> None:
+        """Record the status and/or implementation text of a control (unknown pairs are ignored)."""
+        position = self._position(risk_id, control_id)
+        if position is None:
+            return
+        if status is not None:
+            self.codes[position] = STATUS_CODES[ImplementationStatus(status)]
+        if text is not None:
+            if text == DEFAULT_CONTROL_IMPLEMENTATION:
+                self.texts.pop(position, None)
+            else:
+                self.texts[position] = text
+
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[ImplementationStatus, str]]:
+        """Return (status, text) for each (risk ID, control ID) pair."""
+        return {(risk_id, control_id): (self.status(risk_id, control_id), self.text(risk_id, control_id))
+                for risk_id, control_id in pairs}
+
+    def set_many(self, entries: Iterable[ControlEntry]) -> None:
+        """Record many (risk ID, control ID, status or None, text) entries."""
+        for risk_id, control_id, status, text in entries:
+            self.set(risk_id, control_id, status, text)
+
+    def entries(self) -> Iterator[ControlEntry]:
+        """Yield every pair with a recorded status or non-default text, in register order."""
+        pairs = self.index.edge_position
+        for (risk_id, control_id), position in pairs.items():
+            code = self.codes[position]
+            if code != UNSET or position in self.texts:
+                yield (risk_id, control_id, _STATUSES[code] if code != UNSET else None,
+                       self.texts.get(position, DEFAULT_CONTROL_IMPLEMENTATION))
+
+    def status_codes(self) -> np.ndarray:
+        """Return the status code of every pair, with unset statuses inferred, for ScoringIndex.matrix()."""
+        codes = np.frombuffer(bytes(self.codes), dtype=np.uint8).copy()
+        unset = codes == UNSET
+        codes[unset] = STATUS_CODES[ImplementationStatus.NOT_IMPLEMENTED]
+        if self.texts:
+            edited = np.fromiter(self.texts, dtype=np.intp, count=len(self.texts))
+            codes[edited[unset[edited]]] = STATUS_CODES[ImplementationStatus.PARTIAL]
+        return codes
+
+    def to_assessment_fields(self, risk_ids: Optional[Iterable[str]] = None
+                             ) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, ImplementationStatus]]]:
+        """Export the table as Assessment.control_implementations and control_statuses.
+
+        Args:
+            risk_ids: Only export these risks (all risks by default)
+
+        Returns:
+            Tuple of (non-default texts, recorded statuses), each keyed by risk ID then control ID
+        """
+        selected = None if risk_ids is None else set(risk_ids)
+        texts: Dict[str, Dict[str, str]] = {}
+        statuses: Dict[str, Dict[str, ImplementationStatus]] = {}
+        for risk_id, control_id, status, text in self.entries():
+            if selected is not None and risk_id not in selected:
+                continue
+            if text != DEFAULT_CONTROL_IMPLEMENTATION:
+                texts.setdefault(risk_id, {})[control_id] = text
+            if status is not None:
+                statuses.setdefault(risk_id, {})[control_id] = status
+        return texts, statuses
+
+    @classmethod
+    def from_assessment(cls, index: ScoringIndex, version: str, assessment: Assessment) -> "ControlStatusTable":
+        """Build a table from a saved assessment's control implementations and statuses."""
+        table = cls(index, version)
+        for risk_id, texts in assessment.control_implementations.items():
+            for control_id, text in texts.items():
+                table.set(risk_id, control_id, text=text)
+        for risk_id, statuses in assessment.control_statuses.items():
+            for control_id, status in statuses.items():
+                table.set(risk_id, control_id, status=status)
+        return table
+
+    def migrate(self, index: ScoringIndex, version: str,
+                source_index: Optional[ScoringIndex] = None) -> "ControlStatusTable":
+        """Copy the recorded entries into a table for another register version.
+
+        Args:
+            index: Risk-control pair positions of the new register
+            version: New register version
+            source_index: Pair positions of this table's own version, needed when the
+                table is detached (deserialized and not yet attached)
+
+        Returns:
+            New table holding the entries whose pair exists in the new register
+
+        Raises:
+            ValueError: If the table is detached and source_index is not given
+        """
+        if source_index is not None:
+            self.attach(source_index)
+        if self.index is None:
+            raise ValueError(f"Cannot migrate a detached control status table of register version "
+                             f"{self.version}: attach the index of that version first")
+        table = ControlStatusTable(index, version)
+        table.set_many(self.entries())
+        return table
@@ -0,0 +1,54 @@
+"""Risk-to-control lookups.
+
+These run on render paths, so they do no validation: the risks and controls
+must come from a loaded Register, whose cross-references were resolved and
+checked once by core.register_compiler when the register version was compiled.
+"""
+
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from core.diagnostics import Diagnostics
+
+
+def get_controls_for_risk(risk_id: str, risks: Mapping[str, Any], controls: Mapping[str, Any],
+                          diagnostics: Optional[Diagnostics] = None) -> List[Dict[str, Any]]:
+    """Get controls for a specific risk.
+
+    Args:
+        risk_id: The ID of the risk to get controls for
+        risks: Dictionary of compiled risk data
+        controls: Dictionary of compiled control data
+        diagnostics: Optional collector, told about an unknown risk ID
+
+    Returns:
+        List of control dictionaries for the specified risk
+    """
+    risk_data = risks.get(risk_id)
+    if risk_data is None:
+        if diagnostics is not None:
+            diagnostics.warning(f"Risk {risk_id} not found in risks data")
+        return []
+    return [
+        {'id': ctrl_id, 'name': controls[ctrl_id]['name'], 'description': controls[ctrl_id]['description']}
+        for ctrl_id in risk_data.get('controls', ())
+    ]
+
+
+def build_risk_control_joins(risks: Mapping[str, Any], controls: Mapping[str, Any]) -> Dict[str, Tuple[Dict[str, Any], ...]]:
+    """Precompute the controls of every risk.
+
+    Args:
+        risks: Dictionary of risk data
+        controls: Dictionary of control data
+
+    Returns:
+        Mapping of risk ID to its control dictionaries (id, name, description)
+    """
+    control_views = {
+        ctrl_id: {'id': ctrl_id, 'name': ctrl_data['name'], 'description': ctrl_data['description']}
+        for ctrl_id, ctrl_data in controls.items()
+    }
+    return {
+        risk_id: tuple(control_views[ctrl_id] for ctrl_id in risk_data.get('controls', ()))
+        for risk_id, risk_data in risks.items()
+    }
@@ -0,0 +1,191 @@
+"""Control coverage over the risk -> control bipartite graph.
+
+Each control's risks are encoded once per register version as a bitset (a
+Python int whose bit i is the i-th risk in register order), so "which of
+these risks does control X cover" is a single AND, whatever the register
+size. On top of that, cover() picks a small set of controls that covers
+every selected risk, optionally preferring lower-level (essential) controls.
+"""
+
+import heapq
+import threading
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Tuple
+
+# Cost of a control by WoG level when weighting='level': essential (0)
+# controls are preferred over standard (1) and enhanced (2) ones
+LEVEL_COSTS = {0: 1.0, 1: 2.0, 2: 3.0}
+DEFAULT_COST = 1.0
+
+WEIGHTINGS = ('count', 'level')
+
+# Memoized plans kept per register version (threshold x weighting combinations are few)
+_MAX_PLANS = 256
+
+
+class CoveragePlan(NamedTuple):
+    """A set of controls chosen to cover a set of risks."""
+    controls: Tuple[str, ...]              # Chosen control IDs, most valuable first
+    covers: Dict[str, Tuple[str, ...]]     # Control ID -> target risks it covers
+    uncovered: Tuple[str, ...]             # Target risks that no control in the register covers
+    cost: float                            # Total cost of the chosen controls
+    target_mask: int                       # Bitset of the target risks
+    covered_mask: int                      # Bitset of the target risks the plan covers
+
+
+class ControlCoverage:
+    """Bitset-encoded risk membership of every control, built once per register version."""
+
+    def __init__(self, risks: Mapping[str, Any], controls: Mapping[str, Any]):
+        """Build the control bitsets.
+
+        Args:
+            risks: Dictionary of compiled risk data keyed by risk ID, in register order
+            controls: Dictionary of compiled control data keyed by control ID
+        """
+        self.risk_ids: Tuple[str, ...] = tuple(risks)
+        self.position: Dict[str, int] = {risk_id: bit for bit, risk_id in enumerate(self.risk_ids)}
+        self.control_ids: Tuple[str, ...] = tuple(controls)
+        self.order: Dict[str, int] = {ctrl_id: position for position, ctrl_id in enumerate(self.control_ids)}
+
+        masks = dict.fromkeys(self.control_ids, 0)
+        for risk_id, risk_data in risks.items():
+            bit = 1 << self.position[risk_id]
+            for ctrl_id in risk_data.get('controls') or ():
+                if ctrl_id in masks:
+                    masks[ctrl_id] |= bit
+        self.masks: Dict[str, int] = masks
+
+        coverable = 0
+        for mask in masks.values():
+            coverable |= mask
+        self.coverable_mask = coverable  # Risks with at least one control
+
+        self.costs: Dict[str, Dict[str, float]] = {
+            'count': dict.fromkeys(self.control_ids, DEFAULT_COST),
+            'level': {ctrl_id: LEVEL_COSTS.get(controls[ctrl_id].get('level'), DEFAULT_COST)
+                      for ctrl_id in self.control_ids},
+        }
+        self._plans: Dict[Tuple[int, int, str], CoveragePlan] = {}
+        self._plans_lock = threading.Lock()
+
+    def mask_of(self, risk_ids: Iterable[str]) -> int:
+        """Return the bitset of the given risks (unknown IDs are ignored)."""
+        mask = 0
+        for risk_id in risk_ids:
+            bit = self.position.get(risk_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def risks_in(self, mask: int) -> Tuple[str, ...]:
+        """Return the risk IDs of a bitset, in register order."""
+        risk_ids = []
+        while mask:
+            low = mask & -mask
+            risk_ids.append(self.risk_ids[low.bit_length() - 1])
+            mask ^= low
+        return tuple(risk_ids)
+
+    def covers(self, ctrl_id: str, target_mask: int = -1, covered_mask: int = 0) -> int:
+        """Return the bitset of target risks a control would newly cover.
+
+        Args:
+            ctrl_id: Control ID
+            target_mask: Bitset of the risks of interest (all risks by default)
+            covered_mask: Bitset of risks already covered by other controls
+
+        Returns:
+            Bitset; use .bit_count() for the number of risks or risks_in() for their IDs
+        """
+        return self.masks.get(ctrl_id, 0) & target_mask & ~covered_mask
+
+    def cover(self, risk_ids: Iterable[str], weighting: str = 'count',
+              required: Iterable[str] = ()) -> CoveragePlan:
+        """Choose controls that together cover every given risk that has a control.
+
+        Uses the greedy set-cover heuristic (repeatedly take the control with
+        the most newly covered risks per unit cost, re-evaluating gains lazily),
+        then drops any chosen control made redundant by later choices. Plans
+        are memoized per (risks, required controls, weighting).
+
+        Args:
+            risk_ids: Risks to cover, e.g. the high-priority risks
+            weighting: 'count' for the fewest controls, 'level' to prefer
+                essential controls (see LEVEL_COSTS)
+            required: Controls that are already implemented or mandated; they are
+                always part of the plan and only the remaining risks are covered
+
+        Returns:
+            CoveragePlan
+
+        Raises:
+            ValueError: If weighting is not one of WEIGHTINGS
+        """
+        if weighting not in self.costs:
+            raise ValueError(f"Unknown weighting '{weighting}'. Choose from: {', '.join(WEIGHTINGS)}")
+        target = self.mask_of(risk_ids)
+        required_ids = tuple(dict.fromkeys(ctrl_id for ctrl_id in required if ctrl_id in self.masks))
+        required_mask = 0
+        for position in sorted(self.order[ctrl_id] for ctrl_id in required_ids):
+            required_mask |= 1 << position
+
+        key = (target, required_mask, weighting)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._cover(target, required_ids, self.costs[weighting])
+            with self._plans_lock:
+                if len(self._plans) >= _MAX_PLANS:
+                    self._plans.clear()
+                self._plans[key] = plan
+        return plan
+
+    def _cover(self, target: int, required: Tuple[str, ...], costs: Mapping[str, float]) -> CoveragePlan:
+        chosen: List[str] = list(required)
+        covered = 0
+        for ctrl_id in required:
+            covered |= self.masks[ctrl_id] & target
+        remaining = target & self.coverable_mask & ~covered
+
+        # Lazy greedy: a control's gain can only shrink as coverage grows, so a
+        # stale heap entry is an upper bound and most controls are never re-scored
+        heap = []
+        for ctrl_id in self.control_ids:
+            gain = (self.masks[ctrl_id] & remaining).bit_count()
+            if gain:
+                heap.append((-gain / costs[ctrl_id], self.order[ctrl_id], ctrl_id))
+        heapq.heapify(heap)
+
+        picked: List[str] = []
+        while remaining and heap:
+            _, position, ctrl_id = heapq.heappop(heap)
+            gain = (self.masks[ctrl_id] & remaining).bit_count()
+            if not gain:
+                continue
+            score = -gain / costs[ctrl_id]
+            if heap and (score, position) > heap[0][:2]:
+                heapq.heappush(heap, (score, position, ctrl_id))
+                continue
+            picked.append(ctrl_id)
+            remaining &= ~self.masks[ctrl_id]
+
+        # Drop picked controls (most expensive first) whose risks the others already cover
+        for ctrl_id in sorted(picked, key=lambda c: (-costs[c], -self.order[c])):
+            others = covered
+            for other in picked:
+                if other != ctrl_id:
+                    others |= self.masks[other]
+            if not (self.masks[ctrl_id] & target & ~others):
+                picked.remove(ctrl_id)
+        chosen.extend(picked)
+
+        for ctrl_id in chosen:
+            covered |= self.masks[ctrl_id] & target
+        return CoveragePlan(
+            controls=tuple(chosen),
+            covers={ctrl_id: self.risks_in(self.masks[ctrl_id] & target) for ctrl_id in chosen},
+            uncovered=self.risks_in(target & ~self.coverable_mask),
+            cost=sum(costs[ctrl_id] for ctrl_id in chosen),
+            target_mask=target,
+            covered_mask=covered,
+        )
+
@@ -0,0 +1,60 @@
+"""Structured diagnostics collected by core library calls."""
+
+from typing import Iterator, List
+
+from models.schemas import Diagnostic
+
+
+class Diagnostics:
+    """Collector for info/warning/error messages raised during a core call.
+
+    Core functions never touch the UI. They append to a Diagnostics instance
+    and callers decide how to surface the messages (Streamlit alerts, batch
+    result records, logs).
+    """
+
+    def __init__(self, stage: str = ""):
+        """Create an empty collector.
+
+        Args:
+            stage: Default pipeline stage recorded on each message
+        """
+        self.stage = stage
+        self.items: List[Diagnostic] = []
+
+    def add(self, level: str, message: str, stage: str = "") -> None:
+        """Record a message at the given level."""
+        self.items.append(Diagnostic(level=level, message=message, stage=stage or self.stage))
+
+    def info(self, message: str, stage: str = "") -> None:
+        """Record an informational message."""
+        self.add("info", message, stage)
+
+    def warning(self, message: str, stage: str = "") -> None:
+        """Record a warning."""
+        self.add("warning", message, stage)
+
+    def error(self, message: str, stage: str = "") -> None:
+        """Record an error."""
+        self.add("error", message, stage)
+
+    def for_stage(self, stage: str) -> "Diagnostics":
+        """Return a collector that records into this one under another stage."""
+        view = Diagnostics(stage)
+        view.items = self.items
+        return view
+
+    def extend(self, diagnostics: "Diagnostics") -> None:
+        """Append all messages from another collector."""
+        self.items.extend(diagnostics.items)
+
+    @property
+    def has_errors(self) -> bool:
+        """Whether any error was recorded."""
+        return any(item.level == "error" for item in self.items)
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
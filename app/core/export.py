@@ -0,0 +1,312 @@
+"""Assessment export (Word and machine-readable formats), independent of any UI."""
+
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+from io import BytesIO, StringIO
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.styles.style import ParagraphStyle
+from docx.text.paragraph import Paragraph
+
+from core.formats import (
+    write_assessment_csv,
+    write_assessment_json,
+    write_assessment_markdown,
+    write_assessment_xlsx,
+)
+from core.register import Register, load_register
+from models.schemas import Assessment, IMPLEMENTATION_STATUS_LABELS, RiskAssessment
+
+# Rendered exports kept by render_assessment, keyed by format and content hash
+RENDER_CACHE_SIZE = 32
+
+GENERATED_AT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Stands in for the "Generated on" timestamp in memoized Word reports
+_GENERATED_AT_PLACEHOLDER = "ARC-GENERATED-AT"
+
+_render_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def _heading_writer(doc: Document) -> Callable[[str, int], Paragraph]:
+    """Return an add_heading(text, level) for doc that resolves each heading style once.
+
+    python-docx looks the style up by name on every add_heading() call, which
+    dominates the cost of large reports. The first heading of each level goes
+    through add_heading(); later ones are given its resolved style object.
+    """
+    styles: Dict[int, ParagraphStyle] = {}
+
+    def add_heading(text: str, level: int) -> Paragraph:
+        if level not in styles:
+            paragraph = doc.add_heading(text, level=level)
+            styles[level] = paragraph.style
+            return paragraph
+        paragraph = doc.add_paragraph(text)
+        paragraph.style = styles[level]
+        return paragraph
+
+    return add_heading
+
+
+def _add_risk_assessment(doc: Document, add_heading: Callable[[str, int], Paragraph], risk_id: str,
+                         risk_data: Mapping[str, Any], risk_assessment: RiskAssessment) -> None:
+    """Add one risk with its contextualization and scores to section 3."""
+    add_heading(f"{risk_id}: {risk_data['name']}", 3)
+    doc.add_paragraph(f"Description: {risk_data['description']}")
+    doc.add_paragraph(f"Contextualization: {risk_assessment.context}")
+
+    # Likelihood
+    doc.add_paragraph(f"Likelihood Score: {risk_assessment.likelihood.score}/5")
+    doc.add_paragraph(f"Likelihood Reasoning: {risk_assessment.likelihood.reasoning}")
+
+    # Impact
+    doc.add_paragraph(f"Impact Score: {risk_assessment.impact.score}/5")
+    doc.add_paragraph(f"Impact Reasoning: {risk_assessment.impact.reasoning}")
+    doc.add_paragraph("")
+
+
+def build_assessment_document(assessment: Assessment, register: Optional[Register] = None,
+                              generated_at: Optional[datetime] = None) -> Document:
+    """Build the Word report for an assessment.
+
+    Args:
+        assessment: Assessment to export
+        register: Register to resolve capability, risk and control names (defaults to the loaded register)
+        generated_at: Timestamp printed in the report (defaults to now)
+
+    Returns:
+        python-docx Document
+    """
+    generated_at = generated_at or datetime.now()
+    return _build_document(assessment, register, generated_at.strftime(GENERATED_AT_FORMAT))
+
+
+def _build_document(assessment: Assessment, register: Optional[Register], generated_on: str) -> Document:
+    register = register or load_register()
+    capabilities, risks = register.capabilities, register.risks
+    risk_control_joins = register.risk_controls
+
+    doc = Document()
+    add_heading = _heading_writer(doc)
+
+    # Title
+    title = doc.add_heading('Agentic Risk Capability Framework Assessment', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # Date
+    doc.add_paragraph(f"Generated on: {generated_on}")
+    doc.add_paragraph("")
+    
+    # 1. Application Information
+    add_heading('1. Application Information', 1)
+    
+    if assessment.application_description is not None:
+        add_heading('1.1 Generated Application Description', 2)
+        doc.add_paragraph(assessment.application_description)
+    
+    if assessment.application_info:
+        add_heading('1.2 Application Summary', 2)
+        app_info = assessment.application_info
+        doc.add_paragraph(f"Description: {app_info.get('description', 'Not provided')}")
+        doc.add_paragraph(f"Data Classification: {app_info.get('data_classification', 'Not provided')}")
+        doc.add_paragraph(f"Human in the Loop: {app_info.get('human_in_loop', 'Not provided')}")
+        doc.add_paragraph(f"Public Facing: {app_info.get('public_facing', 'Not provided')}")
+        doc.add_paragraph(f"Criticality: {app_info.get('criticality', 'Not provided')}")
+        doc.add_paragraph(f"PII Data: {app_info.get('pii_data', 'Not provided')}")
+        doc.add_paragraph(f"Components: {app_info.get('components', 'Not provided')}")
+    
+    # 2. Capability Analysis
+    if assessment.capability_analysis is not None:
+        add_heading('2. System Capabilities Analysis', 1)
+        analysis = assessment.capability_analysis
+        doc.add_paragraph(f"Analysis Reasoning: {analysis.reasoning}")
+        
+        add_heading('2.1 Selected Applicable Capabilities', 2)
+        for cap_id in analysis.applicable_capabilities:
+            if cap_id in capabilities:
+                cap_data = capabilities[cap_id]
+                doc.add_paragraph(f"• {cap_id}: {cap_data['name']} ({cap_data['category']})")
+    
+    # 3. Risk Assessment
+    if assessment.applicable_risks is not None:
+        add_heading('3. Risk Assessment', 1)
+
+        # Partition the assessed risks in one pass; risks tagged with both a
+        # capability and a component/design element belong to neither section
+        capability_risks, component_design_risks = [], []
+        for risk_id in assessment.applicable_risks:
+            risk_data = risks.get(risk_id)
+            if risk_data is None or risk_id not in assessment.risk_assessments:
+                continue
+            has_elements = bool(risk_data.get('components') or risk_data.get('design'))
+            if risk_data.get('capabilities') and not has_elements:
+                capability_risks.append(risk_id)
+            elif has_elements and not risk_data.get('capabilities'):
+                component_design_risks.append(risk_id)
+
+        add_heading('3.1 Capability-Specific Risks', 2)
+        for risk_id in capability_risks:
+            _add_risk_assessment(doc, add_heading, risk_id, risks[risk_id], assessment.risk_assessments[risk_id])
+
+        add_heading('3.2 Component and Design Risks', 2)
+        for risk_id in component_design_risks:
+            _add_risk_assessment(doc, add_heading, risk_id, risks[risk_id], assessment.risk_assessments[risk_id])
+    
+    # 4. Controls
+    if assessment.high_priority_risks is not None:
+        add_heading('4. Controls and Implementation', 1)
+        
+        # Thresholds
+        likelihood_threshold = assessment.likelihood_threshold
+        impact_threshold = assessment.impact_threshold
+        doc.add_paragraph(f"Control Thresholds: Likelihood ≥ {likelihood_threshold} AND Impact ≥ {impact_threshold}")
+        doc.add_paragraph(f"High-Priority Risks: {len(assessment.high_priority_risks)} risks meet the threshold criteria")
+        doc.add_paragraph("")
+        
+        # Controls for each high-priority risk
+        for i, risk_id in enumerate(assessment.high_priority_risks, 1):
+            if risk_id in risks:
+                risk_data = risks[risk_id]
+                add_heading(f"4.{i} {risk_id}: {risk_data['name']}", 2)
+                
+                # Risk assessment summary
+                if risk_id in assessment.risk_assessments:
+                    risk_assessment = assessment.risk_assessments[risk_id]
+                    doc.add_paragraph(f"Likelihood: {risk_assessment.likelihood.score}/5, Impact: {risk_assessment.impact.score}/5")
+                    doc.add_paragraph(f"Context: {risk_assessment.context}")
+                    doc.add_paragraph("")
+                
+                # Controls
+                risk_controls = risk_control_joins.get(risk_id, ())
+                if risk_controls:
+                    doc.add_paragraph("Controls:")
+                    for j, control in enumerate(risk_controls, 1):
+                        doc.add_paragraph(f"{j}. {control['id']}: {control['name']}")
+                        doc.add_paragraph(f"   Description: {control['description']}")
+                        
+                        # Implementation status
+                        status = assessment.control_status(risk_id, control['id'])
+                        notes = assessment.control_notes(risk_id, control['id'])
+                        doc.add_paragraph(f"   Implementation Status: {IMPLEMENTATION_STATUS_LABELS[status]}")
+                        if notes:
+                            doc.add_paragraph(f"   Implementation Notes: {notes}")
+                        doc.add_paragraph("")
+    
+    return doc
+
+
+def assessment_hash(assessment: Assessment, register_version: str = "") -> str:
+    """Content hash of an assessment and the register version it renders against."""
+    digest = hashlib.sha256(register_version.encode('utf-8'))
+    digest.update(assessment.model_dump_json().encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _render_docx(assessment: Assessment, register: Register) -> bytes:
+    # The timestamp is filled in by _stamp_docx, so the memoized bytes do not depend on it
+    buffer = BytesIO()
+    _build_document(assessment, register, _GENERATED_AT_PLACEHOLDER).save(buffer)
+    return buffer.getvalue()
+
+
+def _stamp_docx(data: bytes, generated_at: datetime) -> bytes:
+    """Replace the timestamp placeholder of a rendered report (only document.xml is rewritten)."""
+    source = zipfile.ZipFile(BytesIO(data))
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as target:
+        for info in source.infolist():
+            content = source.read(info)
+            if info.filename == 'word/document.xml':
+                # The date line precedes all assessment text, so the first match is the placeholder
+                content = content.replace(_GENERATED_AT_PLACEHOLDER.encode('utf-8'),
+                                          generated_at.strftime(GENERATED_AT_FORMAT).encode('utf-8'), 1)
+            target.writestr(info, content)
+    return buffer.getvalue()
+
+
+def _render_xlsx(assessment: Assessment, register: Register) -> bytes:
+    buffer = BytesIO()
+    write_assessment_xlsx(assessment, buffer, register)
+    return buffer.getvalue()
+
+
+def _text_renderer(writer: Callable[[Assessment, Any, Register], None]) -> Callable[[Assessment, Register], bytes]:
+    def render(assessment: Assessment, register: Register) -> bytes:
+        buffer = StringIO(newline='')
+        writer(assessment, buffer, register)
+        return buffer.getvalue().encode('utf-8')
+    return render
+
+
+class ExportFormat(NamedTuple):
+    """An export format offered for download."""
+    label: str
+    extension: str
+    mime_type: str
+    render: Callable[[Assessment, Register], bytes]
+    stamp: Optional[Callable[[bytes, datetime], bytes]] = None  # Adds the generation time to rendered bytes
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'docx': ExportFormat('Word Document', 'docx',
+                         'application/vnd.openxmlformats-officedocument.wordprocessingml.document', _render_docx,
+                         _stamp_docx),
+    'json': ExportFormat('JSON', 'json', 'application/json', _text_renderer(write_assessment_json)),
+    'csv': ExportFormat('CSV', 'csv', 'text/csv', _text_renderer(write_assessment_csv)),
+    'md': ExportFormat('Markdown', 'md', 'text/markdown', _text_renderer(write_assessment_markdown)),
+    'xlsx': ExportFormat('Excel Workbook', 'xlsx',
+                         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', _render_xlsx),
+}
+
+
+def render_assessment(assessment: Assessment, export_format: str = 'docx',
+                      register: Optional[Register] = None, generated_at: Optional[datetime] = None) -> bytes:
+    """Render an assessment in one of EXPORT_FORMATS.
+
+    Results are memoized by format, assessment content hash and register
+    version, so downloading an unchanged assessment again does not re-render it.
+    The generation timestamp of formats that print one is added after the
+    memoized render, so it is always current.
+
+    Args:
+        assessment: Assessment to export
+        export_format: Key of EXPORT_FORMATS
+        register: Register to resolve names (defaults to the loaded register)
+        generated_at: Timestamp printed in the report (defaults to now)
+
+    Returns:
+        The rendered file contents
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+    register = register or load_register()
+    export = EXPORT_FORMATS[export_format]
+    key = f"{export_format}:{assessment_hash(assessment, register.version)}"
+    with _render_cache_lock:
+        data = _render_cache.get(key)
+        if data is not None:
+            _render_cache.move_to_end(key)
+
+    if data is None:
+        data = export.render(assessment, register)
+        with _render_cache_lock:
+            _render_cache[key] = data
+            while len(_render_cache) > RENDER_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+
+    if export.stamp is not None:
+        data = export.stamp(data, generated_at or datetime.now())
+    return data
+
+
+def render_assessment_docx(assessment: Assessment, register: Optional[Register] = None,
+                           generated_at: Optional[datetime] = None) -> bytes:
+    """Render the Word report for an assessment to .docx bytes (memoized, see render_assessment)."""
+    return render_assessment(assessment, 'docx', register, generated_at)
@@ -0,0 +1,268 @@
+"""Machine-readable assessment exports: JSON, CSV, Markdown and XLSX.
+
+Every writer streams to a file object as it goes (row by row, risk by risk)
+rather than building the whole document in memory first, so the same code
+serves single downloads and large bulk exports.
+"""
+
+import csv
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, TextIO
+
+from core.register import Register, load_register
+from models.schemas import Assessment, IMPLEMENTATION_STATUS_LABELS, ImplementationStatus
+
+# Columns of the flat export (one row per risk/control pair)
+EXPORT_COLUMNS = (
+    'application', 'risk_id', 'risk_name', 'risk_type', 'capabilities', 'context',
+    'likelihood', 'likelihood_reasoning', 'impact', 'impact_reasoning',
+    'likelihood_threshold', 'impact_threshold', 'high_priority',
+    'control_id', 'control_name', 'implementation_status', 'implementation_notes',
+)
+
+# Leading characters that make a spreadsheet evaluate a text cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _application_name(assessment: Assessment) -> str:
+    """First line of the application description, used to label rows."""
+    description = str(assessment.application_info.get('description') or '').strip()
+    return description.splitlines()[0] if description else ''
+
+
+def _risk_type(risk_data: Mapping[str, Any]) -> str:
+    """Classify a risk the way the report sections do."""
+    has_elements = bool(risk_data.get('components') or risk_data.get('design'))
+    if risk_data.get('capabilities') and not has_elements:
+        return 'capability'
+    if has_elements and not risk_data.get('capabilities'):
+        return 'component_design'
+    return 'mixed'
+
+
+def _assessed_risk_ids(assessment: Assessment) -> List[str]:
+    """Assessed risks in display order."""
+    order = assessment.applicable_risks if assessment.applicable_risks is not None else list(assessment.risk_assessments)
+    return [risk_id for risk_id in order if risk_id in assessment.risk_assessments]
+
+
+def iter_risk_records(assessment: Assessment, register: Register) -> Iterator[Dict[str, Any]]:
+    """Yield one nested record per assessed risk, with its controls.
+
+    Args:
+        assessment: Assessment to export
+        register: Register used to resolve risk and control names
+
+    Yields:
+        Dictionaries with the risk, its scores and its controls' implementation
+        status (an ImplementationStatus value) and notes
+    """
+    high_priority = set(assessment.high_priority_risks or ())
+    risk_controls = register.risk_controls
+    for risk_id in _assessed_risk_ids(assessment):
+        risk_data = register.risks.get(risk_id, {})
+        risk_assessment = assessment.risk_assessments[risk_id]
+        yield {
+            'id': risk_id,
+            'name': risk_data.get('name', ''),
+            'description': risk_data.get('description', ''),
+            'type': _risk_type(risk_data),
+            'capabilities': list(risk_data.get('capabilities') or ()),
+            'components': list(risk_data.get('components') or ()),
+            'design': list(risk_data.get('design') or ()),
+            'context': risk_assessment.context,
+            'likelihood': risk_assessment.likelihood.model_dump(),
+            'impact': risk_assessment.impact.model_dump(),
+            'high_priority': risk_id in high_priority,
+            'controls': [
+                {
+                    'id': control['id'],
+                    'name': control['name'],
+                    'implementation_status': assessment.control_status(risk_id, control['id']).value,
+                    'implementation_notes': assessment.control_notes(risk_id, control['id']),
+                }
+                for control in risk_controls.get(risk_id, ())
+            ],
+        }
+
+
+def iter_export_rows(assessment: Assessment, register: Register) -> Iterator[Dict[str, Any]]:
+    """Yield one flat row per risk/control pair (one row for a risk without controls)."""
+    application = _application_name(assessment)
+    for record in iter_risk_records(assessment, register):
+        row = {
+            'application': application,
+            'risk_id': record['id'],
+            'risk_name': record['name'],
+            'risk_type': record['type'],
+            'capabilities': ', '.join(record['capabilities']),
+            'context': record['context'],
+            'likelihood': record['likelihood']['score'],
+            'likelihood_reasoning': record['likelihood']['reasoning'],
+            'impact': record['impact']['score'],
+            'impact_reasoning': record['impact']['reasoning'],
+            'likelihood_threshold': assessment.likelihood_threshold,
+            'impact_threshold': assessment.impact_threshold,
+            'high_priority': record['high_priority'],
+            'control_id': '',
+            'control_name': '',
+            'implementation_status': '',
+            'implementation_notes': '',
+        }
+        if not record['controls']:
+            yield row
+            continue
+        for control in record['controls']:
+            yield dict(row, control_id=control['id'], control_name=control['name'],
+                       implementation_status=control['implementation_status'],
+                       implementation_notes=control['implementation_notes'])
+
+
+def _spreadsheet_text(value: Any) -> Any:
+    """Return a cell value that spreadsheets show as text instead of evaluating it as a formula.
+
+    LLM- and user-supplied text starting with a formula character is
+    prefixed with an apostrophe; other values are returned unchanged.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _selected_capabilities(assessment: Assessment, register: Register) -> List[Dict[str, Any]]:
+    """Selected capabilities with their names and categories."""
+    selected = assessment.selected_capabilities
+    if not selected and assessment.capability_analysis is not None:
+        selected = assessment.capability_analysis.applicable_capabilities
+    return [
+        {'id': cap_id, 'name': register.capabilities[cap_id]['name'],
+         'category': register.capabilities[cap_id]['category']}
+        for cap_id in selected if cap_id in register.capabilities
+    ]
+
+
+def write_assessment_json(assessment: Assessment, fp: TextIO, register: Optional[Register] = None) -> None:
+    """Write the assessment as a single JSON document, one risk at a time."""
+    register = register or load_register()
+    header = {
+        'register_version': register.version,
+        'application_info': assessment.application_info,
+        'application_description': assessment.application_description,
+        'capability_reasoning': assessment.capability_analysis.reasoning if assessment.capability_analysis else None,
+        'capabilities': _selected_capabilities(assessment, register),
+        'risk_analysis_reasoning': assessment.analysis_reasoning,
+        'thresholds': {'likelihood': assessment.likelihood_threshold, 'impact': assessment.impact_threshold},
+        'high_priority_risks': assessment.high_priority_risks or [],
+    }
+    # Emit the header object without its closing brace, then stream the risks
+    fp.write(json.dumps(header, ensure_ascii=False)[:-1])
+    fp.write(', "risks": [')
+    for position, record in enumerate(iter_risk_records(assessment, register)):
+        if position:
+            fp.write(', ')
+        fp.write(json.dumps(record, ensure_ascii=False))
+    fp.write(']}\n')
+
+
+def write_assessment_csv(assessment: Assessment, fp: TextIO, register: Optional[Register] = None) -> None:
+    """Write the assessment as CSV with one row per risk/control pair."""
+    register = register or load_register()
+    writer = csv.DictWriter(fp, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows({column: _spreadsheet_text(value) for column, value in row.items()}
+                     for row in iter_export_rows(assessment, register))
+
+
+def _md(text: Any) -> str:
+    """Flatten text for a Markdown table cell."""
+    return str(text).replace('|', '\\|').replace('\r', ' ').replace('\n', ' ')
+
+
+def write_assessment_markdown(assessment: Assessment, fp: TextIO, register: Optional[Register] = None) -> None:
+    """Write the assessment as a Markdown report."""
+    register = register or load_register()
+    info = assessment.application_info
+
+    fp.write("# Agentic Risk Capability Framework Assessment\n\n")
+    fp.write("## 1. Application Information\n\n")
+    if assessment.application_description is not None:
+        fp.write(f"{assessment.application_description}\n\n")
+    for label, field in (('Description', 'description'), ('Data Classification', 'data_classification'),
+                         ('Human in the Loop', 'human_in_loop'), ('Public Facing', 'public_facing'),
+                         ('Criticality', 'criticality'), ('PII Data', 'pii_data'), ('Components', 'components')):
+        fp.write(f"- **{label}:** {_md(info.get(field, 'Not provided'))}\n")
+    fp.write("\n")
+
+    fp.write("## 2. System Capabilities\n\n")
+    if assessment.capability_analysis is not None:
+        fp.write(f"{assessment.capability_analysis.reasoning}\n\n")
+    for capability in _selected_capabilities(assessment, register):
+        fp.write(f"- {capability['id']}: {capability['name']} ({capability['category']})\n")
+    fp.write("\n")
+
+    fp.write("## 3. Risk Assessment\n\n")
+    fp.write(f"Control thresholds: Likelihood ≥ {assessment.likelihood_threshold} "
+             f"AND Impact ≥ {assessment.impact_threshold}\n\n")
+    fp.write("| Risk | Name | Likelihood | Impact | High priority | Context |\n")
+    fp.write("|------|------|-----------:|-------:|:-------------:|---------|\n")
+    records = []
+    for record in iter_risk_records(assessment, register):
+        records.append(record)
+        fp.write(f"| {record['id']} | {_md(record['name'])} | {record['likelihood']['score']} | "
+                 f"{record['impact']['score']} | {'✔' if record['high_priority'] else ''} | {_md(record['context'])} |\n")
+    fp.write("\n")
+
+    fp.write("## 4. Controls and Implementation\n\n")
+    for record in records:
+        if not record['high_priority']:
+            continue
+        fp.write(f"### {record['id']}: {record['name']}\n\n")
+        for control in record['controls']:
+            status = IMPLEMENTATION_STATUS_LABELS[ImplementationStatus(control['implementation_status'])]
+            notes = f": {_md(control['implementation_notes'])}" if control['implementation_notes'] else ""
+            fp.write(f"- **{control['id']}: {control['name']}** — {status}{notes}\n")
+        fp.write("\n")
+
+
+def write_assessment_xlsx(assessment: Assessment, fp: BinaryIO, register: Optional[Register] = None) -> None:
+    """Write the assessment as an XLSX workbook using openpyxl's write-only mode.
+
+    Sheets: Summary (application details and thresholds), Capabilities and
+    Risks (one row per risk/control pair, same columns as the CSV export).
+    Text cells are escaped like the CSV export, and control characters that
+    XLSX cannot store are removed.
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    except ImportError as e:
+        raise ImportError("XLSX export requires openpyxl. Install it with: pip install openpyxl") from e
+
+    def _cell(value: Any) -> Any:
+        if isinstance(value, str):
+            value = ILLEGAL_CHARACTERS_RE.sub('', value)
+        return _spreadsheet_text(value)
+
+    register = register or load_register()
+    workbook = Workbook(write_only=True)
+
+    summary = workbook.create_sheet("Summary")
+    summary.append(["Field", "Value"])
+    for field, value in assessment.application_info.items():
+        summary.append([_cell(field), _cell(str(value))])
+    summary.append(["application_description", _cell(assessment.application_description or "")])
+    summary.append(["likelihood_threshold", assessment.likelihood_threshold])
+    summary.append(["impact_threshold", assessment.impact_threshold])
+    summary.append(["register_version", register.version])
+
+    capabilities = workbook.create_sheet("Capabilities")
+    capabilities.append(["id", "name", "category"])
+    for capability in _selected_capabilities(assessment, register):
+        capabilities.append([_cell(capability[column]) for column in ('id', 'name', 'category')])
+
+    risks = workbook.create_sheet("Risks")
+    risks.append(list(EXPORT_COLUMNS))
+    for row in iter_export_rows(assessment, register):
+        risks.append([_cell(row[column]) for column in EXPORT_COLUMNS])
+
+    workbook.save(fp)
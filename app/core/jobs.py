@@ -0,0 +1,480 @@
+"""Background jobs for the long LLM stages, persisted in SQLite.
+
+A Streamlit script run only submits a job and polls it: the work runs on a
+bounded thread pool, so reruns, page changes and reloads no longer abandon a
+generation that was already paid for, and server threads are free to serve
+other sessions. Every job's status, progress, partial result and outcome is
+kept in a job table, so a session of the job's owner (see
+utils.session_utils.get_store_owner) that knows its ID can reattach to it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, NamedTuple, Optional
+
+from core.diagnostics import Diagnostics
+from core.llm import AnalysisCancelled, analyze_capabilities, analyze_risks
+from core.register import load_register
+from models.schemas import RiskAssessment
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Jobs run at once per process (further jobs wait in the queue)
+DEFAULT_JOB_WORKERS = 4
+
+# Finished jobs are deleted this long after they last changed
+JOB_RETENTION_SECONDS = 24 * 60 * 60
+
+# Queued and running jobs refresh their updated_at this often while their process is alive
+JOB_HEARTBEAT_SECONDS = 10
+
+# Active jobs not refreshed for this long died with their process and are marked failed
+JOB_STALE_SECONDS = 6 * JOB_HEARTBEAT_SECONDS
+
+# Identifies the process that runs a job
+_WORKER = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class JobCancelled(AnalysisCancelled):
+    """Raised inside a job once its cancellation has been requested.
+
+    A subclass of core.llm.AnalysisCancelled, so raising it from an analysis
+    callback stops the analysis instead of being reported as an LLM error.
+    """
+
+
+class Job(NamedTuple):
+    """A row of the job table."""
+    id: str
+    kind: str
+    key: str                   # Hash of kind and parameters; identical requests share a job
+    owner: str                 # Owner key of the session that submitted the job
+    status: str                # One of ACTIVE_STATUSES or FINISHED_STATUSES
+    params: Dict[str, Any]
+    done: int                  # Units of work completed (e.g. risks assessed)
+    total: int                 # Units of work expected (0 if unknown)
+    message: str               # Latest progress message
+    partial: Optional[Any]     # Latest partial result reported by the job
+    result: Optional[Any]      # Return value of a succeeded job
+    error: str                 # Error message of a failed job
+    cancel_requested: bool
+    created_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped, successfully or not."""
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def progress(self) -> float:
+        """Completed share of the work, from 0 to 1."""
+        if self.status == SUCCEEDED:
+            return 1.0
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+
+_COLUMNS = ('id', 'kind', 'key', 'owner', 'status', 'params', 'done', 'total', 'message', 'partial', 'result',
+            'error', 'cancel_requested', 'created_at', 'updated_at')
+
+
+def _row_to_job(row: tuple) -> Job:
+    values = dict(zip(_COLUMNS, row))
+    for column in ('params', 'partial', 'result'):
+        values[column] = json.loads(values[column]) if values[column] is not None else None
+    values['cancel_requested'] = bool(values['cancel_requested'])
+    return Job(**values)
+
+
+def job_key(kind: str, params: Dict[str, Any]) -> str:
+    """Return the deduplication key of a job request."""
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JobContext:
+    """Handle a running job uses to report progress and check for cancellation."""
+
+    def __init__(self, runner: "JobRunner", job_id: str):
+        self.runner = runner
+        self.job_id = job_id
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation of this job has been requested."""
+        return self.runner._cancel_requested(self.job_id)
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation of this job has been requested."""
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None,
+                 partial: Any = None) -> None:
+        """Record progress, and optionally a partial result, then honour any pending cancellation.
+
+        Args:
+            done: Units of work completed
+            total: Units of work expected (unchanged if None)
+            message: Progress message (unchanged if None)
+            partial: JSON-serializable partial result (unchanged if None)
+        """
+        self.runner._update(self.job_id, done=done, total=total, message=message,
+                            partial=None if partial is None else json.dumps(partial))
+        self.check_cancelled()
+
+
+class JobRunner:
+    """Bounded thread pool of background jobs with a SQLite (WAL mode) job table.
+
+    Jobs are looked up by kind in a mapping of job functions; each is called
+    as fn(context, **params) and must return a JSON-serializable result.
+    Jobs belong to the owner that submitted them and are only visible to it;
+    an owner submitting a request identical to one of its queued or running
+    jobs gets that job back instead of starting another. Cancellation is cooperative: it takes
+    effect when the job next reports progress, or before it starts.
+
+    Several processes may share the database. Each one refreshes its active
+    jobs every JOB_HEARTBEAT_SECONDS, and an active job that has not been
+    refreshed for JOB_STALE_SECONDS is taken to have died with its process.
+    """
+
+    def __init__(self, path: str, max_workers: int = DEFAULT_JOB_WORKERS,
+                 kinds: Optional[Dict[str, Callable[..., Any]]] = None):
+        """Create the runner, initialising the database file if needed.
+
+        Active jobs whose process stopped refreshing them are marked failed,
+        and finished jobs older than JOB_RETENTION_SECONDS are deleted.
+
+        Args:
+            path: Path of the SQLite database file
+            max_workers: Maximum number of jobs running at once
+            kinds: Job functions by kind (defaults to JOB_KINDS)
+        """
+        self.path = path
+        self.kinds = JOB_KINDS if kinds is None else kinds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="arc-job")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " owner TEXT NOT NULL DEFAULT '',"
+                " worker TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " done INTEGER NOT NULL DEFAULT 0,"
+                " total INTEGER NOT NULL DEFAULT 0,"
+                " message TEXT NOT NULL DEFAULT '',"
+                " partial TEXT,"
+                " result TEXT,"
+                " error TEXT NOT NULL DEFAULT '',"
+                " cancel_requested INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'worker' not in columns:
+                # The owner column used to hold the worker process; older jobs go to the single-user owner ('')
+                conn.execute("ALTER TABLE jobs RENAME COLUMN owner TO worker")
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_key ON jobs (key, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at)")
+            self._fail_stale(conn, now)
+            conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) AND updated_at < ?",
+                (*FINISHED_STATUSES, now - JOB_RETENTION_SECONDS),
+            )
+        threading.Thread(target=self._heartbeat, name="arc-job-heartbeat", daemon=True).start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _fail_stale(conn: sqlite3.Connection, now: float) -> None:
+        """Mark active jobs that stopped being refreshed as failed."""
+        conn.execute(
+            f"UPDATE jobs SET status = ?, error = ?, updated_at = ?"
+            f" WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))}) AND updated_at < ?",
+            (FAILED, "Interrupted: the server process running it stopped", now, *ACTIVE_STATUSES,
+             now - JOB_STALE_SECONDS),
+        )
+
+    def _heartbeat(self) -> None:
+        """Refresh updated_at of this process's queued and running jobs, forever."""
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            with self._lock:
+                job_ids = list(self._futures)
+            if not job_ids:
+                continue
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        f"UPDATE jobs SET updated_at = ? WHERE id IN ({', '.join('?' * len(job_ids))})"
+                        f" AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                        (time.time(), *job_ids, *ACTIVE_STATUSES),
+                    )
+            except sqlite3.Error:
+                # A missed heartbeat is retried on the next beat
+                pass
+
+    def submit(self, kind: str, params: Dict[str, Any], owner: str) -> str:
+        """Queue a job, or return the ID of the owner's identical queued or running job.
+
+        Args:
+            kind: Job kind, a key of the runner's job functions
+            params: JSON-serializable keyword arguments of the job function
+            owner: Owner key of the submitting session
+
+        Returns:
+            Job ID
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown job kind '{kind}'. Choose from: {', '.join(self.kinds)}")
+        key = job_key(kind, params)
+        with self._lock:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f"SELECT id FROM jobs WHERE key = ? AND owner = ? AND cancel_requested = 0"
+                    f" AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))}) ORDER BY created_at DESC LIMIT 1",
+                    (key, owner, *ACTIVE_STATUSES),
+                ).fetchone()
+                if row:
+                    return row[0]
+
+                job_id = uuid.uuid4().hex
+                now = time.time()
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, key, status, owner, worker, params, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, key, QUEUED, owner, _WORKER, json.dumps(params), now, now),
+                )
+            self._futures[job_id] = self._executor.submit(self._run, job_id, kind, params)
+        return job_id
+
+    def get(self, job_id: str, owner: Optional[str]) -> Optional[Job]:
+        """Return a job, or None if it does not exist, was pruned or belongs to another owner.
+
+        An active job whose process stopped refreshing it is returned as failed.
+
+        Args:
+            job_id: Job ID
+            owner: Owner key of the requesting session (None for any owner)
+        """
+        query = f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?"
+        with self._connect() as conn:
+            row = conn.execute(query, (job_id,)).fetchone()
+            if row is not None and owner is not None and _row_to_job(row).owner != owner:
+                row = None
+            if row is None:
+                return None
+            job = _row_to_job(row)
+            now = time.time()
+            if not job.finished and job.updated_at < now - JOB_STALE_SECONDS:
+                self._fail_stale(conn, now)
+                job = _row_to_job(conn.execute(query, (job_id,)).fetchone())
+        return job
+
+    def list_jobs(self, owner: Optional[str], status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """List an owner's jobs (every owner's if None), most recently updated first.
+
+        Args:
+            owner: Owner key (None for every owner)
+            status: Only list jobs with this status
+            limit: Maximum number of jobs returned
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs{where} ORDER BY updated_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def cancel(self, job_id: str, owner: Optional[str]) -> bool:
+        """Request cancellation of a queued or running job of the given owner (any owner if None).
+
+        A queued job of this process is cancelled at once; a running one, in
+        this or another process sharing the database, stops at its next
+        progress report. Returns True if the job was still active.
+        """
+        with self._lock:
+            with self._connect() as conn:
+                updated = conn.execute(
+                    f"UPDATE jobs SET cancel_requested = 1, updated_at = ?"
+                    f" WHERE id = ? AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))})"
+                    + ("" if owner is None else " AND owner = ?"),
+                    (time.time(), job_id, *ACTIVE_STATUSES, *(() if owner is None else (owner,))),
+                ).rowcount
+            if not updated:
+                return False
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self._finish(job_id, CANCELLED)
+        return True
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        # Read from the table, so a cancellation requested by any process is seen
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        values = {column: value for column, value in values.items() if value is not None}
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                         (*values.values(), time.time(), job_id))
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: str = "") -> None:
+        self._update(job_id, status=status, error=error,
+                     result=None if result is None else json.dumps(result))
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _run(self, job_id: str, kind: str, params: Dict[str, Any]) -> None:
+        context = JobContext(self, job_id)
+        try:
+            context.check_cancelled()
+            self._update(job_id, status=RUNNING)
+            result = self.kinds[kind](context, **params)
+            context.check_cancelled()
+        except JobCancelled:
+            self._finish(job_id, CANCELLED)
+        except Exception as e:
+            self._finish(job_id, FAILED, error=str(e))
+        else:
+            self._finish(job_id, SUCCEEDED, result=result)
+
+
+def capability_analysis_job(context: JobContext, application_info: Dict[str, Any],
+                            use_cache: bool = True) -> Dict[str, Any]:
+    """Identify the applicable capabilities of an application (see core.llm.analyze_capabilities).
+
+    Returns:
+        Dictionary with the dumped ``capability_analysis`` and ``diagnostics``
+    """
+    context.progress(0, 1, "Identifying applicable capabilities")
+    diagnostics = Diagnostics(stage="capabilities")
+    analysis = analyze_capabilities(application_info, load_register().capabilities, use_cache=use_cache,
+                                    diagnostics=diagnostics)
+    context.progress(1, 1, "Capabilities identified")
+    return {
+        'capability_analysis': analysis.model_dump(),
+        'diagnostics': [item.model_dump() for item in diagnostics],
+    }
+
+
+def risk_analysis_job(context: JobContext, application_info: Dict[str, Any], selected_capabilities: List[str],
+                      applicable_risks: List[str], risk_ids: List[str],
+                      risk_assessments: Optional[Dict[str, Any]] = None,
+                      capability_analysis: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True) -> Dict[str, Any]:
+    """Contextualize risks for an application (see core.llm.analyze_risks).
+
+    Progress and the raw assessments received so far are reported as each
+    shard of risks completes.
+
+    Args:
+        context: Job context
+        application_info: Dictionary containing application details
+        selected_capabilities: Selected capability IDs
+        applicable_risks: All risks applicable to the selection, in display order
+        risk_ids: Applicable risks to assess
+        risk_assessments: Dumped assessments of the other applicable risks, kept as they are
+        capability_analysis: Dumped capability analysis of the session (kept with the
+            job so a reattaching session can restore it)
+        use_cache: When False, bypass the LLM response cache
+
+    Returns:
+        Dictionary with the dumped ``risk_assessments`` of every applicable risk,
+        the analysis ``reasoning`` and ``diagnostics``
+    """
+    register = load_register()
+    capabilities, risks, controls, components, design = register.as_tuple()
+    received: Dict[str, Any] = {}
+
+    def on_shard(assessments: Dict[str, Any]) -> None:
+        received.update(assessments)
+        context.progress(len(received), len(risk_ids), f"Assessed {len(received)} of {len(risk_ids)} risks",
+                         partial={'risk_assessments': received})
+
+    context.progress(0, len(risk_ids), f"Assessing {len(risk_ids)} risks")
+    diagnostics = Diagnostics(stage="risks")
+    analysis = analyze_risks(application_info, selected_capabilities, capabilities, risks, components, design,
+                             risk_ids, use_cache=use_cache, on_shard=on_shard, diagnostics=diagnostics)
+    context.check_cancelled()
+
+    kept = risk_assessments or {}
+    merged = {}
+    for risk_id in applicable_risks:
+        if risk_id in analysis.risk_assessments:
+            merged[risk_id] = analysis.risk_assessments[risk_id].model_dump()
+        elif risk_id in kept:
+            merged[risk_id] = RiskAssessment.model_validate(kept[risk_id]).model_dump()
+    return {
+        'risk_assessments': merged,
+        'reasoning': analysis.reasoning,
+        'diagnostics': [item.model_dump() for item in diagnostics],
+    }
+
+
+# Job functions by kind
+JOB_KINDS: Dict[str, Callable[..., Any]] = {
+    'capabilities': capability_analysis_job,
+    'risks': risk_analysis_job,
+}
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide job runner.
+
+    Configured through environment variables:
+        ARC_JOB_STORE_DIR: directory for the job database (default ~/.local/share/arcvisor)
+        ARC_JOB_WORKERS: maximum number of jobs running at once
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            store_dir = (os.environ.get("ARC_JOB_STORE_DIR")
+                         or os.path.join(os.path.expanduser("~"), ".local", "share", "arcvisor"))
+            _runner = JobRunner(os.path.join(store_dir, "jobs.sqlite3"),
+                                max_workers=int(os.environ.get("ARC_JOB_WORKERS", DEFAULT_JOB_WORKERS)))
+        return _runner
@@ -0,0 +1,777 @@
+"""LLM calls for capability, risk and repository analysis, independent of any UI.
+
+Functions report problems through a Diagnostics collector and deliver
+streamed text through callbacks, so the same pipeline serves the Streamlit
+app, the batch CLI and any other caller.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Callable, Optional
+from litellm import completion, acompletion
+from models.schemas import CapabilityAnalysis, CapabilityEvaluation, RiskAnalysis
+from core.diagnostics import Diagnostics
+from core.llm_cache import get_llm_cache
+from core.register import load_register
+from core.repo_snapshot import (
+    fetch_repo_snapshot,
+    fetch_repo_snapshot_tarball,
+    API_MAX_FILES,
+    TARBALL_MAX_FILES,
+)
+from core.risk_index import RiskIndex
+
+
+class AnalysisCancelled(Exception):
+    """Raised by a progress callback (e.g. on_shard) to stop an analysis; never reported as an LLM error."""
+
+
+# Optional process-wide cap on in-flight LLM calls (None means unlimited)
+_llm_slots: Optional[threading.BoundedSemaphore] = None
+
+# How often an async call waiting for an LLM slot retries
+_LLM_SLOT_POLL_SECONDS = 0.05
+
+
+def set_llm_concurrency(limit: Optional[int]) -> None:
+    """Limit the number of LLM calls in flight across all threads.
+
+    Args:
+        limit: Maximum concurrent LLM calls, or None/0 for no limit
+    """
+    global _llm_slots
+    _llm_slots = threading.BoundedSemaphore(limit) if limit else None
+
+
+def _register_version() -> str:
+    """Return the register version that scopes cached responses."""
+    return load_register().version
+
+
+@contextmanager
+def _llm_slot():
+    """Hold one LLM concurrency slot for the duration of a call."""
+    slots = _llm_slots
+    if slots is None:
+        yield
+        return
+    with slots:
+        yield
+
+
+def _cached_completion(model: str, prompt: str, use_cache: bool = True, **params) -> str:
+    """Call LiteLLM through the persistent response cache.
+
+    Args:
+        model: Model name passed to LiteLLM
+        prompt: User prompt
+        use_cache: When False, skip the cache lookup and refresh the stored entry
+        **params: Additional completion parameters
+
+    Returns:
+        The response message content
+    """
+    messages = [{"role": "user", "content": prompt}]
+    cache = get_llm_cache()
+    key = cache.make_key(model, messages, params, _register_version())
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    with _llm_slot():
+        response = completion(model=model, messages=messages, **params)
+    content = response.choices[0].message.content
+
+    # Never cache a JSON-mode response that cannot be parsed
+    if params.get("response_format", {}).get("type") == "json_object":
+        try:
+            json.loads(content)
+        except (TypeError, ValueError):
+            return content
+    cache.set(key, model, content)
+    return content
+
+
+def _cached_stream(model: str, prompt: str, on_text: Callable[[str], None], use_cache: bool = True, **params) -> str:
+    """Stream a LiteLLM completion through the persistent response cache.
+
+    On a cache hit the full response is delivered to on_text in one call.
+
+    Args:
+        model: Model name passed to LiteLLM
+        prompt: User prompt
+        on_text: Called with the accumulated response text as it arrives
+        use_cache: When False, skip the cache lookup and refresh the stored entry
+        **params: Additional completion parameters
+
+    Returns:
+        The full response text
+    """
+    messages = [{"role": "user", "content": prompt}]
+    cache = get_llm_cache()
+    key = cache.make_key(model, messages, params, _register_version())
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            on_text(cached)
+            return cached
+
+    full_response = ""
+    with _llm_slot():
+        response = completion(model=model, messages=messages, stream=True, **params)
+        for chunk in response:
+            if chunk.choices[0].delta.content:
+                full_response += chunk.choices[0].delta.content
+                on_text(full_response)
+
+    cache.set(key, model, full_response)
+    return full_response
+
+
+def analyze_capabilities(application_info: Dict[str, Any], capabilities: Dict[str, Any],
+                         use_cache: bool = True, diagnostics: Optional[Diagnostics] = None) -> CapabilityAnalysis:
+    """Use LiteLLM to identify applicable capabilities for the application.
+    
+    Args:
+        application_info: Dictionary containing application details
+        capabilities: Dictionary of available capabilities
+        use_cache: When False, bypass the LLM response cache
+        diagnostics: Optional collector for parse warnings and errors
+        
+    Returns:
+        CapabilityAnalysis object with applicable capabilities and reasoning
+    """
+    # Prepare capabilities list for the prompt with detailed information
+    capabilities_text = ""
+    capability_ids = []
+    for cap_id, cap_data in capabilities.items():
+        capability_ids.append(cap_id)
+        capabilities_text += f"\n{cap_id}:\n"
+        capabilities_text += f"  Name: {cap_data['name']}\n"
+        capabilities_text += f"  Category: {cap_data['category']}\n"
+        if 'description' in cap_data:
+            capabilities_text += f"  Description: {cap_data['description']}\n"
+
+    prompt = f"""You are an expert in AI system analysis. You must systematically evaluate EACH capability listed below to determine if it applies to this application.
+
+Application Information:
+- What does your application do? {application_info.get('description', 'Not provided')}
+- Data classification: {application_info.get('data_classification', 'Not provided')}
+- Human in the loop: {application_info.get('human_in_loop', 'Not provided')}
+- Public facing: {application_info.get('public_facing', 'Not provided')}
+- Criticality: {application_info.get('criticality', 'Not provided')}
+- PII data: {application_info.get('pii_data', 'Not provided')}
+- Components: {application_info.get('components', 'Not provided')}
+
+INSTRUCTIONS:
+1. Go through EACH of the {len(capability_ids)} capabilities listed below ONE BY ONE
+2. For EACH capability, decide: Does this capability apply to this specific application?
+3. For EACH capability, provide reasoning for your decision
+
+Capabilities to Evaluate ({len(capability_ids)} total):
+{capabilities_text}
+
+CRITICAL: You MUST evaluate ALL {len(capability_ids)} capabilities listed above. Do not skip any.
+
+Return your response as a JSON object with this EXACT structure:
+{{
+    "evaluations": [
+        {{
+            "capability_id": "CAP-XXX",
+            "applies": true,
+            "reasoning": "This capability applies because..."
+        }},
+        {{
+            "capability_id": "CAP-YYY",
+            "applies": false,
+            "reasoning": "This does not apply because..."
+        }}
+    ]
+}}
+
+The "evaluations" array must contain exactly {len(capability_ids)} objects, one for each capability.
+"""
+
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    try:
+        content = _cached_completion(
+            "gpt-4o",  # Use more capable model for systematic evaluation
+            prompt,
+            use_cache=use_cache,
+            response_format={"type": "json_object"},
+            temperature=0  # Deterministic for consistency
+        )
+
+        result = json.loads(content)
+
+        # Parse evaluations
+        evaluations = result.get('evaluations', [])
+
+        # Extract applicable capabilities
+        applicable_capabilities = []
+        evaluation_details = []
+
+        for eval_data in evaluations:
+            try:
+                evaluation = CapabilityEvaluation(**eval_data)
+                evaluation_details.append(evaluation)
+                if evaluation.applies:
+                    applicable_capabilities.append(evaluation.capability_id)
+            except Exception as e:
+                diagnostics.warning(f"Could not parse evaluation: {eval_data}. Error: {str(e)}")
+                continue
+
+        # Generate overall reasoning
+        reasoning = f"Evaluated {len(evaluations)} capabilities. {len(applicable_capabilities)} found to be applicable based on the application's characteristics."
+
+        return CapabilityAnalysis(
+            applicable_capabilities=applicable_capabilities,
+            reasoning=reasoning
+        )
+    except Exception as e:
+        diagnostics.error(f"Error calling LLM: {str(e)}")
+        return CapabilityAnalysis(applicable_capabilities=[], reasoning="Error occurred during analysis")
+
+
+# Risk contextualization settings
+RISK_ANALYSIS_MODEL = "gpt-5"  # Use more capable model for better structured output reliability
+RISK_SHARD_SIZE = int(os.environ.get("ARC_RISK_SHARD_SIZE", "10"))
+RISK_SHARD_CONCURRENCY = int(os.environ.get("ARC_RISK_SHARD_CONCURRENCY", "4"))
+RISK_SHARD_BY = os.environ.get("ARC_RISK_SHARD_BY", "size")
+
+
+def _build_risk_prompt(application_info: Dict[str, Any], capabilities_text: str,
+                       risks: Dict[str, Any], risk_ids: List[str]) -> str:
+    """Build the risk contextualization prompt for a list of risks."""
+    # Prepare risks text for the specific risks we want to assess
+    risks_text = ""
+    for risk_id in risk_ids:
+        if risk_id in risks:
+            risk_data = risks[risk_id]
+            risks_text += f"- {risk_id}: {risk_data['name']}\n"
+            risks_text += f"  Description: {risk_data['description']}\n"
+            if risk_data.get('capabilities'):
+                risks_text += f"  Capabilities: {', '.join(risk_data['capabilities'])}\n"
+            if risk_data.get('components'):
+                risks_text += f"  Components: {', '.join(risk_data['components'])}\n"
+            if risk_data.get('design'):
+                risks_text += f"  Design: {', '.join(risk_data['design'])}\n"
+            risks_text += "\n"
+    
+    return f"""You are an expert in agentic AI risk assessment. Based on the following application information and selected capabilities, assess the risks and provide detailed likelihood and impact scores.
+
+Application Information:
+- What does your application do? {application_info.get('description', 'Not provided')}
+- Data classification: {application_info.get('data_classification', 'Not provided')}
+- Human in the loop: {application_info.get('human_in_loop', 'Not provided')}
+- Public facing: {application_info.get('public_facing', 'Not provided')}
+- Criticality: {application_info.get('criticality', 'Not provided')}
+- PII data: {application_info.get('pii_data', 'Not provided')}
+- Components: {application_info.get('components', 'Not provided')}
+
+Selected Capabilities:
+{capabilities_text}
+
+Risks to Assess (you MUST assess ALL {len(risk_ids)} risks):
+{risks_text}
+
+CRITICAL INSTRUCTIONS:
+1. You MUST assess ALL {len(risk_ids)} risks listed above. Do not skip any.
+2. For each risk, provide specific context referencing the application details. Where possible, reference the specific component of the application that is at risk, and how the risk materializes into specific failure modes and hazards.
+3. Scores MUST be integers between 1 and 5 (inclusive).
+4. All text fields (context, reasoning) MUST be non-empty strings.
+
+Return ONLY a valid JSON object with this EXACT structure (no additional text):
+{{
+    "applicable_risks": {json.dumps(risk_ids)},
+    "risk_assessments": {{
+        "RISK-001": {{
+            "context": "string: 1-2 sentences explaining how this specific risk applies to this application",
+            "likelihood": {{
+                "score": 3,
+                "reasoning": "string: Brief explanation of this likelihood score"
+            }},
+            "impact": {{
+                "score": 4,
+                "reasoning": "string: Brief explanation of this impact score"
+            }}
+        }}
+    }},
+    "reasoning": "string: 1-2 sentences explaining overall approach"
+}}
+
+Remember:
+- All scores must be integers 1-5
+- All text fields must be non-empty strings
+- Include ALL {len(risk_ids)} risks in risk_assessments
+"""
+
+
+def _shard_risk_ids(risk_ids: List[str], risks: Dict[str, Any], shard_size: int,
+                    shard_by: str = "size") -> List[List[str]]:
+    """Split risk IDs into shards of at most shard_size risks.
+
+    Args:
+        risk_ids: Risk IDs to assess, in display order
+        risks: Dictionary of available risks
+        shard_size: Maximum number of risks per shard
+        shard_by: "size" for consecutive fixed-size shards, or "element" to keep
+            risks of the same capability/component/design together
+
+    Returns:
+        List of shards, each a list of risk IDs
+
+    Raises:
+        ValueError: If shard_by is neither "size" nor "element"
+    """
+    if shard_by not in ("size", "element"):
+        raise ValueError(f"Unknown shard_by '{shard_by}'. Choose from: size, element")
+    if shard_by == "element":
+        groups: Dict[str, List[str]] = {}
+        for risk_id in risk_ids:
+            risk_data = risks.get(risk_id, {})
+            element_ids = (tuple(risk_data.get('capabilities') or ()) + tuple(risk_data.get('components') or ())
+                           + tuple(risk_data.get('design') or ()))
+            groups.setdefault(element_ids[0] if element_ids else "", []).append(risk_id)
+    else:
+        groups = {"": list(risk_ids)}
+
+    shards = []
+    for group in groups.values():
+        for start in range(0, len(group), shard_size):
+            shards.append(group[start:start + shard_size])
+    return shards
+
+
+async def _acached_completion(model: str, prompt: str, use_cache: bool = True, **params) -> str:
+    """Async counterpart of _cached_completion using litellm.acompletion."""
+    messages = [{"role": "user", "content": prompt}]
+    cache = get_llm_cache()
+    key = cache.make_key(model, messages, params, _register_version())
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    slots = _llm_slots
+    if slots is not None:
+        # Poll for a slot without blocking the event loop. A blocking acquire in
+        # an executor thread would still take the slot after this task was
+        # cancelled, and nothing would ever release it.
+        while not slots.acquire(blocking=False):
+            await asyncio.sleep(_LLM_SLOT_POLL_SECONDS)
+    try:
+        response = await acompletion(model=model, messages=messages, **params)
+    finally:
+        if slots is not None:
+            slots.release()
+    content = response.choices[0].message.content
+
+    # Never cache a JSON-mode response that cannot be parsed
+    if params.get("response_format", {}).get("type") == "json_object":
+        try:
+            json.loads(content)
+        except (TypeError, ValueError):
+            return content
+    cache.set(key, model, content)
+    return content
+
+
+async def _assess_risk_shard(application_info: Dict[str, Any], capabilities_text: str, risks: Dict[str, Any],
+                             shard: List[str], semaphore: asyncio.Semaphore, max_retries: int,
+                             use_cache: bool) -> Tuple[Dict[str, Any], str, List[str]]:
+    """Assess one shard, re-prompting for risks missing from the response.
+
+    Returns:
+        Tuple of (risk assessments, shard reasoning, error messages)
+    """
+    assessments: Dict[str, Any] = {}
+    reasoning = ""
+    errors: List[str] = []
+    pending = list(shard)
+    previous: List[str] = []
+
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                content = await _acached_completion(
+                    RISK_ANALYSIS_MODEL,
+                    _build_risk_prompt(application_info, capabilities_text, risks, pending),
+                    # Re-sending an identical prompt must not be served the incomplete cached response
+                    use_cache=use_cache and pending != previous,
+                    response_format={"type": "json_object"},
+                )
+            previous = list(pending)
+            result = json.loads(content)
+            reasoning = reasoning or str(result.get('reasoning') or "")
+            shard_assessments = result.get('risk_assessments') or {}
+            for risk_id in pending:
+                if risk_id in shard_assessments:
+                    assessments[risk_id] = shard_assessments[risk_id]
+        except Exception as e:
+            errors.append(f"Risk batch {shard[0]}..{shard[-1]} attempt {attempt + 1} failed: {str(e)}")
+
+        pending = [risk_id for risk_id in pending if risk_id not in assessments]
+        if not pending:
+            break
+
+    return assessments, reasoning, errors
+
+
+def _run_sharded_risk_analysis(application_info: Dict[str, Any], capabilities_text: str, risks: Dict[str, Any],
+                               shards: List[List[str]], max_concurrency: int, max_retries: int,
+                               use_cache: bool, diagnostics: Diagnostics,
+                               on_shard: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Assess all shards concurrently and merge them into one raw result dictionary.
+
+    An exception raised by on_shard aborts the shards still in flight.
+    """
+
+    async def _assess(shard: List[str], semaphore: asyncio.Semaphore):
+        result = await _assess_risk_shard(application_info, capabilities_text, risks, shard, semaphore,
+                                          max_retries, use_cache)
+        if on_shard:
+            on_shard(result[0])
+        return result
+
+    async def _run_all():
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        return await asyncio.gather(*[_assess(shard, semaphore) for shard in shards])
+
+    shard_results = asyncio.run(_run_all())
+
+    merged: Dict[str, Any] = {}
+    reasoning = ""
+    for assessments, shard_reasoning, errors in shard_results:
+        merged.update(assessments)
+        reasoning = reasoning or shard_reasoning
+        for error in errors:
+            diagnostics.warning(error)
+
+    total = sum(len(shard) for shard in shards)
+    return {
+        'risk_assessments': merged,
+        'reasoning': f"{reasoning} (Assessed {total} risks in {len(shards)} parallel batches.)".strip()
+    }
+
+
+def analyze_risks(application_info: Dict[str, Any], selected_capabilities: List[str],
+                  capabilities: Dict[str, Any], risks: Dict[str, Any],
+                  components: Dict[str, Any], design: Dict[str, Any],
+                  applicable_risk_ids: List[str] = None, use_cache: bool = True,
+                  shard_size: Optional[int] = None, shard_by: Optional[str] = None,
+                  max_concurrency: int = RISK_SHARD_CONCURRENCY, max_retries: int = 1,
+                  on_shard: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  diagnostics: Optional[Diagnostics] = None) -> RiskAnalysis:
+    """Use LiteLLM to provide contextualized explanations for specified risks.
+
+    Args:
+        application_info: Dictionary containing application details
+        selected_capabilities: List of selected capability IDs
+        capabilities: Dictionary of available capabilities
+        risks: Dictionary of available risks
+        components: Dictionary of component categories
+        design: Dictionary of design categories
+        applicable_risk_ids: List of risk IDs to assess (if None, will determine from capabilities)
+        use_cache: When False, bypass the LLM response cache
+        shard_size: Maximum risks per LLM call. Larger selections are split into
+            shards assessed concurrently (None uses ARC_RISK_SHARD_SIZE, 0 disables sharding)
+        shard_by: "size" for fixed-size shards, or "element" to group risks by
+            capability/component/design before splitting (None uses ARC_RISK_SHARD_BY)
+        max_concurrency: Maximum number of shards in flight at once
+        max_retries: Re-prompts per shard for risks missing from its response
+        on_shard: Called with the raw assessments of each LLM response as it
+            arrives (once per shard); an exception it raises aborts the analysis,
+            and AnalysisCancelled is re-raised to the caller
+        diagnostics: Optional collector for defaulted assessments and errors
+
+    Returns:
+        RiskAnalysis object with risk assessments
+    """
+    # If no risk IDs provided, determine them from the reverse risk indexes
+    if applicable_risk_ids is None:
+        applicable_risk_ids = RiskIndex(risks).applicable_risks(selected_capabilities)
+    
+    # Prepare capabilities text
+    capabilities_text = ""
+    for cap_id in selected_capabilities:
+        if cap_id in capabilities:
+            cap_data = capabilities[cap_id]
+            capabilities_text += f"- {cap_id}: {cap_data['name']} ({cap_data['category']})\n"
+    
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    try:
+        if shard_size is None:
+            shard_size = RISK_SHARD_SIZE
+        if shard_by is None:
+            shard_by = RISK_SHARD_BY
+        if shard_size and len(applicable_risk_ids) > shard_size:
+            shards = _shard_risk_ids(applicable_risk_ids, risks, shard_size, shard_by)
+            result = _run_sharded_risk_analysis(
+                application_info, capabilities_text, risks, shards,
+                max_concurrency=max_concurrency, max_retries=max_retries, use_cache=use_cache,
+                diagnostics=diagnostics, on_shard=on_shard
+            )
+        else:
+            content = _cached_completion(
+                RISK_ANALYSIS_MODEL,
+                _build_risk_prompt(application_info, capabilities_text, risks, applicable_risk_ids),
+                use_cache=use_cache,
+                response_format={"type": "json_object"},
+            )
+            # Parse with Pydantic model
+            result = json.loads(content)
+            if on_shard and isinstance(result.get('risk_assessments'), dict):
+                on_shard(result['risk_assessments'])
+        
+        # Ensure we return the correct risk IDs (use the ones we determined, not what LLM returned)
+        result['applicable_risks'] = applicable_risk_ids
+        
+        # Validate that we have risk assessments for all applicable risks
+        if 'risk_assessments' not in result:
+            diagnostics.warning("LLM response missing 'risk_assessments' field")
+            result['risk_assessments'] = {}
+        
+        # Check if any risks are missing from the LLM response
+        missing_risks = []
+        for risk_id in applicable_risk_ids:
+            if risk_id not in result['risk_assessments']:
+                missing_risks.append(risk_id)
+        
+        if missing_risks:
+            diagnostics.warning(f"LLM did not provide assessments for {len(missing_risks)} risks: {missing_risks}")
+            # Create default assessments for missing risks
+            for risk_id in missing_risks:
+                result['risk_assessments'][risk_id] = {
+                    "context": "Risk assessment not provided by LLM",
+                    "likelihood": {"score": 3, "reasoning": "Default assessment - please review manually"},
+                    "impact": {"score": 3, "reasoning": "Default assessment - please review manually"}
+                }
+        
+        # Validate and fix nested structures
+        for risk_id, assessment in result['risk_assessments'].items():
+            if not isinstance(assessment, dict):
+                diagnostics.warning(f"Invalid assessment structure for {risk_id}, creating default")
+                result['risk_assessments'][risk_id] = {
+                    "context": "Invalid assessment structure - please review manually",
+                    "likelihood": {"score": 3, "reasoning": "Default assessment"},
+                    "impact": {"score": 3, "reasoning": "Default assessment"}
+                }
+                continue
+
+            # Ensure context exists and is a string
+            if 'context' not in assessment or not assessment.get('context'):
+                assessment['context'] = "Context missing - please review manually"
+            elif not isinstance(assessment['context'], str):
+                assessment['context'] = str(assessment['context'])
+
+            # Validate likelihood structure
+            if 'likelihood' not in assessment or not isinstance(assessment['likelihood'], dict):
+                assessment['likelihood'] = {"score": 3, "reasoning": "Default assessment"}
+            else:
+                # Validate score
+                if 'score' not in assessment['likelihood']:
+                    assessment['likelihood']['score'] = 3
+                else:
+                    try:
+                        score = int(assessment['likelihood']['score'])
+                        # Clamp score between 1 and 5
+                        assessment['likelihood']['score'] = max(1, min(5, score))
+                    except (ValueError, TypeError):
+                        diagnostics.warning(f"Invalid likelihood score for {risk_id}, using default")
+                        assessment['likelihood']['score'] = 3
+
+                # Validate reasoning
+                if 'reasoning' not in assessment['likelihood'] or not assessment['likelihood'].get('reasoning'):
+                    assessment['likelihood']['reasoning'] = "Reasoning not provided"
+                elif not isinstance(assessment['likelihood']['reasoning'], str):
+                    assessment['likelihood']['reasoning'] = str(assessment['likelihood']['reasoning'])
+
+            # Validate impact structure
+            if 'impact' not in assessment or not isinstance(assessment['impact'], dict):
+                assessment['impact'] = {"score": 3, "reasoning": "Default assessment"}
+            else:
+                # Validate score
+                if 'score' not in assessment['impact']:
+                    assessment['impact']['score'] = 3
+                else:
+                    try:
+                        score = int(assessment['impact']['score'])
+                        # Clamp score between 1 and 5
+                        assessment['impact']['score'] = max(1, min(5, score))
+                    except (ValueError, TypeError):
+                        diagnostics.warning(f"Invalid impact score for {risk_id}, using default")
+                        assessment['impact']['score'] = 3
+
+                # Validate reasoning
+                if 'reasoning' not in assessment['impact'] or not assessment['impact'].get('reasoning'):
+                    assessment['impact']['reasoning'] = "Reasoning not provided"
+                elif not isinstance(assessment['impact']['reasoning'], str):
+                    assessment['impact']['reasoning'] = str(assessment['impact']['reasoning'])
+        
+        # Ensure reasoning field exists
+        if 'reasoning' not in result:
+            result['reasoning'] = "Risk assessment completed with some default values"
+        
+        try:
+            risk_analysis = RiskAnalysis(**result)
+            return risk_analysis
+        except Exception as validation_error:
+            diagnostics.error(f"Pydantic validation error: {str(validation_error)}")
+            # Return a minimal valid response
+            return RiskAnalysis(
+                applicable_risks=applicable_risk_ids,
+                risk_assessments={},
+                reasoning="Error in validation - please try again"
+            )
+    
+    except AnalysisCancelled:
+        raise
+    except Exception as e:
+        diagnostics.error(f"Error calling LLM: {str(e)}")
+        return RiskAnalysis(applicable_risks=applicable_risk_ids or [], risk_assessments={}, reasoning="Error occurred during analysis")
+
+
+# Repository snapshot mode: "tarball" (single archive download) or "api" (one request per file)
+REPO_SNAPSHOT_MODE = os.environ.get("ARC_REPO_SNAPSHOT_MODE", "tarball")
+
+
+def _fetch_repo_snapshot(repo_url: str, max_files: Optional[int] = None, max_bytes_per_file: int = 3500,
+                         max_total_chars: int = 18000) -> Tuple[List[Dict[str, str]], str]:
+    """Fetch a lightweight snapshot of a public GitHub repo for LLM analysis.
+
+    Uses the tarball mode by default and falls back to per-file API requests
+    if the archive cannot be downloaded.
+    """
+    if REPO_SNAPSHOT_MODE == "tarball":
+        try:
+            return fetch_repo_snapshot_tarball(
+                repo_url,
+                max_files=max_files or TARBALL_MAX_FILES,
+                max_bytes_per_file=max_bytes_per_file,
+                max_total_chars=max_total_chars,
+            )
+        except ValueError:
+            raise
+        except Exception:
+            pass
+
+    return fetch_repo_snapshot(
+        repo_url,
+        max_files=max_files or API_MAX_FILES,
+        max_bytes_per_file=max_bytes_per_file,
+        max_total_chars=max_total_chars,
+    )
+
+
+def analyze_repository(repo_url: str, on_text: Optional[Callable[[str], None]] = None,
+                       on_start: Optional[Callable[[], None]] = None, use_cache: bool = True,
+                       diagnostics: Optional[Diagnostics] = None) -> Tuple[str, List[Dict[str, str]]]:
+    """Pull a code snapshot from a public GitHub repo and summarize key application components.
+
+    Args:
+        repo_url: Public GitHub repository URL
+        on_text: Called with the accumulated summary as it streams in
+        on_start: Called once, when the first chunk of the summary arrives
+        use_cache: When False, bypass the LLM response cache
+        diagnostics: Optional collector for fetch and LLM errors
+
+    Returns:
+        Tuple of (summary, files included in the snapshot); the summary is empty on failure
+    """
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    try:
+        files, branch = _fetch_repo_snapshot(repo_url)
+    except Exception as fetch_error:
+        diagnostics.error(f"Repository fetch failed: {fetch_error}")
+        return "", []
+
+    # Build compact context for the LLM
+    file_blurbs = "".join([f"\n### {f['path']}\n{f['content']}\n" for f in files])
+
+    prompt = f"""
+You are a coding-focused architect. Given selected files from a public repository, produce a concise natural-language summary of the application so the user can drop it directly into their system description.
+
+Repository: {repo_url} (branch: {branch})
+Files (truncated):
+{file_blurbs}
+
+Provide a concise report (<=200 words) with these sections:
+- Application Summary: 2 sentences on the purpose and main stack.
+- Architecture & Components: 4-7 bullets covering services, agents, tools/connectors, MCP servers, data stores, model/LLM usage, runtime surfaces (APIs, queues, schedulers), and deployment artifacts.
+- Data Flow & Config: 3-5 bullets on where data enters/exits, storage layers, notable config/secrets patterns, and observability/logging if present.
+
+Be specific to the observed files. If something is not evident, state the assumption explicitly.
+"""
+
+    try:
+        first_chunk = True
+
+        def _on_text(text: str) -> None:
+            nonlocal first_chunk
+            if first_chunk and on_start:
+                on_start()
+                first_chunk = False
+            if on_text:
+                on_text(text)
+
+        summary = _cached_stream("gpt-5.1-codex", prompt, _on_text, use_cache=use_cache)
+        return summary, files
+    except Exception as e:
+        diagnostics.error(f"Error analyzing repository with LLM: {e}")
+        return "", []
+
+
+def generate_description(application_info: Dict[str, Any], on_text: Optional[Callable[[str], None]] = None,
+                         use_cache: bool = True, diagnostics: Optional[Diagnostics] = None) -> str:
+    """Use LiteLLM to generate a comprehensive application description.
+    
+    Args:
+        application_info: Dictionary containing application details
+        on_text: Called with the accumulated description as it streams in;
+            when omitted the description is requested without streaming
+        use_cache: When False, bypass the LLM response cache
+        diagnostics: Optional collector for LLM errors
+        
+    Returns:
+        Generated application description string
+    """
+    prompt = f"""
+You are an expert in system architecture and application analysis. Based on the following application information, provide a concise description that will be used for risk assessment.
+
+Application Information:
+- What does your application do? {application_info.get('description', 'Not provided')}
+- Data classification: {application_info.get('data_classification', 'Not provided')}
+- Human in the loop: {application_info.get('human_in_loop', 'Not provided')}
+- Public facing: {application_info.get('public_facing', 'Not provided')}
+- Criticality: {application_info.get('criticality', 'Not provided')}
+- PII data: {application_info.get('pii_data', 'Not provided')}
+- Components: {application_info.get('components', 'Not provided')}
+- Repo URL: {application_info.get('repo_url', 'Not provided')}
+- Repo codebase summary: {application_info.get('repo_analysis', 'Not provided')}
+
+Write a crisp description (target 120-150 words) with three parts:
+1) Overview (2-3 sentences): what the system does, sensitivity level, public-facing status, criticality.
+2) Architecture (3-5 short bullets): key frontend/backends, data stores, AI/LLM usage, integrations/tools/MCP servers, where PII flows if any.
+3) User flow (3-5 short bullets): how users interact, key steps, human-in-loop points.
+
+Keep language tight and avoid repetition. Do not add a title or headings in the output—just the paragraphs/bullets.
+"""
+
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+
+    try:
+        if on_text is None:
+            # Streamed and non-streamed calls share a cache key
+            return _cached_completion("gpt-4o-mini", prompt, use_cache=use_cache)
+        return _cached_stream("gpt-4o-mini", prompt, on_text, use_cache=use_cache)
+    except Exception as e:
+        diagnostics.error(f"Error generating application description: {str(e)}")
+        return "Error occurred while generating description."
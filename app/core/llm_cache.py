@@ -0,0 +1,225 @@
+"""Persistent on-disk cache for LLM responses with LRU eviction."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+# Default cache limits
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only prompt changes share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with size- and age-based LRU eviction.
+
+    Entries are keyed on (model, normalized messages, call parameters,
+    register version). A fresh connection is opened per operation so the
+    cache can be shared by Streamlit sessions and worker threads.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS,
+                 enabled: bool = True):
+        """Create the cache, initialising the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Maximum total size of cached responses
+            max_entries: Maximum number of cached responses
+            max_age_seconds: Entries older than this are treated as misses
+            enabled: When False every lookup misses and nothing is stored
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with self._connect() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS responses ("
+                        " key TEXT PRIMARY KEY,"
+                        " model TEXT NOT NULL,"
+                        " value TEXT NOT NULL,"
+                        " size INTEGER NOT NULL,"
+                        " created_at REAL NOT NULL,"
+                        " accessed_at REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            except sqlite3.Error:
+                # An unwritable cache location disables caching rather than the app
+                self.enabled = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None,
+                 register_version: str = "") -> str:
+        """Build a cache key for an LLM call.
+
+        Args:
+            model: Model name passed to LiteLLM
+            messages: Chat messages sent to the model
+            params: Remaining completion parameters (temperature, response_format, ...)
+            register_version: Content hash of the risk register in use
+
+        Returns:
+            Hex digest identifying the call
+        """
+        normalized_messages = [
+            {"role": message.get("role"), "content": _normalize_prompt(str(message.get("content", "")))}
+            for message in messages
+        ]
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": normalized_messages,
+                "params": params or {},
+                "register_version": register_version,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        value = None
+        if self.enabled:
+            now = time.time()
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and now - row[1] <= self.max_age_seconds:
+                        value = row[0]
+                        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    elif row:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            except sqlite3.Error:
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, model: str, value: str) -> None:
+        """Store a response and evict entries beyond the configured limits."""
+        if not self.enabled or not value:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, value, len(value.encode("utf-8")), now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones until within limits."""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        """Remove every cached response and reset the counters."""
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM responses")
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache usage."""
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                    ).fetchone()
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": size,
+            }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache.
+
+    Configured through environment variables:
+        ARC_LLM_CACHE: set to "0"/"false"/"off" to bypass the cache entirely
+        ARC_LLM_CACHE_DIR: directory for the cache database (default ~/.cache/arcvisor)
+        ARC_LLM_CACHE_MAX_MB: maximum cache size in megabytes
+        ARC_LLM_CACHE_MAX_AGE_DAYS: maximum age of an entry in days
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            enabled = os.environ.get("ARC_LLM_CACHE", "1").strip().lower() not in ("0", "false", "off", "no")
+            cache_dir = os.environ.get("ARC_LLM_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "arcvisor")
+            max_mb = float(os.environ.get("ARC_LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+            max_age_days = float(os.environ.get("ARC_LLM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_SECONDS / 86400))
+            _cache = LLMResponseCache(
+                os.path.join(cache_dir, "llm_responses.sqlite3"),
+                max_bytes=int(max_mb * 1024 * 1024),
+                max_age_seconds=int(max_age_days * 86400),
+                enabled=enabled,
+            )
+        return _cache
@@ -0,0 +1,262 @@
+"""Register loading, independent of any UI framework."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Tuple, Optional
+
+from core import register_compiler, register_loader
+from core.controls import build_risk_control_joins
+from core.coverage import ControlCoverage
+from core.diagnostics import Diagnostics
+from core.register_loader import (REGISTER_ROLES, RegisterModel, RegisterVariant, build_model, get_variant,
+                                  read_sources)
+from core.risk_index import RiskIndex
+from core.scoring import ScoringIndex
+
+# Register source roles, in the order load_data() returns them
+REGISTER_FILES = REGISTER_ROLES
+
+# Bump whenever the snapshot layout changes so stale snapshots are ignored
+SNAPSHOT_FORMAT = 3
+
+# Modules that build the snapshotted model; editing them also invalidates snapshots
+_SNAPSHOT_CODE_MODULES = (register_loader, register_compiler)
+
+
+class Register:
+    """A loaded, read-only register version.
+
+    Attributes:
+        version: Content hash of the register source files
+        variant: Register variant name ('bundled' or 'wog')
+        model: Typed register model (None if the register failed to load)
+        capabilities, risks, controls, components, design: Read-only mappings in
+            the bundled register's schema, whichever variant was loaded
+        diagnostics: Messages raised while loading the register
+        data_dir: Directory the register was loaded from
+    """
+
+    def __init__(self, version: str, data: Tuple[Any, ...], diagnostics: Optional[Diagnostics] = None,
+                 data_dir: Optional[str] = None, model: Optional[RegisterModel] = None,
+                 variant: str = 'bundled'):
+        self.version = version
+        self.variant = variant
+        self.model = model
+        self.data_dir = data_dir
+        self.capabilities, self.risks, self.controls, self.components, self.design = data
+        self.diagnostics = diagnostics or Diagnostics(stage="register")
+        self._index: Optional[RiskIndex] = None
+        self._risk_controls: Optional[Dict[str, Tuple[Dict[str, Any], ...]]] = None
+        self._coverage: Optional[ControlCoverage] = None
+        self._scoring: Optional[ScoringIndex] = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def index(self) -> RiskIndex:
+        """Reverse risk indexes, built on first use."""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = RiskIndex(self.risks)
+        return self._index
+
+    @property
+    def risk_controls(self) -> Dict[str, Tuple[Dict[str, Any], ...]]:
+        """Controls of every risk, joined once on first use."""
+        if self._risk_controls is None:
+            with self._index_lock:
+                if self._risk_controls is None:
+                    self._risk_controls = build_risk_control_joins(self.risks, self.controls)
+        return self._risk_controls
+
+    @property
+    def coverage(self) -> ControlCoverage:
+        """Control -> risk bitsets for coverage planning, built on first use."""
+        if self._coverage is None:
+            with self._index_lock:
+                if self._coverage is None:
+                    self._coverage = ControlCoverage(self.risks, self.controls)
+        return self._coverage
+
+    @property
+    def scoring(self) -> ScoringIndex:
+        """Dense risk and risk-control indexes for score matrices, built on first use."""
+        if self._scoring is None:
+            with self._index_lock:
+                if self._scoring is None:
+                    self._scoring = ScoringIndex(self.risks)
+        return self._scoring
+
+    def as_tuple(self) -> Tuple[Any, Any, Any, Any, Any]:
+        """Return (capabilities, risks, controls, components, design)."""
+        return self.capabilities, self.risks, self.controls, self.components, self.design
+
+
+def get_data_dir() -> str:
+    """Return the data directory of the selected register variant (ARC_REGISTER)."""
+    return get_variant().data_dir
+
+
+def _get_snapshot_dir(data_dir: str) -> str:
+    """Return the directory holding compiled register snapshots."""
+    return os.environ.get('ARC_REGISTER_CACHE_DIR') or os.path.join(data_dir, '.register_cache')
+
+
+def _source_signature(variant: RegisterVariant, data_dir: str) -> Tuple[Tuple[str, int, int], ...]:
+    """Cheap stat-based signature of the register source files.
+
+    Used as the in-process cache key so an edited YAML file is picked up on the
+    next call without hashing file contents every time.
+    """
+    signature = []
+    for role in REGISTER_ROLES:
+        try:
+            stat = os.stat(os.path.join(data_dir, variant.files[role]))
+            signature.append((role, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((role, 0, -1))
+    return tuple(signature)
+
+
+def _hash_sources(variant: RegisterVariant, data_dir: str) -> str:
+    """Compute a content hash over the variant name and all register source files."""
+    digest = hashlib.sha256(variant.name.encode('utf-8'))
+    for role in REGISTER_ROLES:
+        digest.update(role.encode('utf-8'))
+        try:
+            with open(os.path.join(data_dir, variant.files[role]), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def _hash_snapshot_code() -> str:
+    """Compute a content hash over the modules that build the snapshotted model."""
+    digest = hashlib.sha256()
+    for module in _SNAPSHOT_CODE_MODULES:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Code can only change with a restart, so it is hashed once per process
+_SNAPSHOT_CODE_HASH = _hash_snapshot_code()
+
+
+def _snapshot_key(version: str) -> str:
+    """Return the snapshot key: the register version combined with the model-building code."""
+    return hashlib.sha256(f"{version}:{_SNAPSHOT_CODE_HASH}".encode('utf-8')).hexdigest()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _read_snapshot(path: str, key: str) -> Optional[RegisterModel]:
+    """Read a compiled register snapshot, returning None if absent or stale."""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or incompatible snapshot - rebuild from YAML
+        return None
+
+    if (not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT
+            or snapshot.get('key') != key):
+        return None
+    return snapshot['model']
+
+
+def _write_snapshot(snapshot_dir: str, path: str, key: str, model: RegisterModel) -> None:
+    """Atomically write a compiled register snapshot and prune stale ones of the same variant.
+
+    Failures are ignored: the snapshot is an optimisation, and a read-only
+    deployment simply falls back to parsing the YAML files.
+    """
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'format': SNAPSHOT_FORMAT, 'key': key, 'model': model},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        prefix = f'register-{model.variant}-'
+        for entry in os.listdir(snapshot_dir):
+            entry_path = os.path.join(snapshot_dir, entry)
+            if entry.startswith(prefix) and entry_path != path:
+                os.remove(entry_path)
+    except OSError:
+        pass
+
+
+def _build_register(variant: RegisterVariant, data_dir: str) -> Register:
+    """Load the register from its compiled snapshot, rebuilding it if needed.
+
+    Cross-references are validated only when the snapshot is built, i.e. once
+    per register version; the issues found are stored in the snapshotted
+    model and replayed into the register's diagnostics.
+    """
+    diagnostics = Diagnostics(stage="register")
+    version = _hash_sources(variant, data_dir)
+    key = _snapshot_key(version)
+    snapshot_dir = _get_snapshot_dir(data_dir)
+    snapshot_path = os.path.join(snapshot_dir, f'register-{variant.name}-{key[:16]}.pickle')
+
+    model = _read_snapshot(snapshot_path, key)
+    if model is None:
+        sources = read_sources(variant, data_dir, diagnostics)
+        if sources is not None:
+            model = build_model(variant, sources)
+            _write_snapshot(snapshot_dir, snapshot_path, key, model)
+
+    if model is None:
+        data: Tuple[Any, ...] = tuple({} for _ in REGISTER_ROLES)
+    else:
+        for issue in model.issues:
+            diagnostics.add(issue.level, issue.message)
+        data = model.legacy_views()
+
+    return Register(version, tuple(_freeze(d) for d in data), diagnostics, data_dir, model, variant.name)
+
+
+# Most recently loaded register per (variant, data directory), keyed by stat signature
+_loaded: Dict[Tuple[str, str], Tuple[Tuple[Tuple[str, int, int], ...], Register]] = {}
+_loaded_lock = threading.Lock()
+
+
+def load_register(data_dir: Optional[str] = None, variant: Optional[str] = None) -> Register:
+    """Return the register for a data directory, reloading only when it changes.
+
+    The result is shared process-wide: every caller receives the same
+    read-only Register until one of the source files is modified.
+
+    Args:
+        data_dir: Directory containing the register YAML files (defaults to the variant's own)
+        variant: Register variant, 'bundled' or 'wog' (defaults to ARC_REGISTER or 'bundled')
+
+    Returns:
+        Loaded Register; check register.diagnostics for load failures
+    """
+    register_variant = get_variant(variant)
+    data_dir = os.path.abspath(data_dir or register_variant.data_dir)
+    signature = _source_signature(register_variant, data_dir)
+    key = (register_variant.name, data_dir)
+    with _loaded_lock:
+        cached = _loaded.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, _build_register(register_variant, data_dir))
+            _loaded[key] = cached
+        return cached[1]
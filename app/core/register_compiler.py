@@ -0,0 +1,177 @@
+"""Register compiler: ID normalization and cross-reference validation.
+
+Runs once per register version (when the compiled snapshot is built, or when
+the docs data is generated) so that everything downstream can index the
+register directly: every reference the compiled register hands out points at
+an entity that exists, under its canonical ID.
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+# Risk fields that reference elements (bundled schema lists, WoG schema single ID)
+ELEMENT_REFERENCE_FIELDS = ('capabilities', 'components', 'design', 'element_id')
+
+_ID_RE = re.compile(r'^([A-Za-z]+)-0*(\d+)$')
+
+
+class RegisterIssue(NamedTuple):
+    """A problem found while compiling the register."""
+    level: str       # 'error' or 'warning'
+    code: str        # e.g. 'dangling-control', 'backref-mismatch'
+    subject: str     # ID of the entity holding the reference
+    message: str
+
+
+class CompiledReferences(NamedTuple):
+    """Risks and controls with normalized, dangling-free references."""
+    risks: Dict[str, Dict[str, Any]]
+    controls: Dict[str, Dict[str, Any]]
+    issues: List[RegisterIssue]
+    normalized: int  # Number of references rewritten to their canonical ID
+
+
+class RegisterValidationError(ValueError):
+    """Raised by check_issues() when the register has blocking issues."""
+
+    def __init__(self, issues: List[RegisterIssue]):
+        self.issues = issues
+        super().__init__(format_report(issues))
+
+
+class _IdResolver:
+    """Map references to canonical IDs, tolerating zero-padding differences (DES-1 -> DES-01)."""
+
+    def __init__(self, ids: Iterable[str]):
+        self.ids = set(ids)
+        self.by_number: Dict[Tuple[str, int], str] = {}
+        for canonical in self.ids:
+            match = _ID_RE.match(str(canonical))
+            if match:
+                self.by_number.setdefault((match.group(1).upper(), int(match.group(2))), canonical)
+
+    def resolve(self, reference: Any) -> Optional[str]:
+        """Return the canonical ID for a reference, or None if nothing matches."""
+        if reference in self.ids:
+            return reference
+        match = _ID_RE.match(str(reference).strip())
+        if match:
+            return self.by_number.get((match.group(1).upper(), int(match.group(2))))
+        return None
+
+
+def compile_references(risks: Mapping[str, Any], controls: Mapping[str, Any],
+                       elements: Iterable[str]) -> CompiledReferences:
+    """Normalize and validate every cross-reference in the register, in both directions.
+
+    Checks:
+        - risk -> control and risk -> element references resolve (errors; dropped)
+        - control -> risk back-references (``risks:``), when present, resolve and
+          agree with the risks' ``controls`` lists (warnings)
+        - every control is used by at least one risk (warnings)
+
+    Args:
+        risks: Risk data keyed by risk ID
+        controls: Control data keyed by control ID
+        elements: IDs of all capabilities, components and design elements
+
+    Returns:
+        CompiledReferences with copies of risks and controls whose references use
+        canonical IDs and never dangle, plus every issue found
+    """
+    issues: List[RegisterIssue] = []
+    normalized = 0
+    control_ids = _IdResolver(controls)
+    element_ids = _IdResolver(elements)
+    risk_ids = _IdResolver(risks)
+
+    def _resolve(resolver: _IdResolver, reference: Any, subject: str, kind: str, code: str,
+                 level: str = 'error') -> Optional[str]:
+        nonlocal normalized
+        canonical = resolver.resolve(reference)
+        if canonical is None:
+            issues.append(RegisterIssue(level, code, subject, f"{subject} references unknown {kind} {reference}"))
+        elif canonical != reference:
+            normalized += 1
+        return canonical
+
+    compiled_risks: Dict[str, Dict[str, Any]] = {}
+    for risk_id, risk_data in risks.items():
+        risk = dict(risk_data or {})
+        resolved_controls = []
+        for reference in risk.get('controls') or ():
+            canonical = _resolve(control_ids, reference, risk_id, 'control', 'dangling-control')
+            if canonical is not None and canonical not in resolved_controls:
+                resolved_controls.append(canonical)
+        risk['controls'] = resolved_controls
+
+        for field in ELEMENT_REFERENCE_FIELDS:
+            if field not in risk:
+                continue
+            value = risk[field]
+            if field == 'element_id':
+                if value:
+                    risk[field] = _resolve(element_ids, value, risk_id, 'element', 'dangling-element') or ''
+                continue
+            resolved_elements = []
+            for reference in value or ():
+                canonical = _resolve(element_ids, reference, risk_id, 'element', 'dangling-element')
+                if canonical is not None and canonical not in resolved_elements:
+                    resolved_elements.append(canonical)
+            risk[field] = resolved_elements
+        compiled_risks[risk_id] = risk
+
+    # Reverse direction: which risks actually use each control
+    used_by: Dict[str, List[str]] = {ctrl_id: [] for ctrl_id in controls}
+    for risk_id, risk in compiled_risks.items():
+        for ctrl_id in risk['controls']:
+            used_by[ctrl_id].append(risk_id)
+
+    compiled_controls: Dict[str, Dict[str, Any]] = {}
+    for ctrl_id, ctrl_data in controls.items():
+        control = dict(ctrl_data or {})
+        if 'risks' in control:
+            declared = []
+            for reference in control.get('risks') or ():
+                canonical = _resolve(risk_ids, reference, ctrl_id, 'risk', 'dangling-backref', level='warning')
+                if canonical is None:
+                    continue
+                if canonical not in used_by[ctrl_id]:
+                    issues.append(RegisterIssue('warning', 'backref-mismatch', ctrl_id,
+                                                f"{ctrl_id} lists {canonical}, but {canonical} does not list {ctrl_id}"))
+                declared.append(canonical)
+            for risk_id in used_by[ctrl_id]:
+                if risk_id not in declared:
+                    issues.append(RegisterIssue('warning', 'backref-missing', ctrl_id,
+                                                f"{risk_id} lists {ctrl_id}, but {ctrl_id} does not list {risk_id}"))
+        # The back-reference is derived from the forward references, so it always agrees
+        control['risks'] = list(used_by[ctrl_id])
+        if not used_by[ctrl_id]:
+            issues.append(RegisterIssue('warning', 'unused-control', ctrl_id, f"{ctrl_id} is not used by any risk"))
+        compiled_controls[ctrl_id] = control
+
+    return CompiledReferences(compiled_risks, compiled_controls, issues, normalized)
+
+
+def format_report(issues: List[RegisterIssue]) -> str:
+    """Format issues as a report grouped by level and code."""
+    if not issues:
+        return "No register issues"
+    lines = []
+    for level in ('error', 'warning'):
+        level_issues = [issue for issue in issues if issue.level == level]
+        if not level_issues:
+            continue
+        lines.append(f"{len(level_issues)} {level}(s):")
+        for code in sorted({issue.code for issue in level_issues}):
+            code_issues = [issue for issue in level_issues if issue.code == code]
+            lines.append(f"  {code} ({len(code_issues)}):")
+            lines.extend(f"    - {issue.message}" for issue in code_issues)
+    return "\n".join(lines)
+
+
+def check_issues(issues: List[RegisterIssue], strict: bool = False) -> None:
+    """Raise RegisterValidationError if there are errors (or any issue, when strict)."""
+    blocking = [issue for issue in issues if strict or issue.level == 'error']
+    if blocking:
+        raise RegisterValidationError(issues)
@@ -0,0 +1,400 @@
+"""SQLite/FTS5 artifact of the merged WoG risk register and its query API.
+
+scripts/build_risk_register.py writes the database (``--sqlite``) from the
+same merged data it publishes to the docs. It has normalized tables for
+risks, controls and elements, risk-control and risk-element edge tables, and
+FTS5 indexes over risk statements, descriptions, WoG descriptions and WoG
+examples, and over control statements and recommendations. That turns
+questions such as "risks for element X with failure mode Y mentioning Z"
+into indexed queries instead of YAML parsing and dict walks.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE elements ("
+    " id TEXT PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL,"
+    " description TEXT NOT NULL, wog_examples TEXT NOT NULL)",
+    "CREATE TABLE risks ("
+    " id TEXT PRIMARY KEY, position INTEGER NOT NULL, statement TEXT NOT NULL,"
+    " description TEXT NOT NULL, wog_description TEXT NOT NULL, failure_mode TEXT NOT NULL,"
+    " sources TEXT NOT NULL, wog_examples TEXT NOT NULL)",
+    "CREATE TABLE risk_types (risk_id TEXT NOT NULL REFERENCES risks (id), type TEXT NOT NULL,"
+    " PRIMARY KEY (risk_id, type)) WITHOUT ROWID",
+    "CREATE TABLE controls ("
+    " id TEXT PRIMARY KEY, level INTEGER, statement TEXT NOT NULL,"
+    " recommendations TEXT NOT NULL, \"references\" TEXT NOT NULL)",
+    "CREATE TABLE risk_controls ("
+    " risk_id TEXT NOT NULL REFERENCES risks (id), control_id TEXT NOT NULL REFERENCES controls (id),"
+    " position INTEGER NOT NULL, PRIMARY KEY (risk_id, control_id)) WITHOUT ROWID",
+    "CREATE TABLE risk_elements ("
+    " risk_id TEXT NOT NULL REFERENCES risks (id), element_id TEXT NOT NULL REFERENCES elements (id),"
+    " PRIMARY KEY (risk_id, element_id)) WITHOUT ROWID",
+    "CREATE INDEX idx_risks_failure_mode ON risks (failure_mode)",
+    "CREATE INDEX idx_risk_types_type ON risk_types (type, risk_id)",
+    "CREATE INDEX idx_risk_controls_control ON risk_controls (control_id, risk_id)",
+    "CREATE INDEX idx_risk_elements_element ON risk_elements (element_id, risk_id)",
+    "CREATE INDEX idx_elements_category ON elements (category)",
+    "CREATE VIRTUAL TABLE risks_fts USING fts5("
+    " risk_id UNINDEXED, statement, description, wog_description, wog_examples,"
+    " tokenize = 'porter unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE controls_fts USING fts5("
+    " control_id UNINDEXED, statement, recommendations,"
+    " tokenize = 'porter unicode61 remove_diacritics 2')",
+)
+
+_RISK_COLUMNS = ('id', 'statement', 'description', 'wog_description', 'failure_mode')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def default_db_path() -> str:
+    """Return the register database path: ARC_REGISTER_DB, or arc-risk-register/register.sqlite3."""
+    repo_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+    return os.environ.get('ARC_REGISTER_DB') or os.path.normpath(
+        os.path.join(repo_root, 'arc-risk-register', 'register.sqlite3'))
+
+
+def _examples(value: Any) -> List[str]:
+    """Normalize a wog_examples field to a list of strings."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(example) for example in value]
+
+
+def write_register_db(path: str, data: Dict[str, Any], source_version: str = "") -> None:
+    """Write the merged register to a new SQLite database at path.
+
+    The database is built in a temporary file next to path and renamed into
+    place, so readers never see a half-written register.
+
+    Args:
+        path: Output database path (replaced if it exists)
+        data: Merged register from scripts/build_risk_register.py
+            (``risks`` with their resolved ``controls``, and ``elements``)
+        source_version: Hash of the sources the data was built from
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            _populate(conn, data, source_version)
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _populate(conn: sqlite3.Connection, data: Dict[str, Any], source_version: str) -> None:
+    """Create the schema and insert every row."""
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", (
+        ('schema_version', str(SCHEMA_VERSION)),
+        ('source_version', source_version),
+    ))
+
+    elements = data.get('elements', [])
+    conn.executemany("INSERT INTO elements VALUES (?, ?, ?, ?, ?)", (
+        (element['id'], element.get('name', ''), element.get('category', ''), element.get('description', ''),
+         json.dumps(_examples(element.get('wog_examples'))))
+        for element in elements
+    ))
+    element_ids = {element['id'] for element in elements}
+
+    controls: Dict[str, Dict[str, Any]] = {}
+    for risk in data['risks']:
+        for ctrl in risk.get('controls', ()):
+            controls.setdefault(ctrl['id'], ctrl)
+    conn.executemany("INSERT INTO controls VALUES (?, ?, ?, ?, ?)", (
+        (ctrl_id, ctrl.get('level') if ctrl.get('level') != '' else None, ctrl.get('statement', ''),
+         ctrl.get('recommendations', ''), json.dumps(ctrl.get('references') or []))
+        for ctrl_id, ctrl in controls.items()
+    ))
+    conn.executemany("INSERT INTO controls_fts VALUES (?, ?, ?)", (
+        (ctrl_id, ctrl.get('statement', ''), ctrl.get('recommendations', ''))
+        for ctrl_id, ctrl in controls.items()
+    ))
+
+    for position, risk in enumerate(data['risks']):
+        examples = _examples(risk.get('wog_examples'))
+        conn.execute("INSERT INTO risks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            risk['id'], position, risk.get('statement', ''), risk.get('description', ''),
+            risk.get('wog_description', ''), risk.get('failure_mode', ''),
+            json.dumps(risk.get('sources') or []), json.dumps(examples),
+        ))
+        conn.execute("INSERT INTO risks_fts VALUES (?, ?, ?, ?, ?)", (
+            risk['id'], risk.get('statement', ''), risk.get('description', ''),
+            risk.get('wog_description', ''), '\n'.join(examples),
+        ))
+        conn.executemany("INSERT OR IGNORE INTO risk_types VALUES (?, ?)",
+                         ((risk['id'], risk_type) for risk_type in risk.get('type') or ()))
+        conn.executemany("INSERT OR IGNORE INTO risk_controls VALUES (?, ?, ?)",
+                         ((risk['id'], ctrl['id'], ctrl_position)
+                          for ctrl_position, ctrl in enumerate(risk.get('controls', ()))))
+        # Only resolved elements become edges, so joins never dangle
+        element_id = risk.get('element_id')
+        if element_id in element_ids:
+            conn.execute("INSERT INTO risk_elements VALUES (?, ?)", (risk['id'], element_id))
+
+
+def read_db_meta(path: str) -> Optional[Dict[str, str]]:
+    """Return the meta table of a register database, or None if it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word (each as a prefix).
+
+    Words are quoted so FTS5 operators in user input are treated literally.
+
+    Returns:
+        The query, or None if text contains no words
+    """
+    words = _WORD_RE.findall(text or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class RegisterDB:
+    """Read-only query API over a register database.
+
+    Example:
+        with RegisterDB(path) as db:
+            db.find_risks(element='CMP-01', failure_mode='External Manipulation', text='backdoor')
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Open the database read-only.
+
+        Args:
+            path: Path written by write_register_db() (defaults to default_db_path())
+
+        Raises:
+            FileNotFoundError: If the database does not exist
+            ValueError: If it was written with a different schema version
+        """
+        path = path or default_db_path()
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Register database not found: {path}. "
+                                    f"Build it with: python scripts/build_risk_register.py --sqlite")
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        if self.meta.get('schema_version') != str(SCHEMA_VERSION):
+            self._conn.close()
+            raise ValueError(f"Register database {path} has schema version {self.meta.get('schema_version')}, "
+                             f"expected {SCHEMA_VERSION}. Rebuild it with scripts/build_risk_register.py --sqlite")
+
+    @property
+    def version(self) -> str:
+        """Hash of the sources the database was built from."""
+        return self.meta.get('source_version', '')
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> 'RegisterDB':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def find_risks(self, element: Optional[str] = None, element_category: Optional[str] = None,
+                   failure_mode: Optional[str] = None, risk_type: Optional[str] = None,
+                   control: Optional[str] = None, text: Optional[str] = None,
+                   include_control_text: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find risks matching every given criterion.
+
+        Args:
+            element: Element ID the risk arises from (e.g. CMP-01)
+            element_category: Element category (e.g. "Component - Tools")
+            failure_mode: Failure mode (e.g. "External Manipulation")
+            risk_type: Risk type ("Safety" or "Security")
+            control: Control ID that mitigates the risk
+            text: Words that must all appear in the risk's statement, descriptions or WoG examples
+            include_control_text: Also match text against the risk's controls
+            limit: Maximum number of risks
+
+        Returns:
+            Risk dictionaries (id, statement, description, wog_description, failure_mode,
+            element_id, types), best text matches first, otherwise in register order
+        """
+        joins: List[str] = []
+        clauses: List[str] = []
+        params: List[Any] = []
+        order = "r.position"
+
+        if element is not None or element_category is not None:
+            joins.append("JOIN risk_elements re ON re.risk_id = r.id")
+            if element is not None:
+                clauses.append("re.element_id = ?")
+                params.append(element)
+            if element_category is not None:
+                joins.append("JOIN elements e ON e.id = re.element_id")
+                clauses.append("e.category = ?")
+                params.append(element_category)
+        if failure_mode is not None:
+            clauses.append("r.failure_mode = ?")
+            params.append(failure_mode)
+        if risk_type is not None:
+            clauses.append("r.id IN (SELECT risk_id FROM risk_types WHERE type = ?)")
+            params.append(risk_type)
+        if control is not None:
+            clauses.append("r.id IN (SELECT risk_id FROM risk_controls WHERE control_id = ?)")
+            params.append(control)
+        if text is not None:
+            query = fts_query(text)
+            if query is None:
+                return []
+            if include_control_text:
+                clauses.append(
+                    "(r.id IN (SELECT risk_id FROM risks_fts WHERE risks_fts MATCH ?)"
+                    " OR r.id IN (SELECT rc.risk_id FROM risk_controls rc JOIN controls_fts cf"
+                    " ON cf.control_id = rc.control_id WHERE controls_fts MATCH ?))"
+                )
+                params.extend((query, query))
+            else:
+                # Join the FTS table directly so results can be ranked by relevance
+                joins.append("JOIN risks_fts ON risks_fts.risk_id = r.id")
+                clauses.append("risks_fts MATCH ?")
+                params.append(query)
+                order = "risks_fts.rank, r.position"
+
+        sql = (f"SELECT {', '.join('r.' + column for column in _RISK_COLUMNS)} FROM risks r {' '.join(joins)}"
+               f"{' WHERE ' + ' AND '.join(clauses) if clauses else ''} ORDER BY {order}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        risks = [dict(row) for row in self._conn.execute(sql, params)]
+        self._attach_edges(risks)
+        return risks
+
+    def _attach_edges(self, risks: List[Dict[str, Any]]) -> None:
+        """Add element_id and types to each risk with one query per edge table."""
+        if not risks:
+            return
+        by_id = {risk['id']: risk for risk in risks}
+        for risk in risks:
+            risk['element_id'] = None
+            risk['types'] = []
+        placeholders = ', '.join('?' * len(by_id))
+        for risk_id, element_id in self._conn.execute(
+                f"SELECT risk_id, element_id FROM risk_elements WHERE risk_id IN ({placeholders})", list(by_id)):
+            by_id[risk_id]['element_id'] = element_id
+        for risk_id, risk_type in self._conn.execute(
+                f"SELECT risk_id, type FROM risk_types WHERE risk_id IN ({placeholders}) ORDER BY type", list(by_id)):
+            by_id[risk_id]['types'].append(risk_type)
+
+    def get_risk(self, risk_id: str) -> Optional[Dict[str, Any]]:
+        """Return one risk with its sources, WoG examples and controls, or None."""
+        row = self._conn.execute(
+            f"SELECT {', '.join(_RISK_COLUMNS)}, sources, wog_examples FROM risks WHERE id = ?", (risk_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        risk = dict(row)
+        risk['sources'] = json.loads(risk['sources'])
+        risk['wog_examples'] = json.loads(risk['wog_examples'])
+        self._attach_edges([risk])
+        risk['controls'] = self.controls_for_risks([risk_id]).get(risk_id, [])
+        return risk
+
+    def controls_for_risks(self, risk_ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the controls of each risk, in register order, with one query.
+
+        Args:
+            risk_ids: Risk IDs to look up
+
+        Returns:
+            Dictionary of risk ID -> control dictionaries (id, level, statement, recommendations, references)
+        """
+        risk_ids = list(dict.fromkeys(risk_ids))
+        result: Dict[str, List[Dict[str, Any]]] = {risk_id: [] for risk_id in risk_ids}
+        if not risk_ids:
+            return result
+        rows = self._conn.execute(
+            "SELECT rc.risk_id, c.id, c.level, c.statement, c.recommendations, c.\"references\""
+            " FROM risk_controls rc JOIN controls c ON c.id = rc.control_id"
+            f" WHERE rc.risk_id IN ({', '.join('?' * len(risk_ids))}) ORDER BY rc.risk_id, rc.position",
+            risk_ids,
+        )
+        for row in rows:
+            control = dict(row)
+            control['references'] = json.loads(control['references'])
+            result[control.pop('risk_id')].append(control)
+        return result
+
+    def search_controls(self, text: str, levels: Optional[Sequence[int]] = None,
+                        limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find controls whose statement or recommendations contain every word of text.
+
+        Args:
+            text: Words to search for
+            levels: Only return controls at these levels (0 cardinal, 1 standard, 2 best practice)
+            limit: Maximum number of controls
+
+        Returns:
+            Control dictionaries (id, level, statement, recommendations), best matches first
+        """
+        query = fts_query(text)
+        if query is None:
+            return []
+        sql = ("SELECT c.id, c.level, c.statement, c.recommendations FROM controls_fts"
+               " JOIN controls c ON c.id = controls_fts.control_id WHERE controls_fts MATCH ?")
+        params: List[Any] = [query]
+        if levels is not None:
+            sql += f" AND c.level IN ({', '.join('?' * len(levels))})"
+            params.extend(levels)
+        sql += " ORDER BY controls_fts.rank"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def risks_for_control(self, control_id: str) -> List[str]:
+        """Return the IDs of the risks a control mitigates, in register order."""
+        return [row[0] for row in self._conn.execute(
+            "SELECT rc.risk_id FROM risk_controls rc JOIN risks r ON r.id = rc.risk_id"
+            " WHERE rc.control_id = ? ORDER BY r.position", (control_id,))]
+
+    def facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """Return risk counts per element category, failure mode and risk type."""
+        queries = {
+            'element_category': "SELECT e.category, COUNT(*) FROM risk_elements re"
+                                " JOIN elements e ON e.id = re.element_id GROUP BY e.category",
+            'failure_mode': "SELECT failure_mode, COUNT(*) FROM risks GROUP BY failure_mode",
+            'type': "SELECT type, COUNT(*) FROM risk_types GROUP BY type",
+        }
+        return {name: dict(self._conn.execute(sql).fetchall()) for name, sql in queries.items()}
@@ -0,0 +1,337 @@
+"""Unified loader for the bundled and WoG register variants.
+
+The app's bundled register (``data/*.yaml``: ``name``, ``description``,
+``capabilities``, ``components``, ``design``) and the whole-of-government
+register (``arc-risk-register/*-wog.yaml``: ``statement``, ``element_id``,
+``failure_mode``, ``type``, ``level``, ``wog_adapted_description``...) are
+both parsed, compiled (see core.register_compiler) and mapped onto the same
+typed model here. The app (core.register) and the docs build
+(scripts/build_risk_register.py) consume that model, so there is one parsing
+and enrichment code path whichever variant is selected.
+
+The variant is chosen with the ARC_REGISTER environment variable
+(``bundled``, the default, or ``wog``).
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+
+import yaml
+
+from core.diagnostics import Diagnostics
+from core.register_compiler import RegisterIssue, compile_references
+
+# Source file roles, in the order Register.as_tuple() returns them
+REGISTER_ROLES = ('capabilities', 'risks', 'controls', 'components', 'design')
+
+DEFAULT_VARIANT = 'bundled'
+
+_REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+
+@dataclass(frozen=True)
+class Element:
+    """A capability, component or design element."""
+    id: str
+    kind: str  # 'capability', 'component' or 'design'
+    name: str
+    description: str
+    category: str = ''  # Capability category, e.g. "Cognitive"
+    wog_examples: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Control:
+    """A control; name is the short statement, description what to implement."""
+    id: str
+    name: str
+    description: str
+    level: Optional[int] = None  # 0 cardinal, 1 standard, 2 best practice (WoG only)
+    references: Tuple[str, ...] = ()
+    risks: Tuple[str, ...] = ()  # Risks using the control (derived by the compiler)
+
+
+@dataclass(frozen=True)
+class Risk:
+    """A risk with canonical, dangling-free references."""
+    id: str
+    name: str
+    description: str
+    capabilities: Tuple[str, ...] = ()
+    components: Tuple[str, ...] = ()
+    design: Tuple[str, ...] = ()
+    controls: Tuple[str, ...] = ()
+    sources: Tuple[str, ...] = ()
+    failure_mode: str = ''
+    types: Tuple[str, ...] = ()
+    wog_description: str = ''
+    wog_examples: Tuple[str, ...] = ()
+
+    @property
+    def element_ids(self) -> Tuple[str, ...]:
+        """Every element the risk arises from: components, design, then capabilities."""
+        return self.components + self.design + self.capabilities
+
+
+@dataclass
+class RegisterModel:
+    """A parsed and compiled register variant.
+
+    Attributes:
+        variant: Variant name ('bundled' or 'wog')
+        capabilities, components, design: Elements keyed by ID, in file order
+        risks, controls: Risks and controls keyed by ID, in file order
+        issues: Problems found by the register compiler
+        normalized: Number of references rewritten to canonical IDs
+    """
+    variant: str
+    capabilities: Dict[str, Element]
+    components: Dict[str, Element]
+    design: Dict[str, Element]
+    risks: Dict[str, Risk]
+    controls: Dict[str, Control]
+    issues: List[RegisterIssue] = field(default_factory=list)
+    normalized: int = 0
+
+    @property
+    def elements(self) -> Dict[str, Element]:
+        """All elements keyed by ID: components, design, then capabilities."""
+        return {**self.components, **self.design, **self.capabilities}
+
+    def risks_by_element(self) -> Dict[str, List[str]]:
+        """Risk IDs per element ID, in register order."""
+        index: Dict[str, List[str]] = {}
+        for risk in self.risks.values():
+            for element_id in risk.element_ids:
+                index.setdefault(element_id, []).append(risk.id)
+        return index
+
+    def legacy_views(self) -> Tuple[Dict[str, Any], ...]:
+        """Return (capabilities, risks, controls, components, design) as dictionaries.
+
+        Uses the bundled register's keys (name, description, capabilities,
+        components, design, controls...) so existing callers work with either
+        variant. WoG-only fields are included when set.
+        """
+        def _element(element: Element) -> Dict[str, Any]:
+            view = {'name': element.name, 'description': element.description}
+            if element.kind == 'capability':
+                view['category'] = element.category
+            if element.wog_examples:
+                view['wog_examples'] = list(element.wog_examples)
+            return view
+
+        def _risk(risk: Risk) -> Dict[str, Any]:
+            view = {
+                'name': risk.name,
+                'description': risk.description,
+                'capabilities': list(risk.capabilities),
+                'components': list(risk.components),
+                'design': list(risk.design),
+                'controls': list(risk.controls),
+                'sources': list(risk.sources),
+            }
+            for key, value in (('failure_mode', risk.failure_mode), ('type', list(risk.types)),
+                               ('wog_description', risk.wog_description),
+                               ('wog_examples', list(risk.wog_examples))):
+                if value:
+                    view[key] = value
+            return view
+
+        def _control(control: Control) -> Dict[str, Any]:
+            view = {'name': control.name, 'description': control.description, 'risks': list(control.risks)}
+            if control.level is not None:
+                view['level'] = control.level
+            if control.references:
+                view['references'] = list(control.references)
+            return view
+
+        return (
+            {cap_id: _element(cap) for cap_id, cap in self.capabilities.items()},
+            {risk_id: _risk(risk) for risk_id, risk in self.risks.items()},
+            {ctrl_id: _control(ctrl) for ctrl_id, ctrl in self.controls.items()},
+            {comp_id: _element(comp) for comp_id, comp in self.components.items()},
+            {design_id: _element(design) for design_id, design in self.design.items()},
+        )
+
+
+def _strings(value: Any) -> Tuple[str, ...]:
+    """Normalize an optional string or list field to a tuple of strings."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(str(item) for item in value)
+
+
+def _level(value: Any) -> Optional[int]:
+    """Parse a control level, or None if absent."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Mappings from raw (compiled) YAML entries to the typed model
+
+def _bundled_capability(cap_id: str, data: Mapping[str, Any]) -> Element:
+    return Element(cap_id, 'capability', data.get('name', ''), data.get('description', ''),
+                   data.get('category', ''))
+
+
+def _wog_capability(cap_id: str, data: Mapping[str, Any]) -> Element:
+    description = (data.get('wog_adapted_description') or data.get('description')
+                   or data.get('original_description') or '')
+    return Element(cap_id, 'capability', data.get('name', ''), description, data.get('category', ''),
+                   _strings(data.get('wog_examples')))
+
+
+def _bundled_risk(risk_id: str, data: Mapping[str, Any], elements: Mapping[str, Element]) -> Risk:
+    return Risk(risk_id, data.get('name', ''), data.get('description', ''),
+                capabilities=_strings(data.get('capabilities')), components=_strings(data.get('components')),
+                design=_strings(data.get('design')), controls=_strings(data.get('controls')),
+                sources=_strings(data.get('sources')))
+
+
+def _wog_risk(risk_id: str, data: Mapping[str, Any], elements: Mapping[str, Element]) -> Risk:
+    # A WoG risk names a single element; file it under its kind
+    by_kind: Dict[str, Tuple[str, ...]] = {'capability': (), 'component': (), 'design': ()}
+    element = elements.get(data.get('element_id') or '')
+    if element is not None:
+        by_kind[element.kind] = (element.id,)
+    return Risk(risk_id, data.get('statement', ''), data.get('description', ''),
+                capabilities=by_kind['capability'], components=by_kind['component'], design=by_kind['design'],
+                controls=_strings(data.get('controls')), sources=_strings(data.get('sources')),
+                failure_mode=data.get('failure_mode') or '', types=_strings(data.get('type')),
+                wog_description=data.get('wog_description') or '', wog_examples=_strings(data.get('wog_examples')))
+
+
+def _bundled_control(ctrl_id: str, data: Mapping[str, Any]) -> Control:
+    return Control(ctrl_id, data.get('name', ''), data.get('description', ''),
+                   references=_strings(data.get('references')), risks=_strings(data.get('risks')))
+
+
+def _wog_control(ctrl_id: str, data: Mapping[str, Any]) -> Control:
+    return Control(ctrl_id, data.get('statement', ''), data.get('recommendations') or '',
+                   level=_level(data.get('level')), references=_strings(data.get('references')),
+                   risks=_strings(data.get('risks')))
+
+
+@dataclass(frozen=True)
+class RegisterVariant:
+    """Where a register variant lives and how its schema maps onto the model."""
+    name: str
+    data_dir: str
+    files: Mapping[str, str]  # Role (see REGISTER_ROLES) -> file name
+    capability: Callable[[str, Mapping[str, Any]], Element]
+    risk: Callable[[str, Mapping[str, Any], Mapping[str, Element]], Risk]
+    control: Callable[[str, Mapping[str, Any]], Control]
+
+
+REGISTER_VARIANTS: Dict[str, RegisterVariant] = {
+    'bundled': RegisterVariant(
+        'bundled', os.path.join(_REPO_ROOT, 'data'),
+        {role: f'{role}.yaml' for role in REGISTER_ROLES},
+        _bundled_capability, _bundled_risk, _bundled_control,
+    ),
+    'wog': RegisterVariant(
+        'wog', os.path.join(_REPO_ROOT, 'arc-risk-register'),
+        {'capabilities': 'capabilities-wog.yaml', 'risks': 'risks-wog.yaml', 'controls': 'controls-wog.yaml',
+         'components': 'components.yaml', 'design': 'design.yaml'},
+        _wog_capability, _wog_risk, _wog_control,
+    ),
+}
+
+
+def get_variant(name: Optional[str] = None) -> RegisterVariant:
+    """Return a register variant by name, defaulting to ARC_REGISTER or 'bundled'.
+
+    Raises:
+        ValueError: If the name is not a known variant
+    """
+    name = (name or os.environ.get('ARC_REGISTER') or DEFAULT_VARIANT).strip().lower()
+    try:
+        return REGISTER_VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown register variant '{name}'. "
+                         f"Choose from: {', '.join(REGISTER_VARIANTS)}") from None
+
+
+def read_sources(variant: RegisterVariant, data_dir: str, diagnostics: Diagnostics) -> Optional[Dict[str, Any]]:
+    """Parse a variant's YAML files, reporting the first file that fails.
+
+    Returns:
+        Dictionary of role -> parsed data, or None if any file failed
+    """
+    sources = {}
+    folder = os.path.basename(os.path.normpath(data_dir))
+    for role in REGISTER_ROLES:
+        filename = variant.files[role]
+        try:
+            with open(os.path.join(data_dir, filename), 'r') as f:
+                data = yaml.safe_load(f)
+            if not data:
+                diagnostics.error(f"Failed to load {role} data. Please check {folder}/{filename}")
+                return None
+        except FileNotFoundError:
+            diagnostics.error(f"{role.capitalize()} file not found. Please ensure {folder}/{filename} exists")
+            return None
+        except yaml.YAMLError as e:
+            diagnostics.error(f"Error parsing {filename}: {str(e)}")
+            return None
+        except Exception as e:
+            diagnostics.error(f"Unexpected error loading {role}: {str(e)}")
+            return None
+        sources[role] = data
+    return sources
+
+
+def build_model(variant: RegisterVariant, sources: Mapping[str, Any]) -> RegisterModel:
+    """Compile raw sources and map them onto the typed model.
+
+    Args:
+        variant: Variant the sources were read for
+        sources: Dictionary of role -> parsed YAML, from read_sources()
+
+    Returns:
+        RegisterModel; check its issues for dangling references (which are dropped)
+    """
+    capabilities = {cap_id: variant.capability(cap_id, data or {}) for cap_id, data in sources['capabilities'].items()}
+    components = {comp_id: Element(comp_id, 'component', (data or {}).get('name', ''), (data or {}).get('description', ''))
+                  for comp_id, data in sources['components'].items()}
+    design = {design_id: Element(design_id, 'design', (data or {}).get('name', ''), (data or {}).get('description', ''))
+              for design_id, data in sources['design'].items()}
+    elements = {**components, **design, **capabilities}
+
+    compiled = compile_references(sources['risks'], sources['controls'], elements)
+    return RegisterModel(
+        variant=variant.name,
+        capabilities=capabilities,
+        components=components,
+        design=design,
+        risks={risk_id: variant.risk(risk_id, data, elements) for risk_id, data in compiled.risks.items()},
+        controls={ctrl_id: variant.control(ctrl_id, data) for ctrl_id, data in compiled.controls.items()},
+        issues=compiled.issues,
+        normalized=compiled.normalized,
+    )
+
+
+def load_register_model(variant: Optional[str] = None, data_dir: Optional[str] = None,
+                        diagnostics: Optional[Diagnostics] = None) -> Optional[RegisterModel]:
+    """Parse, compile and map a register variant.
+
+    Args:
+        variant: Variant name (defaults to ARC_REGISTER or 'bundled')
+        data_dir: Directory with the variant's files (defaults to the variant's own)
+        diagnostics: Collector for load errors
+
+    Returns:
+        RegisterModel, or None if a source file could not be loaded
+    """
+    register_variant = get_variant(variant)
+    diagnostics = diagnostics if diagnostics is not None else Diagnostics(stage="register")
+    sources = read_sources(register_variant, data_dir or register_variant.data_dir, diagnostics)
+    if sources is None:
+        return None
+    return build_model(register_variant, sources)
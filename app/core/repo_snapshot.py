@@ -0,0 +1,246 @@
+"""Repository snapshot fetching for LLM-based codebase analysis."""
+
+import heapq
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
+GITHUB_ARCHIVE_BASE = "https://codeload.github.com"
+
+# Default number of concurrent raw file downloads
+DEFAULT_FETCH_WORKERS = 8
+
+# Default file caps per snapshot mode; the archive has no per-file request cost
+API_MAX_FILES = 15
+TARBALL_MAX_FILES = 40
+
+# Prioritize security-relevant files
+PRIORITY_PATHS = [
+    "README", "README.md", "SECURITY", "SECURITY.md", "docs/", "config", "infra", "deploy", "helm", "k8s", "docker", "compose",
+    "api/", "apps/", "services/", "server/", "agents/", "tools/", "prompts/", "memory/", "vector/", "db/"
+]
+# Anything that handles ingress/egress of data or requests is a threat vector
+DATA_IO_KEYWORDS = [
+    "api/", "apis/", "routes", "router", "controller", "handler", "webhook", "callback",
+    "client", "http", "https", "fetch", "axios", "request", "response", "grpc", "rpc",
+    "socket", "websocket", "ws/", "queue", "kafka", "sns", "sqs", "pubsub", "mq", "worker",
+    "ingest", "upload", "download", "import", "export", "data/", "dataset", "csv", "parquet",
+    "sql", "mongo", "db/", "database", "redis", "cache", "vector", "pinecone", "weaviate", "milvus", "chroma", "opensearch", "elastic", "s3", "gcs", "azureblob", "minio",
+    "prompt", "prompts", "chat", "message", "llm", "model", "openai", "anthropic", "vertex", "bedrock", "mcp", "tool"
+]
+PREFERRED_EXTS = (".py", ".ts", ".tsx", ".js", ".go", ".rs", ".java", ".cs", ".rb", ".yaml", ".yml", ".json", ".env", "Dockerfile", ".http", ".sql", ".sh", ".md")
+
+
+def parse_github_repo(repo_url: str) -> Tuple[str, str]:
+    """Extract owner and repository name from a GitHub URL."""
+    pattern = r"github\.com[:/](?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)(?:\.git)?/?"
+    match = re.search(pattern, repo_url)
+    if not match:
+        raise ValueError("Please provide a valid GitHub repository URL")
+    owner = match.group("owner")
+    repo = match.group("repo")
+    return owner, repo
+
+
+def score_path(path: str) -> int:
+    """Score a repository path by how likely it is to describe the application."""
+    score = 0
+    for p in PRIORITY_PATHS:
+        if path.startswith(p):
+            score += 3
+    for kw in DATA_IO_KEYWORDS:
+        if kw in path:
+            score += 3
+    for ext in PREFERRED_EXTS:
+        if path.endswith(ext):
+            score += 2
+    if "/tests" in path or path.startswith("tests/"):
+        score -= 2
+    return score
+
+
+def create_session(pool_size: int = DEFAULT_FETCH_WORKERS) -> requests.Session:
+    """Create a keep-alive HTTP session whose pool fits the fetch workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _fetch_text(session: requests.Session, url: str, max_chars: int, timeout: float) -> Optional[str]:
+    """Download a text file, returning None on any failure."""
+    try:
+        resp = session.get(url, timeout=timeout)
+        resp.raise_for_status()
+        return resp.text[:max_chars]
+    except Exception:
+        return None
+
+
+def fetch_repo_snapshot(repo_url: str, max_files: int = API_MAX_FILES, max_bytes_per_file: int = 3500,
+                        max_total_chars: int = 18000, session: Optional[requests.Session] = None,
+                        max_workers: int = DEFAULT_FETCH_WORKERS, api_base: str = GITHUB_API_BASE,
+                        raw_base: str = GITHUB_RAW_BASE, timeout: float = 10) -> Tuple[List[Dict[str, str]], str]:
+    """Fetch a lightweight snapshot of a public GitHub repo for LLM analysis.
+
+    Candidate files are ranked with score_path and downloaded concurrently over
+    a pooled session, in windows of up to max_workers files. Results are
+    accepted in rank order, so the selected files are the same as a sequential
+    fetch would choose for the same responses.
+
+    Args:
+        repo_url: GitHub repository URL
+        max_files: Maximum number of files to include
+        max_bytes_per_file: Characters kept from each file
+        max_total_chars: Stop adding files once this many characters are collected
+        session: HTTP session to reuse (a pooled session is created if omitted)
+        max_workers: Maximum concurrent file downloads
+        api_base: Base URL of the GitHub REST API (overridable for testing)
+        raw_base: Base URL for raw file downloads (overridable for testing)
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Tuple of (selected files as {"path", "content"} dicts, default branch)
+    """
+    owner, repo = parse_github_repo(repo_url)
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_workers)
+
+    try:
+        meta_resp = session.get(f"{api_base}/repos/{owner}/{repo}", timeout=timeout)
+        meta_resp.raise_for_status()
+        default_branch = meta_resp.json().get("default_branch", "main")
+
+        tree_resp = session.get(
+            f"{api_base}/repos/{owner}/{repo}/git/trees/{default_branch}?recursive=1",
+            timeout=timeout,
+        )
+        tree_resp.raise_for_status()
+        tree = tree_resp.json().get("tree", [])
+
+        blobs = [entry for entry in tree if entry.get("type") == "blob"]
+        blobs.sort(key=lambda x: score_path(x.get("path", "")), reverse=True)
+
+        # Skip very large files up front so every fetched window is usable
+        candidates: List[Dict[str, Any]] = [
+            blob for blob in blobs
+            if not (blob.get("size") and blob.get("size") > max_bytes_per_file * 2)
+        ]
+
+        selected_files: List[Dict[str, str]] = []
+        total_chars = 0
+        position = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while position < len(candidates) and len(selected_files) < max_files and total_chars < max_total_chars:
+                window_size = min(max_workers, max_files - len(selected_files))
+                window = candidates[position:position + window_size]
+                position += len(window)
+
+                urls = [f"{raw_base}/{owner}/{repo}/{default_branch}/{blob.get('path', '')}" for blob in window]
+                contents = executor.map(lambda url: _fetch_text(session, url, max_bytes_per_file, timeout), urls)
+
+                for blob, content in zip(window, contents):
+                    if len(selected_files) >= max_files or total_chars >= max_total_chars:
+                        break
+                    if content is None:
+                        continue
+                    selected_files.append({"path": blob.get("path", ""), "content": content})
+                    total_chars += len(content)
+    finally:
+        if owns_session:
+            session.close()
+
+    if not selected_files:
+        raise RuntimeError("Could not fetch any files from the repository. Ensure it is public and reachable.")
+
+    return selected_files, default_branch
+
+
+def fetch_repo_snapshot_tarball(repo_url: str, max_files: int = TARBALL_MAX_FILES, max_bytes_per_file: int = 3500,
+                                max_total_chars: int = 18000, session: Optional[requests.Session] = None,
+                                api_base: str = GITHUB_API_BASE, archive_base: str = GITHUB_ARCHIVE_BASE,
+                                timeout: float = 30) -> Tuple[List[Dict[str, str]], str]:
+    """Fetch a repository snapshot from a single streamed tarball download.
+
+    The default-branch archive is read as a stream and never written to disk.
+    Entries are scored with score_path as they go past, and only files that
+    rank among the current top max_files are read (up to max_bytes_per_file
+    each), so memory stays bounded regardless of repository size.
+
+    Args:
+        repo_url: GitHub repository URL
+        max_files: Maximum number of files to include
+        max_bytes_per_file: Bytes kept from each file
+        max_total_chars: Stop adding files once this many characters are collected
+        session: HTTP session to reuse (a new session is created if omitted)
+        api_base: Base URL of the GitHub REST API (overridable for testing)
+        archive_base: Base URL serving branch tarballs (overridable for testing)
+        timeout: Timeout in seconds for connecting and between received bytes
+
+    Returns:
+        Tuple of (selected files as {"path", "content"} dicts, default branch)
+    """
+    owner, repo = parse_github_repo(repo_url)
+    owns_session = session is None
+    if owns_session:
+        session = create_session(1)
+
+    # Min-heap of (score, -position, path, content): the root is the weakest candidate
+    top: List[Tuple[int, int, str, str]] = []
+
+    try:
+        meta_resp = session.get(f"{api_base}/repos/{owner}/{repo}", timeout=timeout)
+        meta_resp.raise_for_status()
+        default_branch = meta_resp.json().get("default_branch", "main")
+
+        with session.get(f"{archive_base}/{owner}/{repo}/tar.gz/refs/heads/{default_branch}",
+                         stream=True, timeout=timeout) as archive_resp:
+            archive_resp.raise_for_status()
+            archive_resp.raw.decode_content = True
+
+            with tarfile.open(fileobj=archive_resp.raw, mode="r|*") as archive:
+                for position, member in enumerate(archive):
+                    if not member.isfile() or member.size > max_bytes_per_file * 2:
+                        continue
+                    # Drop the "<owner>-<repo>-<sha>/" prefix GitHub adds to every entry
+                    path = member.name.split("/", 1)[1] if "/" in member.name else member.name
+                    rank = (score_path(path), -position)
+                    if len(top) >= max_files and rank <= top[0][:2]:
+                        continue
+
+                    handle = archive.extractfile(member)
+                    if handle is None:
+                        continue
+                    raw = handle.read(max_bytes_per_file)
+                    if b"\x00" in raw:
+                        continue  # binary file
+                    entry = (rank[0], rank[1], path, raw.decode("utf-8", errors="replace"))
+                    if len(top) < max_files:
+                        heapq.heappush(top, entry)
+                    else:
+                        heapq.heapreplace(top, entry)
+    finally:
+        if owns_session:
+            session.close()
+
+    selected_files: List[Dict[str, str]] = []
+    total_chars = 0
+    for _, _, path, content in sorted(top, reverse=True):
+        if total_chars >= max_total_chars:
+            break
+        selected_files.append({"path": path, "content": content})
+        total_chars += len(content)
+
+    if not selected_files:
+        raise RuntimeError("Could not fetch any files from the repository. Ensure it is public and reachable.")
+
+    return selected_files, default_branch
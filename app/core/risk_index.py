@@ -0,0 +1,98 @@
+"""Reverse indexes over the risk register for fast applicability queries."""
+
+from typing import Dict, Any, Iterable, List, Set, FrozenSet, Mapping
+
+
+class RiskIndex:
+    """Precomputed capability/element/control -> risk ID lookups.
+
+    Built once per register version so that selecting applicable risks is a
+    set union over the selection instead of a scan over every risk.
+    """
+
+    def __init__(self, risks: Mapping[str, Any]):
+        """Build the indexes from the risks dictionary.
+
+        Args:
+            risks: Dictionary of risk data keyed by risk ID
+        """
+        by_capability: Dict[str, Set[str]] = {}
+        by_element: Dict[str, Set[str]] = {}
+        by_control: Dict[str, Set[str]] = {}
+        component_design = set()
+
+        # Register order, used to return risks in a stable, familiar order
+        self.order: Dict[str, int] = {}
+
+        for position, (risk_id, risk_data) in enumerate(risks.items()):
+            self.order[risk_id] = position
+            risk_capabilities = risk_data.get('capabilities') or ()
+            element_ids = tuple(risk_data.get('components') or ()) + tuple(risk_data.get('design') or ())
+
+            for cap_id in risk_capabilities:
+                by_capability.setdefault(cap_id, set()).add(risk_id)
+            for element_id in element_ids:
+                by_element.setdefault(element_id, set()).add(risk_id)
+            for ctrl_id in risk_data.get('controls') or ():
+                by_control.setdefault(ctrl_id, set()).add(risk_id)
+
+            # Component and design risks apply to every application
+            if element_ids and not risk_capabilities:
+                component_design.add(risk_id)
+
+        self.by_capability: Dict[str, FrozenSet[str]] = {k: frozenset(v) for k, v in by_capability.items()}
+        self.by_element: Dict[str, FrozenSet[str]] = {k: frozenset(v) for k, v in by_element.items()}
+        self.by_control: Dict[str, FrozenSet[str]] = {k: frozenset(v) for k, v in by_control.items()}
+        self.component_design_risks: FrozenSet[str] = frozenset(component_design)
+
+    def risks_for_capabilities(self, capability_ids: Iterable[str]) -> Set[str]:
+        """Return the union of risks mapped to any of the given capabilities."""
+        result: Set[str] = set()
+        for cap_id in capability_ids:
+            result |= self.by_capability.get(cap_id, frozenset())
+        return result
+
+    def risks_for_elements(self, element_ids: Iterable[str]) -> Set[str]:
+        """Return the union of risks mapped to any of the given component/design IDs."""
+        result: Set[str] = set()
+        for element_id in element_ids:
+            result |= self.by_element.get(element_id, frozenset())
+        return result
+
+    def risks_for_controls(self, control_ids: Iterable[str]) -> Set[str]:
+        """Return the union of risks mitigated by any of the given controls."""
+        result: Set[str] = set()
+        for ctrl_id in control_ids:
+            result |= self.by_control.get(ctrl_id, frozenset())
+        return result
+
+    def applicable_risk_set(self, selected_capabilities: Iterable[str]) -> Set[str]:
+        """Return all risks applicable to a capability selection.
+
+        Args:
+            selected_capabilities: Selected capability IDs
+
+        Returns:
+            Set of risk IDs: every component/design risk plus the capability
+            risks of the selected capabilities
+        """
+        return set(self.component_design_risks) | self.risks_for_capabilities(selected_capabilities)
+
+    def applicable_risks(self, selected_capabilities: Iterable[str]) -> List[str]:
+        """Return applicable risks ordered as the assessment pages expect.
+
+        Component/design risks come first, followed by capability-specific
+        risks, each group in register order.
+
+        Args:
+            selected_capabilities: Selected capability IDs
+
+        Returns:
+            Ordered list of applicable risk IDs
+        """
+        capability_risks = self.risks_for_capabilities(selected_capabilities) - self.component_design_risks
+        return self.sort(self.component_design_risks) + self.sort(capability_risks)
+
+    def sort(self, risk_ids: Iterable[str]) -> List[str]:
+        """Sort risk IDs into register order."""
+        return sorted(risk_ids, key=lambda risk_id: self.order.get(risk_id, len(self.order)))
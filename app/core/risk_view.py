@@ -0,0 +1,88 @@
+"""View model of the risk assessment page, shared by its independently rerun parts."""
+
+from typing import Dict, Any, List, Mapping, NamedTuple, Sequence, Tuple
+
+from core.register import Register
+from core.scoring import ScoreMatrix
+from models.schemas import RiskAssessment
+
+
+class RiskCard(NamedTuple):
+    """Static content of one risk card."""
+    risk_id: str
+    name: str
+    description: str
+    label: str  # Capability "category - name", or "Component/Design"
+
+
+class RiskPageModel:
+    """Risk cards and a live score matrix for one set of applicable risks.
+
+    Built once per register version, applicable risk list and risk assessment
+    dictionary; each score edit then updates a single cell of the score
+    matrix instead of rebuilding anything.
+
+    Attributes:
+        capability_cards: Cards of capability-specific risks, in applicable order
+        component_design_cards: Cards of component and design risks, in applicable order
+        scores: One-row ScoreMatrix of the current likelihood and impact scores
+    """
+
+    def __init__(self, register: Register, applicable_risks: Sequence[str],
+                 risk_assessments: Mapping[str, RiskAssessment]):
+        self.version = register.version
+        self.applicable_risks: Tuple[str, ...] = tuple(applicable_risks)
+        self.risk_assessments = risk_assessments
+        self.scores: ScoreMatrix = register.scoring.matrix([risk_assessments])
+
+        component_design = register.index.component_design_risks
+        capability_cards: List[RiskCard] = []
+        component_design_cards: List[RiskCard] = []
+        for risk_id in self.applicable_risks:
+            risk_data = register.risks.get(risk_id)
+            if risk_data is None:
+                continue
+            if risk_id in component_design:
+                component_design_cards.append(RiskCard(risk_id, risk_data['name'], risk_data['description'],
+                                                       "Component/Design"))
+            else:
+                capability_cards.append(RiskCard(risk_id, risk_data['name'], risk_data['description'],
+                                                 _capability_label(risk_data, register.capabilities)))
+        self.capability_cards: Tuple[RiskCard, ...] = tuple(capability_cards)
+        self.component_design_cards: Tuple[RiskCard, ...] = tuple(component_design_cards)
+
+    def matches(self, register: Register, applicable_risks: Sequence[str],
+                risk_assessments: Mapping[str, RiskAssessment]) -> bool:
+        """Whether this model was built for the given register, risks and assessments."""
+        return (self.version == register.version and self.risk_assessments is risk_assessments
+                and self.applicable_risks == tuple(applicable_risks))
+
+
+def _capability_label(risk_data: Mapping[str, Any], capabilities: Mapping[str, Any]) -> str:
+    """Return "category - name" of the risk's first known capability."""
+    for cap_id in risk_data.get('capabilities', []):
+        cap_data = capabilities.get(cap_id)
+        if cap_data is not None:
+            return f"{cap_data['category']} - {cap_data['name']}"
+    return "Unknown"
+
+
+def risk_page_model(cache: Dict[str, Any], register: Register, applicable_risks: Sequence[str],
+                    risk_assessments: Mapping[str, RiskAssessment], key: str = 'risk_page_model') -> RiskPageModel:
+    """Return the memoized view model from cache, rebuilding it if its inputs changed.
+
+    Args:
+        cache: Mapping to keep the model in (e.g. the Streamlit session state)
+        register: Loaded register
+        applicable_risks: Applicable risk IDs, in display order
+        risk_assessments: Risk assessments keyed by risk ID (replaced, not mutated, when re-analyzed)
+        key: Cache key
+
+    Returns:
+        RiskPageModel
+    """
+    model = cache.get(key)
+    if model is None or not model.matches(register, applicable_risks, risk_assessments):
+        model = RiskPageModel(register, applicable_risks, risk_assessments)
+        cache[key] = model
+    return model
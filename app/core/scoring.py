@@ -0,0 +1,215 @@
+"""Array-backed likelihood/impact scoring and residual risk.
+
+Scores are held in NumPy matrices with one row per assessment and one column
+per register risk (register order is the dense index), and control
+implementation statuses with one column per risk-control pair. Threshold
+masks, the likelihood x impact heatmap and residual scores are then
+whole-array operations, for a single assessment or a portfolio of them.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from models.schemas import Assessment, ImplementationStatus, RiskAssessment
+
+SCORE_LEVELS = 5
+
+# Status code stored in ScoreMatrix.status for each ImplementationStatus
+STATUS_CODES: Dict[ImplementationStatus, int] = {status: code for code, status in enumerate(ImplementationStatus)}
+
+# Share of a risk's score a control removes, by status code, and whether the
+# control counts towards the risk's average (not applicable controls do not)
+STATUS_EFFECTIVENESS = np.array([{ImplementationStatus.PARTIAL: 0.5,
+                                  ImplementationStatus.IMPLEMENTED: 1.0}.get(status, 0.0)
+                                 for status in ImplementationStatus])
+STATUS_WEIGHT = np.array([0.0 if status is ImplementationStatus.NOT_APPLICABLE else 1.0
+                          for status in ImplementationStatus])
+
+
+class ScoreMatrix:
+    """Scores and control statuses of one or more assessments.
+
+    Attributes:
+        index: Dense risk and risk-control indexes of the register
+        likelihood, impact: (assessments x risks) uint8 scores, 0 where a risk was not assessed
+        status: (assessments x risk-control pairs) uint8 codes (see STATUS_CODES)
+    """
+
+    def __init__(self, index: "ScoringIndex", likelihood: np.ndarray, impact: np.ndarray, status: np.ndarray):
+        self.index = index
+        self.likelihood = likelihood
+        self.impact = impact
+        self.status = status
+
+    def __len__(self) -> int:
+        return self.likelihood.shape[0]
+
+    def set_score(self, risk_id: str, field: str, score: int, row: int = 0) -> None:
+        """Update one likelihood or impact score in place.
+
+        Args:
+            risk_id: Risk whose score changed
+            field: 'likelihood' or 'impact'
+            score: New score (1-5)
+            row: Assessment row
+        """
+        position = self.index.position.get(risk_id)
+        if position is not None:
+            getattr(self, field)[row, position] = score
+
+    @property
+    def assessed(self) -> np.ndarray:
+        """Boolean (assessments x risks) mask of scored risks."""
+        return self.likelihood > 0
+
+    def threshold_mask(self, likelihood_threshold: int, impact_threshold: int) -> np.ndarray:
+        """Boolean (assessments x risks) mask of risks meeting both thresholds."""
+        return (self.likelihood >= likelihood_threshold) & (self.impact >= impact_threshold)
+
+    def high_priority(self, likelihood_threshold: int, impact_threshold: int,
+                      risk_ids: Optional[Sequence[str]] = None, row: int = 0) -> List[str]:
+        """Return the risks of one assessment that meet both thresholds.
+
+        Args:
+            likelihood_threshold: Minimum likelihood score
+            impact_threshold: Minimum impact score
+            risk_ids: Risks to consider, in the order to return them (all risks in register order by default)
+            row: Assessment row
+
+        Returns:
+            Risk IDs meeting both thresholds
+        """
+        mask = self.threshold_mask(likelihood_threshold, impact_threshold)[row]
+        if risk_ids is None:
+            return [self.index.risk_ids[position] for position in np.flatnonzero(mask)]
+        positions = self.index.positions(risk_ids)
+        known = positions >= 0
+        selected = np.zeros(len(positions), dtype=bool)
+        selected[known] = mask[positions[known]]
+        return [risk_ids[i] for i in np.flatnonzero(selected)]
+
+    def heatmap(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Count scored risks in each likelihood x impact cell, summed over assessments.
+
+        Args:
+            mask: Optional boolean (assessments x risks) mask of risks to count
+
+        Returns:
+            (5 x 5) int array; row i is likelihood i + 1, column j is impact j + 1
+        """
+        selected = self.assessed if mask is None else self.assessed & mask
+        cells = (self.likelihood[selected].astype(np.intp) - 1) * SCORE_LEVELS + self.impact[selected] - 1
+        return np.bincount(cells, minlength=SCORE_LEVELS * SCORE_LEVELS).reshape(SCORE_LEVELS, SCORE_LEVELS)
+
+    def inherent(self) -> np.ndarray:
+        """(assessments x risks) likelihood x impact, 0 for unscored risks."""
+        return self.likelihood.astype(np.int16) * self.impact
+
+    def mitigation(self) -> np.ndarray:
+        """(assessments x risks) average effectiveness of each risk's controls, from 0 to 1.
+
+        Risks without applicable controls have no mitigation.
+        """
+        rows, risks = self.likelihood.shape
+        if not self.status.size:
+            return np.zeros((rows, risks))
+        cells = (np.arange(rows, dtype=np.intp)[:, None] * risks + self.index.edge_risk).ravel()
+        effect = np.bincount(cells, weights=STATUS_EFFECTIVENESS[self.status].ravel(), minlength=rows * risks)
+        weight = np.bincount(cells, weights=STATUS_WEIGHT[self.status].ravel(), minlength=rows * risks)
+        return np.divide(effect, weight, out=np.zeros_like(effect), where=weight > 0).reshape(rows, risks)
+
+    def residual(self) -> np.ndarray:
+        """(assessments x risks) inherent score reduced by the share its controls mitigate."""
+        return self.inherent() * (1.0 - self.mitigation())
+
+    def top_residual(self, limit: int = 5) -> List[Tuple[str, float, int]]:
+        """Return the risks with the highest average residual score over the assessments that scored them.
+
+        Returns:
+            Up to limit (risk ID, average residual score, number of assessments) tuples, highest first
+        """
+        counts = self.assessed.sum(axis=0)
+        totals = self.residual().sum(axis=0)
+        averages = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+        ranked = np.argsort(-averages, kind='stable')[:limit]
+        return [(self.index.risk_ids[position], float(averages[position]), int(counts[position]))
+                for position in ranked if counts[position]]
+
+
+class ScoringIndex:
+    """Dense indexes of the register's risks and risk-control pairs, built once per register version."""
+
+    def __init__(self, risks: Mapping[str, Mapping]):
+        """Build the indexes.
+
+        Args:
+            risks: Dictionary of compiled risk data keyed by risk ID, in register order
+        """
+        self.risk_ids: Tuple[str, ...] = tuple(risks)
+        self.position: Dict[str, int] = {risk_id: position for position, risk_id in enumerate(self.risk_ids)}
+
+        edges: List[int] = []
+        self.edge_position: Dict[Tuple[str, str], int] = {}
+        for position, (risk_id, risk_data) in enumerate(risks.items()):
+            for ctrl_id in risk_data.get('controls') or ():
+                self.edge_position[(risk_id, ctrl_id)] = len(edges)
+                edges.append(position)
+        self.edge_risk = np.array(edges, dtype=np.intp)  # Risk column of each risk-control pair
+
+    def positions(self, risk_ids: Iterable[str]) -> np.ndarray:
+        """Return the columns of the given risks (-1 for unknown IDs)."""
+        return np.fromiter((self.position.get(risk_id, -1) for risk_id in risk_ids), dtype=np.intp)
+
+    def mask(self, risk_ids: Iterable[str]) -> np.ndarray:
+        """Return a boolean mask over the risk columns, True for the given risks."""
+        mask = np.zeros(len(self.risk_ids), dtype=bool)
+        positions = self.positions(risk_ids)
+        mask[positions[positions >= 0]] = True
+        return mask
+
+    def matrix(self, risk_assessments: Sequence[Mapping[str, RiskAssessment]],
+               statuses: Sequence[Union[Mapping[str, Mapping[str, ImplementationStatus]], np.ndarray]] = ()
+               ) -> ScoreMatrix:
+        """Build a score matrix, one row per assessment.
+
+        Args:
+            risk_assessments: Risk assessments keyed by risk ID, per assessment
+            statuses: Per assessment, either control statuses keyed by risk ID then
+                control ID (controls without a status are not implemented) or a
+                row of status codes per risk-control pair, e.g. from
+                ControlStatusTable.status_codes()
+
+        Returns:
+            ScoreMatrix
+        """
+        rows = len(risk_assessments)
+        likelihood = np.zeros((rows, len(self.risk_ids)), dtype=np.uint8)
+        impact = np.zeros_like(likelihood)
+        status = np.full((rows, len(self.edge_risk)), STATUS_CODES[ImplementationStatus.NOT_IMPLEMENTED],
+                         dtype=np.uint8)
+
+        for row, assessments in enumerate(risk_assessments):
+            scored = [(self.position[risk_id], assessment) for risk_id, assessment in assessments.items()
+                      if risk_id in self.position]
+            if scored:
+                columns = np.fromiter((column for column, _ in scored), dtype=np.intp, count=len(scored))
+                likelihood[row, columns] = [assessment.likelihood.score for _, assessment in scored]
+                impact[row, columns] = [assessment.impact.score for _, assessment in scored]
+
+        for row, risk_statuses in enumerate(statuses):
+            if isinstance(risk_statuses, np.ndarray):
+                status[row] = risk_statuses
+                continue
+            for risk_id, control_statuses in risk_statuses.items():
+                for ctrl_id, control_status in control_statuses.items():
+                    edge = self.edge_position.get((risk_id, ctrl_id))
+                    if edge is not None:
+                        status[row, edge] = STATUS_CODES[ImplementationStatus(control_status)]
+
+        return ScoreMatrix(self, likelihood, impact, status)
+
+    def portfolio(self, assessments: Sequence[Assessment]) -> ScoreMatrix:
+        """Build a score matrix over saved assessments, one row each."""
+        return self.matrix([assessment.risk_assessments for assessment in assessments],
+                           [assessment.resolved_control_statuses() for assessment in assessments])
@@ -0,0 +1,213 @@
+"""Persistent SQLite store for saved assessments."""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from models.schemas import Assessment
+
+# zlib level used for stored payloads (fast, and JSON compresses well)
+COMPRESSION_LEVEL = 6
+
+
+def _default_name(assessment: Assessment) -> str:
+    """Derive a display name from the application description."""
+    description = str(assessment.application_info.get('description') or '').strip()
+    first_line = description.splitlines()[0] if description else ''
+    return (first_line[:60] or 'Untitled assessment').strip()
+
+
+def serialize_assessment(assessment: Assessment) -> bytes:
+    """Serialize an assessment to compressed JSON."""
+    payload = assessment.model_dump_json(exclude_none=True)
+    return zlib.compress(payload.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def deserialize_assessment(blob: bytes) -> Assessment:
+    """Rebuild an assessment from serialize_assessment() output."""
+    return Assessment.model_validate_json(zlib.decompress(blob))
+
+
+class AssessmentStore:
+    """SQLite-backed (WAL mode) store of saved assessments.
+
+    Each row holds the compressed Assessment plus a few summary columns, so
+    listing saved assessments never decompresses payloads. Lookups by
+    application name and by date are served from indexes.
+
+    Every row belongs to an owner key, and every read, write and delete is
+    scoped to one owner. Passing owner=None reaches all owners' rows; that is
+    meant for administrative tools such as the bulk export CLI, never for the UI.
+    """
+
+    def __init__(self, path: str):
+        """Create the store, initialising the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS assessments ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " register_version TEXT NOT NULL DEFAULT '',"
+                " risk_count INTEGER NOT NULL DEFAULT 0,"
+                " high_priority_count INTEGER NOT NULL DEFAULT 0,"
+                " size INTEGER NOT NULL,"
+                " payload BLOB NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(assessments)")}
+            if 'owner' not in columns:
+                # Rows saved before ownership was recorded belong to the shared single-user owner ('')
+                conn.execute("ALTER TABLE assessments ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assessments_name ON assessments (name, updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assessments_updated ON assessments (updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assessments_owner_name ON assessments (owner, name, updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assessments_owner_updated ON assessments (owner, updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _owner_clause(owner: Optional[str], clauses: List[str], params: List[Any]) -> None:
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+
+    def save(self, assessment: Assessment, owner: str, name: Optional[str] = None,
+             assessment_id: Optional[int] = None, register_version: str = "") -> int:
+        """Save an assessment, updating it in place when assessment_id is given.
+
+        Args:
+            assessment: Assessment to save
+            owner: Owner key of the assessment (an assessment_id of another owner is
+                not overwritten; a new row is saved instead)
+            name: Display name (defaults to the first line of the application description)
+            assessment_id: ID of a previously saved assessment to overwrite
+            register_version: Content hash of the register the assessment was made against
+
+        Returns:
+            ID of the saved assessment
+        """
+        name = (name or '').strip() or _default_name(assessment)
+        blob = serialize_assessment(assessment)
+        risk_count = len(assessment.risk_assessments)
+        high_priority_count = len(assessment.high_priority_risks or [])
+        now = time.time()
+
+        with self._connect() as conn:
+            if assessment_id is not None:
+                updated = conn.execute(
+                    "UPDATE assessments SET name = ?, updated_at = ?, register_version = ?, risk_count = ?,"
+                    " high_priority_count = ?, size = ?, payload = ? WHERE id = ? AND owner = ?",
+                    (name, now, register_version, risk_count, high_priority_count, len(blob), blob, assessment_id,
+                     owner),
+                )
+                if updated.rowcount:
+                    return assessment_id
+
+            cursor = conn.execute(
+                "INSERT INTO assessments (owner, name, created_at, updated_at, register_version, risk_count,"
+                " high_priority_count, size, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (owner, name, now, now, register_version, risk_count, high_priority_count, len(blob), blob),
+            )
+            return cursor.lastrowid
+
+    def load(self, assessment_id: int, owner: Optional[str]) -> Optional[Assessment]:
+        """Return a saved assessment, or None if it does not exist or belongs to another owner."""
+        payload = self.load_payload(assessment_id, owner)
+        return deserialize_assessment(payload) if payload is not None else None
+
+    def load_payload(self, assessment_id: int, owner: Optional[str]) -> Optional[bytes]:
+        """Return the compressed payload of a saved assessment without decoding it."""
+        clauses, params = ["id = ?"], [assessment_id]
+        self._owner_clause(owner, clauses, params)
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT payload FROM assessments WHERE {' AND '.join(clauses)}", params).fetchone()
+        return row[0] if row else None
+
+    def list_assessments(self, owner: Optional[str], name: Optional[str] = None, since: Optional[float] = None,
+                         until: Optional[float] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """List saved assessments, most recently updated first.
+
+        Args:
+            owner: Only return assessments of this owner (None for every owner)
+            name: Only return assessments with exactly this name
+            since: Only return assessments updated at or after this timestamp
+            until: Only return assessments updated before this timestamp
+            limit: Maximum number of rows
+
+        Returns:
+            Summary dictionaries (id, name, created_at, updated_at, register_version,
+            risk_count, high_priority_count, size) without the payload
+        """
+        clauses, params = [], []
+        self._owner_clause(owner, clauses, params)
+        if name is not None:
+            clauses.append("name = ?")
+            params.append(name)
+        if since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("updated_at < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        columns = ('id', 'name', 'created_at', 'updated_at', 'register_version',
+                   'risk_count', 'high_priority_count', 'size')
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM assessments{where} ORDER BY updated_at DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def revision(self, owner: Optional[str]) -> Tuple[int, float]:
+        """Return a cheap signature of an owner's saved assessments that changes on every save and delete.
+
+        Returns:
+            Tuple of (number of assessments, latest update time)
+        """
+        clauses, params = [], []
+        self._owner_clause(owner, clauses, params)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            count, latest = conn.execute(f"SELECT COUNT(*), MAX(updated_at) FROM assessments{where}", params).fetchone()
+        return count, latest or 0.0
+
+    def delete(self, assessment_id: int, owner: Optional[str]) -> bool:
+        """Delete a saved assessment. Returns True if it existed (and belonged to the owner)."""
+        clauses, params = ["id = ?"], [assessment_id]
+        self._owner_clause(owner, clauses, params)
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM assessments WHERE {' AND '.join(clauses)}", params).rowcount > 0
+
+
+_store: Optional[AssessmentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_assessment_store() -> AssessmentStore:
+    """Return the process-wide assessment store.
+
+    The database lives in ARC_ASSESSMENT_STORE_DIR (default ~/.local/share/arcvisor).
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            store_dir = (os.environ.get("ARC_ASSESSMENT_STORE_DIR")
+                         or os.path.join(os.path.expanduser("~"), ".local", "share", "arcvisor"))
+            _store = AssessmentStore(os.path.join(store_dir, "assessments.sqlite3"))
+        return _store
@@ -1,7 +1,28 @@
 """Pydantic models for structured LLM outputs and session state management."""
 
+from enum import Enum
 from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional, Literal
+
+# Implementation text recorded for controls the user has not described
+DEFAULT_CONTROL_IMPLEMENTATION = "I did not implement this control. I accept all residual risk."
+
+
+class ImplementationStatus(str, Enum):
+    """How far a control has been implemented for a risk."""
+    NOT_IMPLEMENTED = "not_implemented"
+    PARTIAL = "partial"
+    IMPLEMENTED = "implemented"
+    NOT_APPLICABLE = "not_applicable"
+
+
+# Display label of each implementation status (UI and human-readable exports)
+IMPLEMENTATION_STATUS_LABELS = {
+    ImplementationStatus.NOT_IMPLEMENTED: "Not implemented",
+    ImplementationStatus.PARTIAL: "Partially implemented",
+    ImplementationStatus.IMPLEMENTED: "Implemented",
+    ImplementationStatus.NOT_APPLICABLE: "Not applicable",
+}
 
 
 class ScoreAssessment(BaseModel):
@@ -63,6 +84,73 @@ class RiskAnalysis(BaseModel):
     reasoning: str = Field(description="Overall risk assessment approach and key considerations")
 
 
+class Diagnostic(BaseModel):
+    """Model for a message raised by a core library call instead of a UI side effect."""
+    level: Literal["info", "warning", "error"] = Field(description="Severity of the message")
+    message: str = Field(description="Human-readable description of the issue")
+    stage: str = Field(default="", description="Pipeline stage that raised the message")
+
+
+class Assessment(BaseModel):
+    """Model for a complete assessment, independent of where it is stored."""
+    application_info: Dict[str, Any] = Field(default_factory=dict, description="Application details entered by the user")
+    application_description: Optional[str] = Field(default=None, description="Generated application description")
+    capability_analysis: Optional[CapabilityAnalysis] = Field(default=None, description="LLM capability analysis")
+    selected_capabilities: List[str] = Field(default_factory=list, description="Capability IDs selected by the user")
+    applicable_risks: Optional[List[str]] = Field(default=None, description="Risk IDs applicable to the application")
+    risk_assessments: Dict[str, RiskAssessment] = Field(default_factory=dict, description="Risk assessments keyed by risk ID")
+    analysis_reasoning: Optional[str] = Field(default=None, description="Overall risk analysis reasoning")
+    likelihood_threshold: int = Field(default=4, ge=1, le=5, description="Minimum likelihood score for controls")
+    impact_threshold: int = Field(default=4, ge=1, le=5, description="Minimum impact score for controls")
+    high_priority_risks: Optional[List[str]] = Field(default=None, description="Risk IDs meeting both thresholds")
+    control_implementations: Dict[str, Dict[str, str]] = Field(
+        default_factory=dict,
+        description="Implementation text keyed by risk ID, then control ID"
+    )
+    control_statuses: Dict[str, Dict[str, ImplementationStatus]] = Field(
+        default_factory=dict,
+        description="Implementation status keyed by risk ID, then control ID"
+    )
+
+    def control_implementation(self, risk_id: str, control_id: str) -> str:
+        """Return the implementation text for a control, or the default text."""
+        return self.control_implementations.get(risk_id, {}).get(control_id, DEFAULT_CONTROL_IMPLEMENTATION)
+
+    def control_status(self, risk_id: str, control_id: str) -> ImplementationStatus:
+        """Return the implementation status of a control.
+
+        Controls without a recorded status are not implemented if their text is
+        the default, and partially implemented if the user described something.
+        """
+        status = self.control_statuses.get(risk_id, {}).get(control_id)
+        if status is not None:
+            return status
+        if self.control_implementation(risk_id, control_id) != DEFAULT_CONTROL_IMPLEMENTATION:
+            return ImplementationStatus.PARTIAL
+        return ImplementationStatus.NOT_IMPLEMENTED
+
+    def control_notes(self, risk_id: str, control_id: str) -> str:
+        """Return the implementation text of a control for exports.
+
+        The default text states that the control was not implemented, so it is
+        only returned for controls with that status.
+        """
+        text = self.control_implementation(risk_id, control_id)
+        if (text == DEFAULT_CONTROL_IMPLEMENTATION
+                and self.control_status(risk_id, control_id) is not ImplementationStatus.NOT_IMPLEMENTED):
+            return ""
+        return text
+
+    def resolved_control_statuses(self) -> Dict[str, Dict[str, ImplementationStatus]]:
+        """Return the status of every control with a recorded status or implementation text."""
+        statuses: Dict[str, Dict[str, ImplementationStatus]] = {}
+        for source in (self.control_implementations, self.control_statuses):
+            for risk_id, controls in source.items():
+                for control_id in controls:
+                    statuses.setdefault(risk_id, {})[control_id] = self.control_status(risk_id, control_id)
+        return statuses
+
+
 class SessionKeys:
     """Constants for session state keys to prevent typos and ensure consistency."""
     PAGE = "page"
@@ -71,11 +159,18 @@ class SessionKeys:
     APPLICATION_DESCRIPTION = "application_description"
     CAPABILITY_ANALYSIS = "capability_analysis"
     SELECTED_CAPABILITIES = "selected_capabilities"
+    ASSESSED_CAPABILITIES = "assessed_capabilities"
     APPLICABLE_RISKS = "applicable_risks"
     RISK_ASSESSMENTS = "risk_assessments"
     LIKELIHOOD_THRESHOLD = "likelihood_threshold"
     IMPACT_THRESHOLD = "impact_threshold"
     HIGH_PRIORITY_RISKS = "high_priority_risks"
+    ANALYSIS_REASONING = "analysis_reasoning"
+    ASSESSMENT_ID = "assessment_id"
+    ASSESSMENT_NAME = "assessment_name"
+    CONTROL_STATUS_TABLE = "control_status_table"
+    ACTIVE_JOB = "active_job"
+    JOB_DIAGNOSTICS = "job_diagnostics"
     
     # Form field keys
     FORM_DATA_CLASSIFICATION = "form_data_classification"
@@ -0,0 +1,8 @@
+"""Shared test setup: import app modules the way the app does (``from core...``)."""
+
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
@@ -0,0 +1,103 @@
+"""Tests for core.control_status.ControlStatusTable against the plain Assessment semantics it mirrors."""
+
+import pickle
+
+import pytest
+
+from core.control_status import ControlStatusTable
+from core.scoring import STATUS_CODES, ScoringIndex
+from models.schemas import DEFAULT_CONTROL_IMPLEMENTATION, Assessment, ImplementationStatus
+
+RISKS = {
+    'RISK-1': {'controls': ['CTRL-1', 'CTRL-2']},
+    'RISK-2': {'controls': ['CTRL-3']},
+    'RISK-3': {'controls': ['CTRL-1', 'CTRL-4']},
+}
+INDEX = ScoringIndex(RISKS)
+PAIRS = [(risk_id, ctrl_id) for risk_id, risk_data in RISKS.items() for ctrl_id in risk_data['controls']]
+
+ASSESSMENT = Assessment(
+    control_statuses={'RISK-1': {'CTRL-1': ImplementationStatus.IMPLEMENTED},
+                      'RISK-2': {'CTRL-3': ImplementationStatus.NOT_APPLICABLE},
+                      'RISK-3': {'CTRL-4': ImplementationStatus.NOT_IMPLEMENTED}},
+    control_implementations={'RISK-1': {'CTRL-1': "Done in the gateway", 'CTRL-2': "Partly done"},
+                             'RISK-3': {'CTRL-4': "Planned for next quarter",
+                                        'CTRL-1': DEFAULT_CONTROL_IMPLEMENTATION},
+                             'RISK-9': {'CTRL-9': "Not in the register"}},
+)
+
+
+def test_round_trip_through_assessment_fields():
+    table = ControlStatusTable.from_assessment(INDEX, "v1", ASSESSMENT)
+    texts, statuses = table.to_assessment_fields()
+
+    # Default texts and pairs unknown to the register are not kept
+    assert texts == {'RISK-1': {'CTRL-1': "Done in the gateway", 'CTRL-2': "Partly done"},
+                     'RISK-3': {'CTRL-4': "Planned for next quarter"}}
+    assert statuses == ASSESSMENT.control_statuses
+    assert table.to_assessment_fields(['RISK-2']) == ({}, {'RISK-2': {'CTRL-3': ImplementationStatus.NOT_APPLICABLE}})
+
+    restored = Assessment(control_implementations=texts, control_statuses=statuses)
+    for risk_id, ctrl_id in PAIRS:
+        assert restored.control_status(risk_id, ctrl_id) == ASSESSMENT.control_status(risk_id, ctrl_id)
+        assert restored.control_implementation(risk_id, ctrl_id) == table.text(risk_id, ctrl_id)
+
+
+def test_statuses_match_assessment_semantics():
+    table = ControlStatusTable.from_assessment(INDEX, "v1", ASSESSMENT)
+    codes = table.status_codes()
+    for risk_id, ctrl_id in PAIRS:
+        expected = ASSESSMENT.control_status(risk_id, ctrl_id)
+        assert table.status(risk_id, ctrl_id) == expected
+        assert codes[INDEX.edge_position[(risk_id, ctrl_id)]] == STATUS_CODES[expected]
+
+    # Unset but edited is partially implemented; unset and unedited is not implemented
+    assert table.status('RISK-1', 'CTRL-2') is ImplementationStatus.PARTIAL
+    assert table.status('RISK-3', 'CTRL-1') is ImplementationStatus.NOT_IMPLEMENTED
+
+    # The status row gives the same scores as the assessment's own statuses
+    from_table = INDEX.matrix([{}], [codes]).status
+    from_assessment = INDEX.matrix([{}], [ASSESSMENT.resolved_control_statuses()]).status
+    assert from_table.tolist() == from_assessment.tolist()
+
+
+def test_resetting_text_to_default_clears_the_inferred_status():
+    table = ControlStatusTable(INDEX, "v1")
+    table.set('RISK-2', 'CTRL-3', text="Something")
+    assert table.status('RISK-2', 'CTRL-3') is ImplementationStatus.PARTIAL
+    table.set('RISK-2', 'CTRL-3', text=DEFAULT_CONTROL_IMPLEMENTATION)
+    assert table.status('RISK-2', 'CTRL-3') is ImplementationStatus.NOT_IMPLEMENTED
+    assert list(table.entries()) == []
+
+
+def test_migrate_keeps_pairs_present_in_the_new_register():
+    table = ControlStatusTable.from_assessment(INDEX, "v1", ASSESSMENT)
+    # The new register drops RISK-2 and the RISK-1/CTRL-2 pair, and adds a risk in front (positions shift)
+    new_index = ScoringIndex({
+        'RISK-0': {'controls': ['CTRL-1']},
+        'RISK-1': {'controls': ['CTRL-1']},
+        'RISK-3': {'controls': ['CTRL-4', 'CTRL-1']},
+    })
+    migrated = table.migrate(new_index, "v2")
+
+    assert migrated.version == "v2"
+    assert migrated.to_assessment_fields() == (
+        {'RISK-1': {'CTRL-1': "Done in the gateway"}, 'RISK-3': {'CTRL-4': "Planned for next quarter"}},
+        {'RISK-1': {'CTRL-1': ImplementationStatus.IMPLEMENTED},
+         'RISK-3': {'CTRL-4': ImplementationStatus.NOT_IMPLEMENTED}},
+    )
+    assert migrated.status('RISK-0', 'CTRL-1') is ImplementationStatus.NOT_IMPLEMENTED
+    # The source table is left as it was
+    assert table.status('RISK-1', 'CTRL-2') is ImplementationStatus.PARTIAL
+
+
+def test_migrate_of_a_detached_table_needs_its_source_index():
+    table = pickle.loads(pickle.dumps(ControlStatusTable.from_assessment(INDEX, "v1", ASSESSMENT)))
+    assert table.index is None
+    new_index = ScoringIndex({'RISK-1': {'controls': ['CTRL-1']}})
+    with pytest.raises(ValueError):
+        table.migrate(new_index, "v2")
+
+    migrated = table.migrate(new_index, "v2", source_index=INDEX)
+    assert migrated.status('RISK-1', 'CTRL-1') is ImplementationStatus.IMPLEMENTED
+    assert migrated.text('RISK-1', 'CTRL-1') == "Done in the gateway"
@@ -0,0 +1,76 @@
+"""Tests for core.coverage.ControlCoverage: greedy control sets, pruning, required controls and weighting."""
+
+import pytest
+
+from core.coverage import ControlCoverage
+
+
+def _coverage(risk_controls, levels=None):
+    risks = {risk_id: {'controls': list(controls)} for risk_id, controls in risk_controls.items()}
+    control_ids = dict.fromkeys(ctrl_id for controls in risk_controls.values() for ctrl_id in controls)
+    levels = levels or {}
+    return ControlCoverage(risks, {ctrl_id: {'level': levels.get(ctrl_id, 0)} for ctrl_id in control_ids})
+
+
+# BROAD (enhanced, level 2) covers all three risks; two essential (level 0) controls split them
+LEVELLED = _coverage(
+    {'RISK-1': ['BROAD', 'ESSENTIAL-A'], 'RISK-2': ['BROAD', 'ESSENTIAL-A'], 'RISK-3': ['BROAD', 'ESSENTIAL-B'],
+     'RISK-4': []},
+    levels={'BROAD': 2, 'ESSENTIAL-A': 0, 'ESSENTIAL-B': 0},
+)
+
+
+def test_fewest_controls_by_count():
+    plan = LEVELLED.cover(['RISK-1', 'RISK-2', 'RISK-3'])
+    assert plan.controls == ('BROAD',)
+    assert plan.covers == {'BROAD': ('RISK-1', 'RISK-2', 'RISK-3')}
+    assert plan.cost == 1.0
+    assert plan.covered_mask == plan.target_mask
+    assert plan.uncovered == ()
+
+
+def test_level_weighting_prefers_essential_controls():
+    plan = LEVELLED.cover(['RISK-1', 'RISK-2', 'RISK-3'], weighting='level')
+    assert plan.controls == ('ESSENTIAL-A', 'ESSENTIAL-B')
+    assert plan.cost == 2.0
+    assert plan.covered_mask == plan.target_mask
+
+
+def test_risk_without_controls_is_uncovered():
+    plan = LEVELLED.cover(['RISK-1', 'RISK-4'])
+    assert plan.uncovered == ('RISK-4',)
+    assert LEVELLED.risks_in(plan.covered_mask) == ('RISK-1',)
+    assert LEVELLED.risks_in(plan.target_mask) == ('RISK-1', 'RISK-4')
+    assert LEVELLED.cover(['RISK-4']).controls == ()
+
+
+def test_required_control_covering_everything_adds_no_picks():
+    plan = LEVELLED.cover(['RISK-1', 'RISK-2', 'RISK-3'], weighting='level', required=['BROAD', 'UNKNOWN'])
+    assert plan.controls == ('BROAD',)
+    assert plan.cost == 3.0
+    assert plan.covered_mask == plan.target_mask
+
+
+def test_required_controls_are_kept_and_the_rest_is_covered():
+    plan = LEVELLED.cover(['RISK-1', 'RISK-2', 'RISK-3'], required=['ESSENTIAL-B'])
+    # BROAD alone would do, but the required control is never dropped; ties go to register order
+    assert plan.controls == ('ESSENTIAL-B', 'BROAD')
+    assert plan.covers['ESSENTIAL-B'] == ('RISK-3',)
+    assert plan.covered_mask == plan.target_mask
+
+
+def test_controls_made_redundant_by_later_picks_are_dropped():
+    # Greedy takes WIDE (4 risks) first, then NARROW-A and NARROW-B, which between them cover WIDE's risks
+    coverage = _coverage({
+        'RISK-1': ['WIDE', 'NARROW-A'], 'RISK-2': ['WIDE', 'NARROW-A'], 'RISK-3': ['WIDE', 'NARROW-B'],
+        'RISK-4': ['WIDE', 'NARROW-B'], 'RISK-5': ['NARROW-A'], 'RISK-6': ['NARROW-B'],
+    })
+    plan = coverage.cover(coverage.risk_ids)
+    assert sorted(plan.controls) == ['NARROW-A', 'NARROW-B']
+    assert plan.covered_mask == plan.target_mask
+
+
+def test_plans_are_memoized_and_unknown_weighting_raises():
+    assert LEVELLED.cover(['RISK-2', 'RISK-1']) is LEVELLED.cover(['RISK-1', 'RISK-2'])
+    with pytest.raises(ValueError):
+        LEVELLED.cover(['RISK-1'], weighting='cheapest')
@@ -0,0 +1,71 @@
+"""Tests for the spreadsheet exports of core.formats (CSV and XLSX)."""
+
+import csv
+import io
+
+import pytest
+
+from core.formats import EXPORT_COLUMNS, write_assessment_csv, write_assessment_xlsx
+from core.register import load_register
+from models.schemas import Assessment, ImplementationStatus, RiskAssessment, ScoreAssessment
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+@pytest.fixture(scope="module")
+def register(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('ARC_REGISTER_CACHE_DIR', str(tmp_path_factory.mktemp("register-cache")))
+        yield load_register(variant='bundled')
+
+
+@pytest.fixture(scope="module")
+def assessment(register):
+    risk_id = next(risk_id for risk_id, controls in register.risk_controls.items() if controls)
+    control_id = register.risk_controls[risk_id][0]['id']
+    return Assessment(
+        application_info={'description': "=cmd|' /C calc'!A0\nSecond line", 'owner': "@team\x07"},
+        application_description="+1 rogue\x1b description",
+        risk_assessments={risk_id: RiskAssessment(
+            context="-2+3 context\x00",
+            likelihood=ScoreAssessment(score=4, reasoning="@SUM(A1:A2)"),
+            impact=ScoreAssessment(score=2, reasoning="Plain reasoning"),
+        )},
+        control_implementations={risk_id: {control_id: "=HYPERLINK(\"http://example.com\")"}},
+        control_statuses={risk_id: {control_id: ImplementationStatus.PARTIAL}},
+    )
+
+
+def test_csv_cells_never_start_a_formula(register, assessment):
+    buffer = io.StringIO(newline='')
+    write_assessment_csv(assessment, buffer, register)
+    rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+
+    row = rows[0]
+    assert row['application'] == "'=cmd|' /C calc'!A0"
+    assert row['context'] == "'-2+3 context\x00"
+    assert row['likelihood_reasoning'] == "'@SUM(A1:A2)"
+    assert row['impact_reasoning'] == "Plain reasoning"
+    assert row['implementation_notes'] == "'=HYPERLINK(\"http://example.com\")"
+    assert row['implementation_status'] == "partial"
+    assert row['likelihood'] == "4"
+    for row in rows:
+        assert not any(value.startswith(('=', '+', '-', '@')) for value in row.values())
+
+
+def test_xlsx_escapes_formulas_and_drops_illegal_characters(register, assessment):
+    buffer = io.BytesIO()
+    write_assessment_xlsx(assessment, buffer, register)
+    workbook = openpyxl.load_workbook(io.BytesIO(buffer.getvalue()))
+
+    summary = dict(workbook["Summary"].iter_rows(min_row=2, values_only=True))
+    assert summary['owner'] == "'@team"
+    assert summary['application_description'] == "'+1 rogue description"
+
+    header, *rows = workbook["Risks"].iter_rows(values_only=True)
+    assert header == EXPORT_COLUMNS
+    row = dict(zip(header, rows[0]))
+    assert row['context'] == "'-2+3 context"
+    assert row['implementation_notes'] == "'=HYPERLINK(\"http://example.com\")"
+    assert row['likelihood'] == 4
+    assert all(cell.data_type != 'f' for sheet in workbook for line in sheet.iter_rows() for cell in line)
@@ -0,0 +1,178 @@
+"""Tests for core.jobs.JobRunner: deduplication, cancellation, stale jobs and schema migration."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core.jobs import CANCELLED, FAILED, JOB_STALE_SECONDS, QUEUED, RUNNING, SUCCEEDED, JobRunner
+
+# Schema of the job table before jobs recorded their owner session
+BASELINE_SCHEMA = (
+    "CREATE TABLE jobs ("
+    " id TEXT PRIMARY KEY, kind TEXT NOT NULL, key TEXT NOT NULL, status TEXT NOT NULL,"
+    " owner TEXT NOT NULL, params TEXT NOT NULL, done INTEGER NOT NULL DEFAULT 0,"
+    " total INTEGER NOT NULL DEFAULT 0, message TEXT NOT NULL DEFAULT '', partial TEXT, result TEXT,"
+    " error TEXT NOT NULL DEFAULT '', cancel_requested INTEGER NOT NULL DEFAULT 0,"
+    " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+)
+
+
+def _wait(runner, job_id, owner, condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get(job_id, owner)
+        if condition(job):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach the expected state: {runner.get(job_id, owner)}")
+
+
+def _finished(job):
+    return job is not None and job.finished
+
+
+@pytest.fixture
+def gate():
+    """Event a blocking job waits on; set at teardown so no worker thread is left behind."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def _kinds(gate):
+    def blocking(context, value):
+        context.progress(0, 2, "Started")
+        gate.wait(5)
+        context.progress(1, 2, "Halfway", partial={'value': value})
+        return {'value': value}
+
+    def looping(context):
+        for done in range(500):
+            time.sleep(0.01)
+            context.progress(done, 500)
+        return {}
+
+    def failing(context):
+        raise RuntimeError("boom")
+
+    return {'blocking': blocking, 'looping': looping, 'failing': failing}
+
+
+def test_job_runs_to_completion(db_path, gate):
+    runner = JobRunner(db_path, kinds=_kinds(gate))
+    job_id = runner.submit('blocking', {'value': 3}, owner="alice")
+    gate.set()
+    job = _wait(runner, job_id, "alice", _finished)
+    assert job.status == SUCCEEDED
+    assert job.result == {'value': 3}
+    assert job.partial == {'value': 3}
+    assert job.progress == 1.0
+
+    failed = runner.submit('failing', {}, owner="alice")
+    job = _wait(runner, failed, "alice", _finished)
+    assert (job.status, job.error) == (FAILED, "boom")
+
+    with pytest.raises(ValueError):
+        runner.submit('unknown', {}, owner="alice")
+
+
+def test_identical_requests_share_a_job_per_owner(db_path, gate):
+    runner = JobRunner(db_path, kinds=_kinds(gate))
+    first = runner.submit('blocking', {'value': 1}, owner="alice")
+    assert runner.submit('blocking', {'value': 1}, owner="alice") == first
+    assert runner.submit('blocking', {'value': 2}, owner="alice") != first
+    other = runner.submit('blocking', {'value': 1}, owner="bob")
+    assert other != first
+
+    # Jobs are only visible to, and cancellable by, their owner
+    assert runner.get(first, "bob") is None
+    assert runner.get(first, None).owner == "alice"
+    assert runner.cancel(first, "bob") is False
+    assert [job.id for job in runner.list_jobs("bob")] == [other]
+
+    gate.set()
+    _wait(runner, first, "alice", _finished)
+    # A finished job is not joined again
+    assert runner.submit('blocking', {'value': 1}, owner="alice") != first
+
+
+def test_cancellation_is_cooperative(db_path, gate):
+    runner = JobRunner(db_path, max_workers=1, kinds=_kinds(gate))
+    running = runner.submit('blocking', {'value': 1}, owner="alice")
+    queued = runner.submit('blocking', {'value': 2}, owner="alice")
+    _wait(runner, running, "alice", lambda job: job.status == RUNNING)
+    assert runner.get(queued, "alice").status == QUEUED
+
+    # A queued job is cancelled at once, a running one at its next progress report
+    assert runner.cancel(queued, "alice") is True
+    assert runner.get(queued, "alice").status == CANCELLED
+    assert runner.cancel(running, "alice") is True
+    assert runner.get(running, "alice").cancel_requested
+    gate.set()
+    job = _wait(runner, running, "alice", _finished)
+    assert job.status == CANCELLED
+    assert job.result is None
+    assert runner.cancel(running, "alice") is False
+
+
+def test_cancellation_requested_by_another_process(db_path, gate):
+    runner = JobRunner(db_path, kinds=_kinds(gate))
+    other_process = JobRunner(db_path, kinds=_kinds(gate))
+    job_id = runner.submit('looping', {}, owner="alice")
+    _wait(runner, job_id, "alice", lambda job: job.done > 0)
+    assert other_process.cancel(job_id, "alice") is True
+    assert _wait(runner, job_id, "alice", _finished).status == CANCELLED
+
+
+def test_only_stale_active_jobs_are_failed(db_path, gate):
+    JobRunner(db_path, kinds=_kinds(gate))
+    now = time.time()
+    with sqlite3.connect(db_path) as conn:
+        for job_id, updated_at in (('stale', now - JOB_STALE_SECONDS - 1), ('alive', now)):
+            conn.execute("INSERT INTO jobs (id, kind, key, status, owner, worker, params, created_at, updated_at)"
+                         " VALUES (?, 'blocking', ?, ?, 'alice', 'other-process', '{}', ?, ?)",
+                         (job_id, job_id, RUNNING, updated_at, updated_at))
+
+    # A restarted process fails the stale job only
+    runner = JobRunner(db_path, kinds=_kinds(gate))
+    assert runner.get('stale', "alice").status == FAILED
+    assert runner.get('alive', "alice").status == RUNNING
+
+    # A job that goes stale later is failed when it is next looked up
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE jobs SET updated_at = ? WHERE id = 'alive'", (now - JOB_STALE_SECONDS - 1,))
+    assert runner.get('alive', "alice").status == FAILED
+
+
+def test_baseline_schema_is_migrated(db_path, gate):
+    now = time.time()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(BASELINE_SCHEMA)
+        conn.execute("INSERT INTO jobs (id, kind, key, status, owner, params, result, created_at, updated_at)"
+                     " VALUES ('old', 'blocking', 'k', ?, '1234-abcd', '{}', '{\"value\": 1}', ?, ?)",
+                     (SUCCEEDED, now, now))
+
+    runner = JobRunner(db_path, kinds=_kinds(gate))
+    with sqlite3.connect(db_path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        worker = conn.execute("SELECT worker FROM jobs WHERE id = 'old'").fetchone()[0]
+    assert {'owner', 'worker'} <= columns
+    assert worker == '1234-abcd'
+
+    # Jobs from before owners were recorded belong to the single-user owner
+    job = runner.get('old', "")
+    assert (job.owner, job.status, job.result) == ("", SUCCEEDED, {'value': 1})
+    assert runner.get('old', "alice") is None
+
+    # The migrated table accepts new jobs, and reopening it does not migrate again
+    job_id = runner.submit('blocking', {'value': 2}, owner="alice")
+    gate.set()
+    assert _wait(runner, job_id, "alice", _finished).status == SUCCEEDED
+    assert JobRunner(db_path, kinds=_kinds(gate)).get(job_id, "alice").status == SUCCEEDED
@@ -0,0 +1,123 @@
+"""Tests for sharded risk analysis in core.llm: sharding, per-shard retries, merging and cancellation."""
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+import core.llm as llm
+from core.diagnostics import Diagnostics
+from core.jobs import JobCancelled
+from core.llm_cache import LLMResponseCache
+
+RISKS = {f"RISK-0{n}": {'name': f"Risk {n}", 'description': f"Description {n}"} for n in range(1, 6)}
+
+_PROMPT_RISK_RE = re.compile(r"^- (RISK-\d+):", re.MULTILINE)
+
+
+def _assessment(risk_id):
+    number = int(risk_id.split('-')[1])
+    return {
+        'context': f"Context of {risk_id}",
+        'likelihood': {'score': number, 'reasoning': "likely"},
+        'impact': {'score': 6 - number, 'reasoning': "impactful"},
+    }
+
+
+class FakeLLM:
+    """Stands in for litellm.acompletion, answering with one assessment per risk in the prompt.
+
+    Attributes:
+        fail_once: Risk whose first request fails with an error
+        omit_once: Risk left out of the first response that includes it
+        calls: Risk IDs of every request, in order
+    """
+
+    def __init__(self, fail_once=None, omit_once=None):
+        self.fail_once = fail_once
+        self.omit_once = omit_once
+        self.calls = []
+
+    async def __call__(self, model, messages, **params):
+        risk_ids = _PROMPT_RISK_RE.findall(messages[-1]['content'])
+        self.calls.append(risk_ids)
+        if self.fail_once in risk_ids:
+            self.fail_once = None
+            raise RuntimeError("rate limited")
+        answered = [risk_id for risk_id in risk_ids if risk_id != self.omit_once]
+        if self.omit_once in risk_ids:
+            self.omit_once = None
+        content = json.dumps({
+            'risk_assessments': {risk_id: _assessment(risk_id) for risk_id in answered},
+            'reasoning': "Assessed",
+        })
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def fake_llm(monkeypatch, tmp_path):
+    def install(**kwargs):
+        fake = FakeLLM(**kwargs)
+        monkeypatch.setattr(llm, 'acompletion', fake)
+        monkeypatch.setattr(llm, 'get_llm_cache',
+                            lambda: LLMResponseCache(str(tmp_path / "cache.sqlite3"), enabled=False))
+        monkeypatch.setattr(llm, '_register_version', lambda: "test")
+        return fake
+    return install
+
+
+def _analyze(**kwargs):
+    diagnostics = Diagnostics(stage="risks")
+    analysis = llm.analyze_risks({'description': "Test app"}, [], {}, RISKS, {}, {}, list(RISKS),
+                                 use_cache=False, shard_size=2, shard_by="size", max_concurrency=2,
+                                 diagnostics=diagnostics, **kwargs)
+    return analysis, diagnostics
+
+
+def test_shards_are_split_in_order():
+    assert llm._shard_risk_ids(list(RISKS), RISKS, 2) == [['RISK-01', 'RISK-02'], ['RISK-03', 'RISK-04'],
+                                                          ['RISK-05']]
+    with pytest.raises(ValueError):
+        llm._shard_risk_ids(list(RISKS), RISKS, 2, shard_by="unknown")
+
+
+def test_failed_shard_is_retried_and_merged(fake_llm):
+    fake = fake_llm(fail_once='RISK-03', omit_once='RISK-05')
+    received = {}
+    analysis, diagnostics = _analyze(on_shard=received.update)
+
+    assert sorted(analysis.risk_assessments) == sorted(RISKS)
+    for risk_id, assessment in analysis.risk_assessments.items():
+        expected = _assessment(risk_id)
+        assert assessment.context == expected['context']
+        assert assessment.likelihood.score == expected['likelihood']['score']
+        assert assessment.impact.score == expected['impact']['score']
+    assert analysis.applicable_risks == list(RISKS)
+    assert "3 parallel batches" in analysis.reasoning
+
+    # Each shard re-prompts only for what it is missing: the failed batch in full, then the omitted risk
+    assert sorted(fake.calls) == sorted([['RISK-01', 'RISK-02'], ['RISK-03', 'RISK-04'], ['RISK-03', 'RISK-04'],
+                                         ['RISK-05'], ['RISK-05']])
+    assert sorted(received) == sorted(RISKS)
+    assert [item.level for item in diagnostics] == ['warning']
+    assert "RISK-03..RISK-04 attempt 1 failed: rate limited" in diagnostics.items[0].message
+
+
+def test_shard_missing_after_retries_gets_default_assessment(fake_llm):
+    fake_llm(fail_once='RISK-05')
+    analysis, diagnostics = _analyze(max_retries=0)
+
+    assert sorted(analysis.risk_assessments) == sorted(RISKS)
+    assert analysis.risk_assessments['RISK-01'].likelihood.score == 1
+    assert any("did not provide assessments for 1 risks: ['RISK-05']" in item.message for item in diagnostics)
+
+
+def test_cancellation_from_on_shard_is_not_an_llm_error(fake_llm):
+    fake_llm()
+
+    def cancel(assessments):
+        raise JobCancelled("job")
+
+    with pytest.raises(JobCancelled):
+        _analyze(on_shard=cancel)
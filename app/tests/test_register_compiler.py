@@ -0,0 +1,80 @@
+"""Tests for core.register_compiler: ID normalization and reference validation."""
+
+import pytest
+
+from core.register_compiler import (
+    RegisterValidationError,
+    _IdResolver,
+    check_issues,
+    compile_references,
+)
+
+
+def _codes(issues, level):
+    return sorted(issue.code for issue in issues if issue.level == level)
+
+
+def test_resolver_tolerates_zero_padding():
+    resolver = _IdResolver(['DES-01', 'CTRL-007', 'cap-3'])
+    assert resolver.resolve('DES-01') == 'DES-01'
+    assert resolver.resolve('DES-1') == 'DES-01'
+    assert resolver.resolve('des-001') == 'DES-01'
+    assert resolver.resolve(' CTRL-7 ') == 'CTRL-007'
+    assert resolver.resolve('CAP-03') == 'cap-3'
+    assert resolver.resolve('DES-2') is None
+    assert resolver.resolve('not an id') is None
+
+
+def test_padded_references_are_normalized():
+    compiled = compile_references(
+        risks={'RISK-001': {'controls': ['CTRL-1', 'CTRL-01'], 'capabilities': ['CAP-1'], 'element_id': 'DES-1'}},
+        controls={'CTRL-01': {'risks': ['RISK-1']}},
+        elements=['CAP-01', 'DES-01'],
+    )
+    risk = compiled.risks['RISK-001']
+    assert risk['controls'] == ['CTRL-01']
+    assert risk['capabilities'] == ['CAP-01']
+    assert risk['element_id'] == 'DES-01'
+    assert compiled.controls['CTRL-01']['risks'] == ['RISK-001']
+    assert compiled.normalized == 4
+    assert compiled.issues == []
+
+
+def test_dangling_references_are_dropped_as_errors():
+    compiled = compile_references(
+        risks={'RISK-001': {'controls': ['CTRL-01', 'CTRL-99'], 'components': ['CMP-09'], 'element_id': 'DES-09'}},
+        controls={'CTRL-01': {}},
+        elements=['CMP-01', 'DES-01'],
+    )
+    risk = compiled.risks['RISK-001']
+    assert risk['controls'] == ['CTRL-01']
+    assert risk['components'] == []
+    assert risk['element_id'] == ''
+    assert _codes(compiled.issues, 'error') == ['dangling-control', 'dangling-element', 'dangling-element']
+    assert {issue.subject for issue in compiled.issues} == {'RISK-001'}
+    with pytest.raises(RegisterValidationError) as raised:
+        check_issues(compiled.issues)
+    assert raised.value.issues == compiled.issues
+
+
+def test_back_reference_mismatches_are_warnings():
+    compiled = compile_references(
+        risks={'RISK-001': {'controls': ['CTRL-01']},
+               'RISK-002': {'controls': ['CTRL-02']},
+               'RISK-003': {'controls': []}},
+        controls={'CTRL-01': {'risks': ['RISK-003']},
+                  'CTRL-02': {'risks': ['RISK-002', 'RISK-404']},
+                  'CTRL-03': {}},
+        elements=[],
+    )
+    assert _codes(compiled.issues, 'error') == []
+    assert _codes(compiled.issues, 'warning') == ['backref-mismatch', 'backref-missing', 'dangling-backref',
+                                                  'unused-control']
+    # Back-references are rebuilt from the risks' control lists
+    assert compiled.controls['CTRL-01']['risks'] == ['RISK-001']
+    assert compiled.controls['CTRL-02']['risks'] == ['RISK-002']
+    assert compiled.controls['CTRL-03']['risks'] == []
+
+    check_issues(compiled.issues)
+    with pytest.raises(RegisterValidationError):
+        check_issues(compiled.issues, strict=True)
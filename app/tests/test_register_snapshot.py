@@ -0,0 +1,36 @@
+"""Tests for the compiled register snapshots of core.register."""
+
+import os
+
+import pytest
+
+from core import register
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('ARC_REGISTER_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(register, '_loaded', {})
+    return tmp_path
+
+
+def _load_fresh():
+    register._loaded.clear()
+    return register.load_register(variant='bundled')
+
+
+def test_snapshot_is_reused_until_the_compiler_code_changes(snapshot_dir, monkeypatch):
+    first = _load_fresh()
+    snapshots = os.listdir(snapshot_dir)
+    assert len(snapshots) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the register was rebuilt from YAML")
+
+    monkeypatch.setattr(register, 'build_model', fail)
+    assert _load_fresh().risks == first.risks
+
+    # Edited loader/compiler code gives another snapshot key, so the old snapshot is not served
+    monkeypatch.setattr(register, '_SNAPSHOT_CODE_HASH', "edited")
+    with pytest.raises(AssertionError, match="rebuilt from YAML"):
+        _load_fresh()
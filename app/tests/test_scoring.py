@@ -0,0 +1,96 @@
+"""Tests for core.scoring: the NumPy score matrices against plain per-assessment arithmetic."""
+
+import random
+
+import numpy as np
+
+from core.scoring import ScoringIndex
+from models.schemas import Assessment, ImplementationStatus, RiskAssessment, ScoreAssessment
+
+RISKS = {
+    'RISK-1': {'controls': ['CTRL-1', 'CTRL-2']},
+    'RISK-2': {'controls': ['CTRL-3']},
+    'RISK-3': {'controls': []},
+    'RISK-4': {'controls': ['CTRL-1', 'CTRL-3', 'CTRL-4']},
+}
+
+EFFECTIVENESS = {ImplementationStatus.NOT_IMPLEMENTED: 0.0, ImplementationStatus.PARTIAL: 0.5,
+                 ImplementationStatus.IMPLEMENTED: 1.0}
+
+
+def _risk(likelihood, impact):
+    return RiskAssessment(context="c", likelihood=ScoreAssessment(score=likelihood, reasoning="r"),
+                          impact=ScoreAssessment(score=impact, reasoning="r"))
+
+
+def _expected_residual(assessment, risk_id):
+    """Residual score of one risk computed directly from Assessment.control_status()."""
+    risk = assessment.risk_assessments.get(risk_id)
+    if risk is None:
+        return 0.0
+    effects = [EFFECTIVENESS[status] for status in
+               (assessment.control_status(risk_id, ctrl_id) for ctrl_id in RISKS[risk_id]['controls'])
+               if status is not ImplementationStatus.NOT_APPLICABLE]
+    mitigation = sum(effects) / len(effects) if effects else 0.0
+    return risk.likelihood.score * risk.impact.score * (1.0 - mitigation)
+
+
+def _random_assessment(rng):
+    assessment = Assessment(risk_assessments={risk_id: _risk(rng.randint(1, 5), rng.randint(1, 5))
+                                              for risk_id in RISKS if rng.random() < 0.8})
+    for risk_id, risk_data in RISKS.items():
+        for ctrl_id in risk_data['controls']:
+            choice = rng.random()
+            if choice < 0.4:
+                assessment.control_statuses.setdefault(risk_id, {})[ctrl_id] = rng.choice(list(ImplementationStatus))
+            elif choice < 0.6:
+                # Edited text without a recorded status counts as partially implemented
+                assessment.control_implementations.setdefault(risk_id, {})[ctrl_id] = "Some work was done"
+    return assessment
+
+
+def test_single_assessment():
+    assessment = Assessment(
+        risk_assessments={'RISK-1': _risk(5, 4), 'RISK-2': _risk(2, 5), 'RISK-3': _risk(4, 4)},
+        control_statuses={'RISK-1': {'CTRL-1': ImplementationStatus.IMPLEMENTED},
+                          'RISK-2': {'CTRL-3': ImplementationStatus.NOT_APPLICABLE}},
+        control_implementations={'RISK-1': {'CTRL-2': "Partly done"}},
+    )
+    scores = ScoringIndex(RISKS).portfolio([assessment])
+
+    assert scores.threshold_mask(4, 4).tolist() == [[True, False, True, False]]
+    assert scores.high_priority(4, 4) == ['RISK-1', 'RISK-3']
+    assert scores.high_priority(4, 4, ['RISK-3', 'RISK-9', 'RISK-1']) == ['RISK-3', 'RISK-1']
+
+    heatmap = scores.heatmap()
+    assert heatmap.sum() == 3
+    assert (heatmap[4, 3], heatmap[1, 4], heatmap[3, 3]) == (1, 1, 1)
+
+    # RISK-1: implemented + partial = 75% mitigated; RISK-2: its only control is not applicable
+    assert scores.residual().tolist() == [[5.0, 10.0, 16.0, 0.0]]
+
+
+def test_portfolio_matches_plain_arithmetic():
+    rng = random.Random(7)
+    assessments = [_random_assessment(rng) for _ in range(40)]
+    index = ScoringIndex(RISKS)
+    scores = index.portfolio(assessments)
+
+    for threshold in ((1, 1), (3, 4), (5, 5)):
+        expected_mask = [[risk_id in assessment.risk_assessments
+                          and assessment.risk_assessments[risk_id].likelihood.score >= threshold[0]
+                          and assessment.risk_assessments[risk_id].impact.score >= threshold[1]
+                          for risk_id in RISKS] for assessment in assessments]
+        mask = scores.threshold_mask(*threshold)
+        assert mask.tolist() == expected_mask
+
+        expected_heatmap = np.zeros((5, 5), dtype=int)
+        for assessment, row in zip(assessments, expected_mask):
+            for risk_id, selected in zip(RISKS, row):
+                if selected:
+                    risk = assessment.risk_assessments[risk_id]
+                    expected_heatmap[risk.likelihood.score - 1, risk.impact.score - 1] += 1
+        assert scores.heatmap(mask).tolist() == expected_heatmap.tolist()
+
+    expected_residual = [[_expected_residual(assessment, risk_id) for risk_id in RISKS] for assessment in assessments]
+    np.testing.assert_allclose(scores.residual(), expected_residual)
@@ -1,104 +1,89 @@
-"""Data loading utilities with comprehensive error handling."""
+"""Streamlit adapters over the core register loader."""
 
 import streamlit as st
 import yaml
 import os
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
+from core.controls import get_controls_for_risk as _get_controls_for_risk
+from core.coverage import ControlCoverage
+from core.register import Register, load_register
+from core.register_compiler import RegisterValidationError, check_issues
+from core.risk_index import RiskIndex
+from core.scoring import ScoringIndex
+from utils.diagnostics import report_diagnostics
+
+
+# Register version whose diagnostics were last shown
+_reported_version: Optional[str] = None
+
+
+def get_register() -> Register:
+    """Return the shared register, surfacing its problems in the UI.
+
+    Compiler errors (references dropped because their target does not exist)
+    stop the app, as they stop the docs build. Warnings are shown once per
+    register version rather than on every call; load failures are shown on
+    every call.
+    """
+    global _reported_version
+    register = load_register()
+    if register.model is not None:
+        try:
+            check_issues(register.model.issues)
+        except RegisterValidationError as e:
+            st.error(f"The register has invalid cross-references. Fix the register files and reload.\n\n{e}")
+            st.stop()
+    if register.diagnostics.has_errors or register.version != _reported_version:
+        _reported_version = register.version
+        report_diagnostics(register.diagnostics)
+    return register
 
 
-@st.cache_data
 def load_data() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
-    """Load all YAML data files with error handling.
+    """Load all register data from the compiled snapshot with error handling.
+
+    Loads the register variant selected by ARC_REGISTER ('bundled' or 'wog'),
+    mapped onto the bundled register's schema by core.register_loader.
+
+    The snapshot is keyed by a content hash of the YAML files and rebuilt only
+    when one of them changes. The returned mappings are shared and read-only.
 
     Returns:
         Tuple of (capabilities, risks, controls, components, design) dictionaries
     """
-    # Get the directory of this file (app/utils/)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to app/, then to data/
-    data_dir = os.path.join(os.path.dirname(current_dir), '..', 'data')
-    
-    try:
-        with open(os.path.join(data_dir, 'capabilities.yaml'), 'r') as f:
-            capabilities = yaml.safe_load(f)
-        if not capabilities:
-            st.error("Failed to load capabilities data. Please check data/capabilities.yaml")
-            return {}, {}, {}, {}, {}
-    except FileNotFoundError:
-        st.error("Capabilities file not found. Please ensure data/capabilities.yaml exists")
-        return {}, {}, {}, {}
-    except yaml.YAMLError as e:
-        st.error(f"Error parsing capabilities.yaml: {str(e)}")
-        return {}, {}, {}, {}
-    except Exception as e:
-        st.error(f"Unexpected error loading capabilities: {str(e)}")
-        return {}, {}, {}, {}
-    
-    try:
-        with open(os.path.join(data_dir, 'risks.yaml'), 'r') as f:
-            risks = yaml.safe_load(f)
-        if not risks:
-            st.error("Failed to load risks data. Please check data/risks.yaml")
-            return capabilities, {}, {}, {}, {}, {}
-    except FileNotFoundError:
-        st.error("Risks file not found. Please ensure data/risks.yaml exists")
-        return capabilities, {}, {}, {}, {}
-    except yaml.YAMLError as e:
-        st.error(f"Error parsing risks.yaml: {str(e)}")
-        return capabilities, {}, {}, {}, {}
-    except Exception as e:
-        st.error(f"Unexpected error loading risks: {str(e)}")
-        return capabilities, {}, {}, {}, {}
-    
-    try:
-        with open(os.path.join(data_dir, 'controls.yaml'), 'r') as f:
-            controls = yaml.safe_load(f)
-        if not controls:
-            st.error("Failed to load controls data. Please check data/controls.yaml")
-            return capabilities, risks, {}, {}, {}
-    except FileNotFoundError:
-        st.error("Controls file not found. Please ensure data/controls.yaml exists")
-        return capabilities, risks, {}, {}, {}
-    except yaml.YAMLError as e:
-        st.error(f"Error parsing controls.yaml: {str(e)}")
-        return capabilities, risks, {}, {}, {}
-    except Exception as e:
-        st.error(f"Unexpected error loading controls: {str(e)}")
-        return capabilities, risks, {}, {}, {}
-    
-    try:
-        with open(os.path.join(data_dir, 'components.yaml'), 'r') as f:
-            components = yaml.safe_load(f)
-        if not components:
-            st.error("Failed to load components data. Please check data/components.yaml")
-            return capabilities, risks, controls, {}, {}
-    except FileNotFoundError:
-        st.error("Components file not found. Please ensure data/components.yaml exists")
-        return capabilities, risks, controls, {}, {}
-    except yaml.YAMLError as e:
-        st.error(f"Error parsing components.yaml: {str(e)}")
-        return capabilities, risks, controls, {}, {}
-    except Exception as e:
-        st.error(f"Unexpected error loading components: {str(e)}")
-        return capabilities, risks, controls, {}, {}
+    return get_register().as_tuple()
 
-    try:
-        with open(os.path.join(data_dir, 'design.yaml'), 'r') as f:
-            design = yaml.safe_load(f)
-        if not design:
-            st.error("Failed to load design data. Please check data/design.yaml")
-            return capabilities, risks, controls, components, {}
-    except FileNotFoundError:
-        st.error("Design file not found. Please ensure data/design.yaml exists")
-        return capabilities, risks, controls, components, {}
-    except yaml.YAMLError as e:
-        st.error(f"Error parsing design.yaml: {str(e)}")
-        return capabilities, risks, controls, components, {}
-    except Exception as e:
-        st.error(f"Unexpected error loading design: {str(e)}")
-        return capabilities, risks, controls, components, {}
 
-    return capabilities, risks, controls, components, design
+def get_register_version() -> str:
+    """Return the content hash of the currently loaded register."""
+    return load_register().version
+
+
+def load_risk_index() -> RiskIndex:
+    """Return the reverse risk indexes for the currently loaded register.
+
+    Returns:
+        RiskIndex shared across sessions, rebuilt only when the register changes
+    """
+    return load_register().index
+
+
+def load_control_coverage() -> ControlCoverage:
+    """Return the control coverage bitsets for the currently loaded register.
+
+    Returns:
+        ControlCoverage shared across sessions, rebuilt only when the register changes
+    """
+    return load_register().coverage
+
+
+def load_scoring_index() -> ScoringIndex:
+    """Return the dense risk indexes used to build score matrices for the currently loaded register.
+
+    Returns:
+        ScoringIndex shared across sessions, rebuilt only when the register changes
+    """
+    return load_register().scoring
 
 
 @st.cache_data
@@ -132,39 +117,18 @@ def load_sample_data() -> Dict[str, Any]:
 
 
 def get_controls_for_risk(risk_id: str, risks: Dict[str, Any], controls: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Get controls for a specific risk with error handling.
-    
+    """Get controls for a specific risk.
+
+    References were validated when the register was compiled (problems are
+    reported once per register version, through get_register()), so this is
+    a plain lookup.
+
     Args:
         risk_id: The ID of the risk to get controls for
         risks: Dictionary of risk data
         controls: Dictionary of control data
-        
+
     Returns:
         List of control dictionaries for the specified risk
     """
-    risk_controls = []
-    
-    try:
-        if not risks:
-            st.warning("No risks data available to find controls")
-            return []
-        
-        if risk_id in risks:
-            control_ids = risks[risk_id].get('controls', [])
-            for ctrl_id in control_ids:
-                if ctrl_id in controls:
-                    risk_controls.append({
-                        'id': ctrl_id,
-                        'name': controls[ctrl_id]['name'],
-                        'description': controls[ctrl_id]['description']
-                    })
-                else:
-                    st.warning(f"Control {ctrl_id} not found in controls data")
-        else:
-            st.warning(f"Risk {risk_id} not found in risks data")
-        
-        return risk_controls
-        
-    except Exception as e:
-        st.error(f"Unexpected error looking up controls: {str(e)}")
-        return []
+    return _get_controls_for_risk(risk_id, risks, controls)
@@ -0,0 +1,21 @@
+"""Render core library diagnostics as Streamlit alerts."""
+
+import streamlit as st
+from typing import Iterable
+
+from models.schemas import Diagnostic
+
+
+def report_diagnostics(diagnostics: Iterable[Diagnostic]) -> None:
+    """Show each diagnostic with the matching Streamlit alert.
+
+    Args:
+        diagnostics: Diagnostics collector or any iterable of Diagnostic
+    """
+    for item in diagnostics:
+        if item.level == "error":
+            st.error(item.message)
+        elif item.level == "warning":
+            st.warning(item.message)
+        else:
+            st.info(item.message)
@@ -1,7 +1,30 @@
 """Session state management utilities."""
 
+import hashlib
+import os
+import re
+import secrets
 import streamlit as st
-from models.schemas import SessionKeys
+from typing import Dict, Any, List, Optional
+from core.control_status import ControlStatusTable
+from core.jobs import Job, get_job_runner
+from core.register import Register, load_register
+from models.schemas import Assessment, CapabilityAnalysis, Diagnostic, RiskAssessment, SessionKeys
+
+# URL query parameter holding the running background job, so a reloaded page can reattach to it
+JOB_QUERY_PARAM = "job"
+
+# URL query parameter holding this browser's private owner token (when not signed in)
+OWNER_QUERY_PARAM = "owner"
+
+# Owner key shared by every session when ARC_SINGLE_USER is set (and by rows saved before owners were recorded)
+SINGLE_USER_OWNER = ""
+
+_OWNER_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{22,64}$")
+
+# Page each kind of background job fills in, and the page to return to if it is cancelled
+JOB_PAGES = {'capabilities': "capability_identification", 'risks': "risk_assessment"}
+JOB_CANCEL_PAGES = {'capabilities': "application_assessment", 'risks': "capability_identification"}
 
 
 def initialize_session_state():
@@ -44,15 +67,274 @@ def initialize_session_state():
         st.session_state[SessionKeys.IMPACT_THRESHOLD] = 4
 
 
-def initialize_control_implementation(risk_id: str, control_id: str, 
-                                   default_text: str = "I did not implement this control. I accept all residual risk."):
-    """Initialize implementation status for a specific control.
-    
+def get_store_owner() -> str:
+    """Return the owner key that scopes this session's saved assessments.
+
+    - ARC_SINGLE_USER=1 (single-user deployments): one owner shared by every
+      session, which also owns assessments saved before owners were recorded
+    - Signed in through Streamlit authentication: the user's account
+    - Otherwise: a random token kept in the page URL (``?owner=...``), so
+      bookmarking the URL keeps access to the assessments saved from it
+
+    Only a hash of the account or token is stored with each assessment.
+    """
+    if os.environ.get("ARC_SINGLE_USER", "").strip().lower() in ("1", "true", "yes", "on"):
+        return SINGLE_USER_OWNER
+    try:
+        user = st.user
+        identity = (user.get("email") or user.get("sub")) if user.get("is_logged_in") else None
+    except Exception:
+        # Streamlit without authentication support
+        identity = None
+    if identity:
+        return "user:" + hashlib.sha256(str(identity).encode('utf-8')).hexdigest()
+
+    token = st.query_params.get(OWNER_QUERY_PARAM)
+    if not token or not _OWNER_TOKEN_RE.match(token):
+        token = secrets.token_urlsafe(24)
+        st.query_params[OWNER_QUERY_PARAM] = token
+    return "token:" + hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def get_control_status_table(register: Register) -> ControlStatusTable:
+    """Return the session's control status table for the loaded register.
+
+    All control implementation statuses and texts of the assessment live in
+    this one table instead of one session key per (risk, control) pair.
+
     Args:
-        risk_id: The ID of the risk
-        control_id: The ID of the control
-        default_text: Default text for unimplemented controls
+        register: Loaded register, whose risk-control pairs the table covers
+
+    Returns:
+        ControlStatusTable stored in session state
     """
-    control_key = f"control_implementation_{risk_id}_{control_id}"
-    if control_key not in st.session_state:
-        st.session_state[control_key] = default_text
+    state = st.session_state
+    table = state.get(SessionKeys.CONTROL_STATUS_TABLE)
+    if table is None:
+        table = ControlStatusTable(register.scoring, register.version)
+    elif table.version != register.version:
+        # The register changed: carry the recorded entries over to the new pair positions
+        try:
+            table = table.migrate(register.scoring, register.version)
+        except ValueError:
+            # A restored table whose register version is no longer loaded cannot be mapped
+            st.warning(f"Control implementation statuses recorded against register version "
+                       f"{table.version[:12]} could not be carried over to version "
+                       f"{register.version[:12]}; please review them again.")
+            table = ControlStatusTable(register.scoring, register.version)
+    elif table.index is None:
+        table.attach(register.scoring)
+    state[SessionKeys.CONTROL_STATUS_TABLE] = table
+    return table
+
+
+def build_assessment_from_session(register: Register) -> Assessment:
+    """Collect the current session state into an Assessment.
+
+    Args:
+        register: Loaded register, used to read the control status table
+
+    Returns:
+        Assessment holding everything entered and generated so far
+    """
+    state = st.session_state
+    applicable_risks = state.get(SessionKeys.APPLICABLE_RISKS)
+    high_priority_risks = state.get(SessionKeys.HIGH_PRIORITY_RISKS)
+
+    control_implementations, control_statuses = get_control_status_table(register).to_assessment_fields(
+        applicable_risks or high_priority_risks or [])
+
+    return Assessment(
+        application_info=state.get(SessionKeys.APPLICATION_INFO) or {},
+        application_description=state.get(SessionKeys.APPLICATION_DESCRIPTION),
+        capability_analysis=state.get(SessionKeys.CAPABILITY_ANALYSIS),
+        selected_capabilities=state.get(SessionKeys.SELECTED_CAPABILITIES) or [],
+        applicable_risks=applicable_risks,
+        risk_assessments=state.get(SessionKeys.RISK_ASSESSMENTS) or {},
+        analysis_reasoning=state.get(SessionKeys.ANALYSIS_REASONING),
+        likelihood_threshold=state.get(SessionKeys.LIKELIHOOD_THRESHOLD, 4),
+        impact_threshold=state.get(SessionKeys.IMPACT_THRESHOLD, 4),
+        high_priority_risks=high_priority_risks,
+        control_implementations=control_implementations,
+        control_statuses=control_statuses,
+    )
+
+
+# Assessment state restored by restore_assessment_to_session
+_ASSESSMENT_KEYS = (
+    SessionKeys.APPLICATION_INFO, SessionKeys.APPLICATION_DESCRIPTION, SessionKeys.CAPABILITY_ANALYSIS,
+    SessionKeys.SELECTED_CAPABILITIES, SessionKeys.ASSESSED_CAPABILITIES, SessionKeys.APPLICABLE_RISKS,
+    SessionKeys.RISK_ASSESSMENTS, SessionKeys.ANALYSIS_REASONING, SessionKeys.HIGH_PRIORITY_RISKS,
+    SessionKeys.FINAL_DESCRIPTION_DISPLAY, SessionKeys.CONTROL_STATUS_TABLE,
+)
+
+# Widget keys holding per-capability, per-risk and per-control edits
+_WIDGET_KEY_PREFIXES = (
+    "cap_", "likelihood_score_", "likelihood_reasoning_", "impact_score_", "impact_reasoning_",
+    "implementation_text_", "implementation_status_",
+)
+
+
+def resume_page(assessment: Assessment) -> str:
+    """Return the page to open for a saved assessment (the furthest stage reached)."""
+    if assessment.high_priority_risks is not None:
+        return "controls"
+    if assessment.applicable_risks is not None:
+        return "risk_assessment"
+    if assessment.capability_analysis is not None:
+        return "capability_identification"
+    return "application_assessment"
+
+
+def restore_assessment_to_session(assessment: Assessment, register: Optional[Register] = None) -> None:
+    """Replace the current session's assessment with a saved one.
+
+    Clears stale widget state so every page renders the restored values.
+
+    Args:
+        assessment: Assessment to restore
+        register: Loaded register (defaults to the shared register)
+    """
+    state = st.session_state
+    for key in list(state.keys()):
+        if key in _ASSESSMENT_KEYS or str(key).startswith(_WIDGET_KEY_PREFIXES):
+            del state[key]
+
+    info = assessment.application_info
+    state[SessionKeys.APPLICATION_INFO] = dict(info)
+    state[SessionKeys.PURPOSE_TEXT] = info.get('description', '')
+    state[SessionKeys.COMPONENTS_TEXT] = info.get('components', '')
+    state[SessionKeys.PII_TEXT] = info.get('pii_data', '')
+    state[SessionKeys.HUMAN_IN_LOOP_TEXT] = info.get('human_in_loop', '')
+    state[SessionKeys.REPO_URL] = info.get('repo_url', '')
+    state[SessionKeys.REPO_ANALYSIS] = info.get('repo_analysis', '')
+    state[SessionKeys.EDIT_MODE] = False
+
+    if assessment.application_description is not None:
+        state[SessionKeys.APPLICATION_DESCRIPTION] = assessment.application_description
+    if assessment.capability_analysis is not None:
+        state[SessionKeys.CAPABILITY_ANALYSIS] = assessment.capability_analysis
+    state[SessionKeys.SELECTED_CAPABILITIES] = list(assessment.selected_capabilities)
+    if assessment.applicable_risks is not None:
+        state[SessionKeys.APPLICABLE_RISKS] = list(assessment.applicable_risks)
+        # The saved risks were assessed for the saved selection; do not re-run the LLM
+        state[SessionKeys.ASSESSED_CAPABILITIES] = sorted(assessment.selected_capabilities)
+    state[SessionKeys.RISK_ASSESSMENTS] = dict(assessment.risk_assessments)
+    if assessment.analysis_reasoning is not None:
+        state[SessionKeys.ANALYSIS_REASONING] = assessment.analysis_reasoning
+    state[SessionKeys.LIKELIHOOD_THRESHOLD] = assessment.likelihood_threshold
+    state[SessionKeys.IMPACT_THRESHOLD] = assessment.impact_threshold
+    if assessment.high_priority_risks is not None:
+        state[SessionKeys.HIGH_PRIORITY_RISKS] = list(assessment.high_priority_risks)
+
+    register = register or load_register()
+    state[SessionKeys.CONTROL_STATUS_TABLE] = ControlStatusTable.from_assessment(
+        register.scoring, register.version, assessment)
+
+    state[SessionKeys.PAGE] = resume_page(assessment)
+
+
+def get_tracked_job_id() -> Optional[str]:
+    """Return the ID of the background job this session is waiting on, if any."""
+    return st.session_state.get(SessionKeys.ACTIVE_JOB)
+
+
+def track_job(job_id: str) -> None:
+    """Wait on a background job in this session and record it in the page URL."""
+    st.session_state[SessionKeys.ACTIVE_JOB] = job_id
+    st.query_params[JOB_QUERY_PARAM] = job_id
+
+
+def untrack_job() -> None:
+    """Stop waiting on the tracked background job (the job itself is not affected)."""
+    st.session_state.pop(SessionKeys.ACTIVE_JOB, None)
+    st.query_params.pop(JOB_QUERY_PARAM, None)
+
+
+def reattach_job_from_query_params() -> Optional[Job]:
+    """Adopt the background job named in the page URL if this session is not tracking one.
+
+    Called on every run; only a new session (e.g. after a reload) with a job
+    in its URL adopts it, and only if the job belongs to this session's owner
+    (see get_store_owner). Any other job ID is dropped from the URL.
+
+    Returns:
+        The adopted job, or None
+    """
+    job_id = st.query_params.get(JOB_QUERY_PARAM)
+    if not job_id or SessionKeys.ACTIVE_JOB in st.session_state:
+        return None
+    job = get_job_runner().get(job_id, get_store_owner())
+    if job is None:
+        st.query_params.pop(JOB_QUERY_PARAM, None)
+        return None
+    st.session_state[SessionKeys.ACTIVE_JOB] = job_id
+    return job
+
+
+def build_risk_job_params(applicable_risks: List[str], risk_ids: List[str]) -> Dict[str, Any]:
+    """Return the parameters of a 'risks' background job for the current session.
+
+    Args:
+        applicable_risks: All risks applicable to the selected capabilities, in display order
+        risk_ids: Risks to assess; the current assessments of the other applicable risks are kept
+
+    Returns:
+        JSON-serializable keyword arguments of core.jobs.risk_analysis_job
+    """
+    state = st.session_state
+    existing = state.get(SessionKeys.RISK_ASSESSMENTS) or {}
+    assessing = set(risk_ids)
+    capability_analysis = state.get(SessionKeys.CAPABILITY_ANALYSIS)
+    return {
+        'application_info': dict(state.get(SessionKeys.APPLICATION_INFO) or {}),
+        'selected_capabilities': list(state.get(SessionKeys.SELECTED_CAPABILITIES) or []),
+        'applicable_risks': list(applicable_risks),
+        'risk_ids': list(risk_ids),
+        'risk_assessments': {risk_id: existing[risk_id].model_dump() for risk_id in applicable_risks
+                             if risk_id in existing and risk_id not in assessing},
+        'capability_analysis': capability_analysis.model_dump() if capability_analysis is not None else None,
+    }
+
+
+def restore_job_inputs(job: Job) -> None:
+    """Restore the inputs of a background job into a session that has none (e.g. after a reload)."""
+    if SessionKeys.APPLICATION_INFO in st.session_state:
+        return
+    params = job.params
+    restore_assessment_to_session(Assessment(
+        application_info=params.get('application_info') or {},
+        capability_analysis=params.get('capability_analysis'),
+        selected_capabilities=params.get('selected_capabilities') or [],
+    ))
+
+
+def apply_job_result(job: Job) -> None:
+    """Store the result of a succeeded background job in session state and open its page.
+
+    The job's diagnostics are kept under SessionKeys.JOB_DIAGNOSTICS for the
+    next run to report.
+
+    Args:
+        job: Succeeded 'capabilities' or 'risks' job
+    """
+    state = st.session_state
+    restore_job_inputs(job)
+    params, result = job.params, job.result
+
+    if job.kind == 'capabilities':
+        analysis = CapabilityAnalysis.model_validate(result['capability_analysis'])
+        state[SessionKeys.CAPABILITY_ANALYSIS] = analysis
+        state[SessionKeys.SELECTED_CAPABILITIES] = analysis.applicable_capabilities.copy()
+    elif job.kind == 'risks':
+        state[SessionKeys.SELECTED_CAPABILITIES] = list(params['selected_capabilities'])
+        state[SessionKeys.APPLICABLE_RISKS] = list(params['applicable_risks'])
+        state[SessionKeys.RISK_ASSESSMENTS] = {risk_id: RiskAssessment.model_validate(assessment)
+                                               for risk_id, assessment in result['risk_assessments'].items()}
+        state[SessionKeys.ASSESSED_CAPABILITIES] = sorted(params['selected_capabilities'])
+        # A full analysis replaces the reasoning; assessing newly applicable risks keeps it
+        if not params.get('risk_assessments') or SessionKeys.ANALYSIS_REASONING not in state:
+            state[SessionKeys.ANALYSIS_REASONING] = result['reasoning']
+
+    state[SessionKeys.JOB_DIAGNOSTICS] = [Diagnostic.model_validate(item) for item in result.get('diagnostics', [])]
+    state[SessionKeys.PAGE] = JOB_PAGES[job.kind]
@@ -7,35 +7,86 @@ document.addEventListener('DOMContentLoaded', async function() {
         return;
     }
 
-    // Load data from assets directory
+    // Load the summary index from the assets directory; risk details, controls
+    // and the search index are fetched on demand (see scripts/build_risk_register.py)
     // Path is relative to arc_framework/risk-register/ page
-    const response = await fetch('../../assets/risk_register_data.json');
-    const data = await response.json();
-
-    // Populate filter options
-    const elementFilter = document.getElementById('element-filter');
-    const failureFilter = document.getElementById('failure-filter');
-
-    // Populate element categories
-    const categories = [...new Set(data.risks.map(r => r.element_category))].sort();
-    categories.forEach(cat => {
-        const option = document.createElement('option');
-        option.value = cat;
-        option.textContent = cat;
-        elementFilter.appendChild(option);
+    const DATA_URL = '../../assets/risk-register/';
+    const fetchJson = (path) => fetch(DATA_URL + path).then(response => {
+        if (!response.ok) {
+            throw new Error(`Failed to load ${path}: ${response.status}`);
+        }
+        return response.json();
     });
 
-    // Populate failure modes
-    const failureModes = [...new Set(data.risks.map(r => r.failure_mode))].sort();
-    failureModes.forEach(mode => {
-        const option = document.createElement('option');
-        option.value = mode;
-        option.textContent = mode;
-        failureFilter.appendChild(option);
+    // Each file is fetched at most once; failed fetches are retried on next use
+    const jsonCache = new Map();
+    function loadJson(path) {
+        if (!jsonCache.has(path)) {
+            jsonCache.set(path, fetchJson(path).catch(error => {
+                jsonCache.delete(path);
+                throw error;
+            }));
+        }
+        return jsonCache.get(path);
+    }
+
+    const data = await fetchJson('index.json');
+
+    // Risk sets are bitsets over positions in data.risks (bit i set = risk i included)
+    const riskCount = data.risks.length;
+    const riskPosition = new Map(data.risks.map((risk, position) => [risk.id, position]));
+    const bitsetWords = Math.ceil(riskCount / 32);
+
+    function bitsetOf(positions) {
+        const bits = new Uint32Array(bitsetWords);
+        positions.forEach(position => { bits[position >>> 5] |= 1 << (position & 31); });
+        return bits;
+    }
+
+    function hasBit(bits, position) {
+        return (bits[position >>> 5] & (1 << (position & 31))) !== 0;
+    }
+
+    function intersects(a, b) {
+        for (let i = 0; i < bitsetWords; i++) {
+            if (a[i] & b[i]) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    function popcount(bits) {
+        let count = 0;
+        for (let i = 0; i < bitsetWords; i++) {
+            let word = bits[i];
+            word -= (word >>> 1) & 0x55555555;
+            word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+            count += (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+        }
+        return count;
+    }
+
+    const allRisks = bitsetOf(data.risks.map((risk, position) => position));
+
+    // Precomputed facets (element_category, failure_mode, type, controls):
+    // facet name -> Map(value -> bitset of risks with that value)
+    const facets = {};
+    Object.entries(data.metadata.facets).forEach(([name, values]) => {
+        facets[name] = new Map(values.map(facet => [facet.value, bitsetOf(facet.risks)]));
     });
 
-    // Function to update stats based on visible rows (will be defined after table initialization)
-    let updateStats;
+    // Populate filter options, with counts, from the sorted facets
+    function populateFilter(select, facetValues) {
+        facetValues.forEach(facet => {
+            const option = document.createElement('option');
+            option.value = facet.value;
+            option.textContent = `${facet.value} (${facet.count})`;
+            select.appendChild(option);
+        });
+    }
+    populateFilter(document.getElementById('element-filter'), data.metadata.facets.element_category);
+    populateFilter(document.getElementById('failure-filter'), data.metadata.facets.failure_mode);
 
     // Custom formatter for risk types
     function typeFormatter(cell) {
@@ -66,19 +117,8 @@ document.addEventListener('DOMContentLoaded', async function() {
         return `<span class="failure-mode-badge">${mode}</span>`;
     }
 
-    // Row formatter to add expandable details
-    function rowFormatter(row) {
-        const data = row.getData();
-
-        // Create element to hold expanded content
-        const holderEl = document.createElement("div");
-        holderEl.style.boxSizing = "border-box";
-        holderEl.style.padding = "10px 20px";
-        holderEl.style.borderTop = "1px solid #ddd";
-        holderEl.style.borderBottom = "1px solid #ddd";
-        holderEl.style.background = "#fafafa";
-        holderEl.style.display = "none"; // Hidden by default
-
+    // Render the expanded details of a risk from its shard and the controls table
+    function renderDetails(holderEl, data, controlsById) {
         // Description
         const descriptionDiv = document.createElement("div");
         descriptionDiv.style.wordWrap = "break-word";
@@ -103,13 +143,16 @@ document.addEventListener('DOMContentLoaded', async function() {
             holderEl.appendChild(referencesDiv);
         }
 
-        // Controls
-        if (data.controls && data.controls.length > 0) {
+        // Controls (referenced by ID, resolved against the shared controls table)
+        const controls = (data.controls || [])
+            .filter(id => controlsById[id])
+            .map(id => Object.assign({id: id}, controlsById[id]));
+        if (controls.length > 0) {
             const controlsDiv = document.createElement("div");
             controlsDiv.className = "controls-list";
             controlsDiv.innerHTML = `<strong>Recommended Controls:</strong>`;
 
-            data.controls.forEach((ctrl, index) => {
+            controls.forEach((ctrl, index) => {
                 const levelClass = `control-level-${ctrl.level}`;
                 const levelLabel = ctrl.level === 0 ? 'Cardinal' : ctrl.level === 1 ? 'Standard' : 'Best Practice';
 
@@ -175,9 +218,42 @@ document.addEventListener('DOMContentLoaded', async function() {
 
             holderEl.appendChild(controlsDiv);
         }
+    }
+
+    // Row formatter to add expandable details, fetched the first time the row is expanded
+    function rowFormatter(row) {
+        const data = row.getData();
+
+        // Create element to hold expanded content
+        const holderEl = document.createElement("div");
+        holderEl.style.boxSizing = "border-box";
+        holderEl.style.padding = "10px 20px";
+        holderEl.style.borderTop = "1px solid #ddd";
+        holderEl.style.borderBottom = "1px solid #ddd";
+        holderEl.style.background = "#fafafa";
+        holderEl.style.display = "none"; // Hidden by default
 
         row.getElement().appendChild(holderEl);
 
+        let detailsLoaded = false;
+        function loadDetails() {
+            if (detailsLoaded) {
+                return;
+            }
+            detailsLoaded = true;
+            holderEl.innerHTML = `<em>Loading details...</em>`;
+            Promise.all([loadJson(`risks/${data.id}.json`), loadJson('controls.json')])
+                .then(([details, controlsById]) => {
+                    holderEl.innerHTML = '';
+                    renderDetails(holderEl, details, controlsById);
+                })
+                .catch(error => {
+                    detailsLoaded = false;
+                    holderEl.innerHTML = `<em>Could not load details for ${data.id}. Collapse and expand the row to retry.</em>`;
+                    console.error(error);
+                });
+        }
+
         // Add click handler to toggle row expansion
         let isExpanded = false;
         row.getElement().addEventListener('click', function(e) {
@@ -188,6 +264,9 @@ document.addEventListener('DOMContentLoaded', async function() {
 
             isExpanded = !isExpanded;
             holderEl.style.display = isExpanded ? 'block' : 'none';
+            if (isExpanded) {
+                loadDetails();
+            }
 
             // Update expand icon
             const expandIcon = row.getElement().querySelector('.risk-expand-icon');
@@ -295,34 +374,32 @@ document.addEventListener('DOMContentLoaded', async function() {
         rowFormatter: rowFormatter
     });
 
-    // Function to update stats based on visible rows
-    updateStats = function() {
-        const statsDiv = document.getElementById('stats-summary');
-        const visibleData = table.getData("active"); // Get filtered data
-        
-        // Count unique elements and unique controls from visible risks
-        const uniqueElements = [...new Set(visibleData.map(r => r.element_category))].length;
-        
-        // Count unique control IDs (not sum of control_count, since controls can be shared)
-        const allControlIds = new Set();
-        visibleData.forEach(risk => {
-            if (risk.controls && Array.isArray(risk.controls)) {
-                risk.controls.forEach(ctrl => {
-                    if (ctrl.id) {
-                        allControlIds.add(ctrl.id);
-                    }
-                });
+    // Number of values of a facet held by at least one risk in the set
+    function countFacetValues(facet, bits) {
+        let count = 0;
+        facet.forEach(valueBits => {
+            if (intersects(valueBits, bits)) {
+                count++;
             }
         });
-        const uniqueControls = allControlIds.size;
-        
+        return count;
+    }
+
+    // Update stats for the set of visible risks from the facet bitsets, without scanning rows
+    function updateStats(visible) {
+        const statsDiv = document.getElementById('stats-summary');
+
+        // Unique elements and controls (not sum of control_count, since controls can be shared)
+        const uniqueElements = countFacetValues(facets.element_category, visible);
+        const uniqueControls = countFacetValues(facets.controls, visible);
+
         statsDiv.innerHTML = `
             <div class="stat-card">
                 <h4>${uniqueElements}</h4>
                 <p>System Elements</p>
             </div>
             <div class="stat-card">
-                <h4>${visibleData.length}</h4>
+                <h4>${popcount(visible)}</h4>
                 <p>Total Risks</p>
             </div>
             <div class="stat-card">
@@ -330,69 +407,147 @@ document.addEventListener('DOMContentLoaded', async function() {
                 <p>Total Controls</p>
             </div>
         `;
-    };
+    }
+
+    // Initial stats display
+    updateStats(allRisks);
+
+    // Split text into normalized search tokens
+    // (must stay in sync with tokenize() in scripts/build_risk_register.py)
+    function tokenize(text) {
+        return text.normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase().match(/[a-z0-9]+/g) || [];
+    }
+
+    // Inverted search index built at docs build time:
+    // {ids: [risk IDs], stopwords: [...], tokens: {token: [positions in ids]}} with sorted tokens
+    let searchIndex = null;
+
+    async function loadSearchIndex() {
+        if (!searchIndex) {
+            const index = await loadJson('search-index.json');
+            searchIndex = {
+                ids: index.ids,
+                stopwords: new Set(index.stopwords),
+                tokens: Object.keys(index.tokens).sort(),
+                postings: index.tokens
+            };
+        }
+        return searchIndex;
+    }
+
+    // Prefetch the search index once the table is up, so the first search is instant
+    loadSearchIndex().catch(error => console.error(error));
+
+    // Risk IDs indexed under any token starting with prefix (binary search over sorted tokens)
+    function prefixMatches(index, prefix) {
+        let low = 0;
+        let high = index.tokens.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (index.tokens[mid] < prefix) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        const ids = new Set();
+        for (let i = low; i < index.tokens.length && index.tokens[i].startsWith(prefix); i++) {
+            index.postings[index.tokens[i]].forEach(position => ids.add(index.ids[position]));
+        }
+        return ids;
+    }
 
-    // Initial stats display - wait for table to fully initialize
-    setTimeout(updateStats, 100);
+    // Risk IDs matching every word of the query (each word as a prefix), or null for no search
+    function searchRisks(index, query) {
+        const terms = [...new Set(tokenize(query))].filter(term => !index.stopwords.has(term));
+        if (terms.length === 0) {
+            return null;
+        }
+        let matches = null;
+        for (const term of terms) {
+            const termMatches = prefixMatches(index, term);
+            matches = matches === null ? termMatches : new Set([...matches].filter(id => termMatches.has(id)));
+            if (matches.size === 0) {
+                break;
+            }
+        }
+        return matches;
+    }
 
     // Filter functions
-    function applyFilters() {
+    async function applyFilters() {
         const elementCategory = document.getElementById('element-filter').value;
         const failureMode = document.getElementById('failure-filter').value;
         const riskType = document.getElementById('type-filter').value;
-        const searchTerm = document.getElementById('search-filter').value.toLowerCase().trim();
+        const searchTerm = document.getElementById('search-filter').value.trim();
 
-        // Use a single custom filter function for all filters
-        table.setFilter(function(data) {
-            // Element category filter
-            if (elementCategory && data.element_category !== elementCategory) {
-                return false;
-            }
-            
-            // Failure mode filter
-            if (failureMode && data.failure_mode !== failureMode) {
-                return false;
+        // Combine the filters by intersecting risk bitsets
+        const visible = Uint32Array.from(allRisks);
+        function restrictTo(bits) {
+            for (let i = 0; i < bitsetWords; i++) {
+                visible[i] &= bits ? bits[i] : 0;
             }
-            
-            // Risk type filter
-            if (riskType && (!data.type || !data.type.includes(riskType))) {
-                return false;
+        }
+        if (elementCategory) {
+            restrictTo(facets.element_category.get(elementCategory));
+        }
+        if (failureMode) {
+            restrictTo(facets.failure_mode.get(failureMode));
+        }
+        if (riskType) {
+            restrictTo(facets.type.get(riskType));
+        }
+
+        // Resolve the search to a set of risk IDs once, instead of scanning text per row
+        let searchMatches = null;
+        if (searchTerm) {
+            try {
+                searchMatches = searchRisks(await loadSearchIndex(), searchTerm);
+            } catch (error) {
+                // Index unavailable: fall back to matching the columns already loaded
+                console.error(error);
+                const term = searchTerm.toLowerCase();
+                searchMatches = new Set(data.risks
+                    .filter(risk => (risk.id + ' ' + risk.statement).toLowerCase().includes(term))
+                    .map(risk => risk.id));
             }
-            
-            // Search filter
-            if (searchTerm) {
-                const statement = (data.statement || '').toLowerCase();
-                const description = (data.description || '').toLowerCase();
-                const wogDescription = (data.wog_description || '').toLowerCase();
-                const id = (data.id || '').toLowerCase();
-                if (!statement.includes(searchTerm) &&
-                    !description.includes(searchTerm) &&
-                    !wogDescription.includes(searchTerm) &&
-                    !id.includes(searchTerm)) {
-                    return false;
-                }
+            // Ignore this call if the search box changed while the index was loading
+            if (document.getElementById('search-filter').value.trim() !== searchTerm) {
+                return;
             }
-            
-            return true;
-        });
-        
-        // Update stats after filter is applied
-        setTimeout(updateStats, 50);
+        }
+
+        if (searchMatches) {
+            restrictTo(bitsetOf([...searchMatches].map(id => riskPosition.get(id))));
+        }
+
+        // Each row is a single bit test against the combined set
+        table.setFilter(data => hasBit(visible, riskPosition.get(data.id)));
+        updateStats(visible);
+    }
+
+    // Re-filter once typing pauses rather than on every keystroke
+    const SEARCH_DEBOUNCE_MS = 150;
+    let searchTimer = null;
+    function applyFiltersDebounced() {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(applyFilters, SEARCH_DEBOUNCE_MS);
     }
 
     // Add filter event listeners
     document.getElementById('element-filter').addEventListener('change', applyFilters);
     document.getElementById('failure-filter').addEventListener('change', applyFilters);
     document.getElementById('type-filter').addEventListener('change', applyFilters);
-    document.getElementById('search-filter').addEventListener('input', applyFilters);
+    document.getElementById('search-filter').addEventListener('input', applyFiltersDebounced);
 
     // Clear filters
     document.getElementById('clear-filters').addEventListener('click', function() {
+        clearTimeout(searchTimer);
         document.getElementById('element-filter').value = '';
         document.getElementById('failure-filter').value = '';
         document.getElementById('type-filter').value = '';
         document.getElementById('search-filter').value = '';
         table.clearFilter();
-        setTimeout(updateStats, 50);
+        updateStats(allRisks);
     });
 });
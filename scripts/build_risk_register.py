@@ -4,105 +4,142 @@ Build script to convert YAML data to JSON for interactive risk register.
 This merges risks, controls, capabilities, components, and design elements.
 """
 
-import yaml
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import time
+import unicodedata
 import json
+from dataclasses import asdict
 from pathlib import Path
 
 # Define paths
 DATA_DIR = Path(__file__).parent.parent / 'arc-risk-register'
 DOCS_DIR = Path(__file__).parent.parent / 'docs'
-OUTPUT_FILE = DOCS_DIR / 'assets' / 'risk_register_data.json'
+APP_DIR = Path(__file__).parent.parent / 'app'
 
-def load_yaml(filename):
-    """Load a YAML file and return the data."""
-    with open(DATA_DIR / filename, 'r') as f:
-        return yaml.safe_load(f)
+# Register loading, validation and the SQLite output use the app's core modules
+sys.path.insert(0, str(APP_DIR))
+from core import register_compiler, register_db, register_loader  # noqa: E402
+from core.diagnostics import Diagnostics  # noqa: E402
 
-def build_risk_register_data():
-    """Build the complete risk register data structure."""
+# Data files for the interactive risk register, fetched by docs/assets/risk-register.js:
+#   index.json         - table columns for every risk, plus metadata and facets (loaded on page load)
+#   controls.json      - every control, keyed by ID (loaded when a row is first expanded)
+#   risks/<ID>.json    - per-risk details, referencing controls by ID (loaded on expansion)
+#   search-index.json  - inverted index of search tokens -> risks (prefetched after first paint)
+OUTPUT_DIR = DOCS_DIR / 'assets' / 'risk-register'
 
-    # Load all data sources (WoG versions)
-    risks = load_yaml('risks-wog.yaml')
-    controls = load_yaml('controls-wog.yaml')
-    capabilities = load_yaml('capabilities-wog.yaml')
-    components = load_yaml('components.yaml')
-    design = load_yaml('design.yaml')
+# Hashes of the inputs, the outputs and every risk/control/element from the
+# last build. Dot-prefixed so MkDocs does not publish it.
+MANIFEST_FILE = DOCS_DIR / 'assets' / '.risk_register_manifest.json'
+MANIFEST_FORMAT = 3
 
-    # Create element lookup (components + design + capabilities)
-    elements = {}
+# Separators for minified JSON output
+COMPACT = (',', ':')
 
-    # Add components with hierarchical category
-    for comp_id, comp_data in components.items():
-        comp_name = comp_data.get('name', '')
-        elements[comp_id] = {
-            'id': comp_id,
-            'name': comp_name,
-            'category': f'Component - {comp_name}',
-            'description': comp_data.get('description', '')
-        }
+# Words left out of the search index; risk-register.js drops them from queries too
+SEARCH_STOPWORDS = (
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'into',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'were',
+    'which', 'with',
+)
 
-    # Add design elements with hierarchical category
-    for design_id, design_data in design.items():
-        design_name = design_data.get('name', '')
-        elements[design_id] = {
-            'id': design_id,
-            'name': design_name,
-            'category': f'Design - {design_name}',
-            'description': design_data.get('description', '')
-        }
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Register variant the docs are built from (see app/core/register_loader.py)
+REGISTER_VARIANT = register_loader.get_variant('wog')
+
+def load_model():
+    """Load, compile and map the WoG register.
+
+    Uses the app's register loader, so the docs and the app parse the YAML
+    files and resolve references the same way.
+
+    Raises:
+        RuntimeError: If a source file could not be loaded
+    """
+    diagnostics = Diagnostics(stage="build")
+    model = register_loader.load_register_model(REGISTER_VARIANT.name, str(DATA_DIR), diagnostics)
+    if model is None:
+        raise RuntimeError("; ".join(diagnostic.message for diagnostic in diagnostics))
+    return model
+
+def build_risk_register_data(model=None):
+    """Build the complete risk register data structure.
 
-    # Add capabilities with hierarchical category (use wog_adapted_description)
-    for cap_id, cap_data in capabilities.items():
-        cap_category = cap_data.get('category', 'Capability')
-        elements[cap_id] = {
-            'id': cap_id,
-            'name': cap_data.get('name', ''),
-            'category': f'Capability - {cap_category}',
-            'description': cap_data.get('wog_adapted_description', cap_data.get('description', ''))
+    Args:
+        model: RegisterModel from load_model() (loaded and checked if omitted)
+
+    Raises:
+        RegisterValidationError: If model is omitted and the register has errors
+    """
+    if model is None:
+        model = load_model()
+        register_compiler.check_issues(model.issues)
+
+    # Create element lookup (components + design + capabilities) with hierarchical categories
+    elements = {}
+    for comp in model.components.values():
+        elements[comp.id] = {
+            'id': comp.id,
+            'name': comp.name,
+            'category': f'Component - {comp.name}',
+            'description': comp.description
+        }
+    for design in model.design.values():
+        elements[design.id] = {
+            'id': design.id,
+            'name': design.name,
+            'category': f'Design - {design.name}',
+            'description': design.description
+        }
+    for cap in model.capabilities.values():
+        elements[cap.id] = {
+            'id': cap.id,
+            'name': cap.name,
+            'category': f'Capability - {cap.category or "Capability"}',
+            'description': cap.description,
+            'wog_examples': list(cap.wog_examples)
         }
 
     # Build enriched risk data
     enriched_risks = []
 
-    for risk_id, risk_data in risks.items():
-        element_id = risk_data.get('element_id', '')
-
-        # Try to find element with exact match first, then try normalized versions
+    for risk in model.risks.values():
+        # A WoG risk arises from a single element
+        element_id = risk.element_ids[0] if risk.element_ids else ''
         element_info = elements.get(element_id, {})
-        if not element_info and element_id:
-            # Try zero-padded version (CMP-1 -> CMP-01)
-            if '-' in element_id:
-                prefix, number = element_id.split('-')
-                normalized_id = f"{prefix}-{number.zfill(2)}"
-                element_info = elements.get(normalized_id, {})
 
         # Get control details
-        control_ids = risk_data.get('controls', [])
         control_details = []
-        for ctrl_id in control_ids:
-            if ctrl_id in controls:
-                ctrl = controls[ctrl_id]
-                control_details.append({
-                    'id': ctrl_id,
-                    'level': ctrl.get('level', ''),
-                    'statement': ctrl.get('statement', ''),
-                    'recommendations': ctrl.get('recommendations', ''),
-                    'references': ctrl.get('references', []) if ctrl.get('references') else []
-                })
+        for ctrl_id in risk.controls:
+            ctrl = model.controls[ctrl_id]
+            control_details.append({
+                'id': ctrl_id,
+                'level': ctrl.level if ctrl.level is not None else '',
+                'statement': ctrl.name,
+                'recommendations': ctrl.description,
+                'references': list(ctrl.references)
+            })
 
         enriched_risk = {
-            'id': risk_id,
-            'statement': risk_data.get('statement', ''),
-            'description': risk_data.get('description', ''),
-            'wog_description': risk_data.get('wog_description', ''),
+            'id': risk.id,
+            'statement': risk.name,
+            'description': risk.description,
+            'wog_description': risk.wog_description,
             'element_id': element_id,
             'element_name': element_info.get('name', ''),
             'element_category': element_info.get('category', ''),
-            'failure_mode': risk_data.get('failure_mode', ''),
-            'type': risk_data.get('type', []),
+            'failure_mode': risk.failure_mode,
+            'type': list(risk.types),
             'controls': control_details,
             'control_count': len(control_details),
-            'sources': risk_data.get('sources', [])
+            'sources': list(risk.sources),
+            'wog_examples': list(risk.wog_examples)
         }
 
         enriched_risks.append(enriched_risk)
@@ -112,35 +149,334 @@ def build_risk_register_data():
         'risks': enriched_risks,
         'elements': list(elements.values()),
         'metadata': {
-            'total_risks': len(risks),
-            'total_controls': len(controls),
+            'total_risks': len(model.risks),
+            'total_controls': len(model.controls),
             'total_elements': len(elements),
-            'categories': list(set(e['category'] for e in elements.values())),
-            'failure_modes': list(set(r.get('failure_mode', '') for r in risks.values())),
-            'risk_types': ['Safety', 'Security']
+            'categories': sorted(set(e['category'] for e in elements.values())),
+            'failure_modes': sorted(set(risk.failure_mode for risk in model.risks.values())),
+            'risk_types': ['Safety', 'Security'],
+            'facets': {
+                'element_category': build_facet(enriched_risks, lambda r: [r['element_category']]),
+                'failure_mode': build_facet(enriched_risks, lambda r: [r['failure_mode']]),
+                'type': build_facet(enriched_risks, lambda r: r['type']),
+                'controls': build_facet(enriched_risks, lambda r: [ctrl['id'] for ctrl in r['controls']]),
+            }
         }
     }
 
     return output
 
-def main():
+def build_facet(risks, values_of):
+    """Group risks by the values of one field, for filtering and counts.
+
+    Args:
+        risks: Enriched risks, in output order
+        values_of: Function returning the facet values of a risk (a risk may have several)
+
+    Returns:
+        List of {'value', 'count', 'risks'} sorted by value, where 'risks' holds
+        ascending positions in the risks list
+    """
+    members = {}
+    for position, risk in enumerate(risks):
+        for value in dict.fromkeys(values_of(risk)):
+            members.setdefault(value, []).append(position)
+    return [
+        {'value': value, 'count': len(positions), 'risks': positions}
+        for value, positions in sorted(members.items())
+    ]
+
+def build_web_assets(data):
+    """Split the register data into the files served to risk-register.js.
+
+    Controls are stored once in controls.json and referenced by ID from the
+    risk shards, instead of being repeated inside every risk that uses them.
+
+    Args:
+        data: Output of build_risk_register_data()
+
+    Returns:
+        Dictionary of output path (relative to OUTPUT_DIR) -> minified JSON bytes
+    """
+    def _dump(value):
+        return json.dumps(value, separators=COMPACT, ensure_ascii=False).encode('utf-8')
+
+    index = {
+        'metadata': data['metadata'],
+        'risks': [
+            {
+                'id': risk['id'],
+                'statement': risk['statement'],
+                'element_category': risk['element_category'],
+                'failure_mode': risk['failure_mode'],
+                'type': risk['type'],
+                'control_count': risk['control_count'],
+            }
+            for risk in data['risks']
+        ],
+    }
+    assets = {'index.json': _dump(index)}
+
+    controls = {}
+    for risk in data['risks']:
+        for ctrl in risk['controls']:
+            controls[ctrl['id']] = {key: value for key, value in ctrl.items() if key != 'id'}
+    assets['controls.json'] = _dump(dict(sorted(controls.items())))
+
+    for risk in data['risks']:
+        assets[f"risks/{risk['id']}.json"] = _dump({
+            'id': risk['id'],
+            'description': risk['description'],
+            'wog_description': risk['wog_description'],
+            'element_id': risk['element_id'],
+            'element_name': risk['element_name'],
+            'sources': risk['sources'],
+            'controls': [ctrl['id'] for ctrl in risk['controls']],
+        })
+
+    assets['search-index.json'] = _dump(build_search_index(data['risks']))
+
+    return assets
+
+def tokenize(text):
+    """Split text into normalized search tokens (accents stripped, lowercase, alphanumeric).
+
+    Must stay in sync with tokenize() in docs/assets/risk-register.js.
+    """
+    text = unicodedata.normalize('NFKD', str(text or '')).encode('ascii', 'ignore').decode('ascii')
+    return _TOKEN_RE.findall(text.lower())
+
+def build_search_index(risks):
+    """Build an inverted index of search tokens -> risks.
+
+    Covers each risk's ID, statement, description, WoG description and the
+    statements and recommendations of its controls.
+
+    Args:
+        risks: Enriched risks from build_risk_register_data()
+
+    Returns:
+        {'ids': [risk IDs], 'stopwords': [...], 'tokens': {token: [positions in ids]}}
+        with tokens sorted, so the client can find prefix matches by binary search
+    """
+    stopwords = set(SEARCH_STOPWORDS)
+    postings = {}
+    for position, risk in enumerate(risks):
+        texts = [risk['id'], risk['statement'], risk['description'], risk['wog_description']]
+        for ctrl in risk['controls']:
+            texts.extend((ctrl['statement'], ctrl['recommendations']))
+        for token in set(token for text in texts for token in tokenize(text)):
+            if token not in stopwords:
+                postings.setdefault(token, []).append(position)
+
+    return {
+        'ids': [risk['id'] for risk in risks],
+        'stopwords': list(SEARCH_STOPWORDS),
+        'tokens': {token: postings[token] for token in sorted(postings)},
+    }
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_inputs():
+    """Hash every source file, this script and the modules that build the model (so code changes also trigger a rebuild).
+
+    register_db.py only affects the SQLite database, so it is hashed into that
+    target's source_version (see sqlite_source_version) rather than here.
+    """
+    hashes = {}
+    for filename in REGISTER_VARIANT.files.values():
+        hashes[filename] = hash_bytes((DATA_DIR / filename).read_bytes())
+    hashes['build_risk_register.py'] = hash_bytes(Path(__file__).read_bytes())
+    for module in (register_compiler, register_loader):
+        hashes[Path(module.__file__).name] = hash_bytes(Path(module.__file__).read_bytes())
+    return hashes
+
+def sqlite_source_version(input_hashes):
+    """Return the version recorded in the SQLite database: the inputs plus the database writer."""
+    hashes = dict(input_hashes)
+    hashes[Path(register_db.__file__).name] = hash_bytes(Path(register_db.__file__).read_bytes())
+    return hash_bytes(json.dumps(hashes, sort_keys=True).encode('utf-8'))
+
+def hash_entities(model, data):
+    """Hash each risk, control and element so changes can be reported by ID."""
+    def _hash(entry):
+        return hash_bytes(json.dumps(entry, sort_keys=True, default=str).encode('utf-8'))
+
+    return {
+        'risks': {risk_id: _hash(asdict(risk)) for risk_id, risk in model.risks.items()},
+        'controls': {ctrl_id: _hash(asdict(ctrl)) for ctrl_id, ctrl in model.controls.items()},
+        'elements': {element['id']: _hash(element) for element in data['elements']},
+    }
+
+def diff_entities(previous, current):
+    """Compare entity hashes from two builds.
+
+    Returns:
+        {kind: {'added': [...], 'removed': [...], 'modified': [...]}} for kinds with changes
+    """
+    changes = {}
+    for kind, hashes in current.items():
+        before = previous.get(kind, {})
+        kind_changes = {
+            'added': sorted(set(hashes) - set(before)),
+            'removed': sorted(set(before) - set(hashes)),
+            'modified': sorted(entity_id for entity_id in hashes
+                               if entity_id in before and before[entity_id] != hashes[entity_id]),
+        }
+        if any(kind_changes.values()):
+            changes[kind] = kind_changes
+    return changes
+
+def load_manifest():
+    """Return the manifest from the previous build, or None."""
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+        return None
+    return manifest
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def is_up_to_date(manifest, input_hashes):
+    """Whether the inputs and every generated file still match the manifest."""
+    if manifest is None or manifest.get('inputs') != input_hashes or not manifest.get('outputs'):
+        return False
+    try:
+        return all(hash_bytes((OUTPUT_DIR / name).read_bytes()) == digest
+                   for name, digest in manifest['outputs'].items())
+    except OSError:
+        return False
+
+def write_outputs(assets, previous_outputs):
+    """Write changed output files and remove ones that are no longer produced.
+
+    Args:
+        assets: Relative path -> bytes, from build_web_assets()
+        previous_outputs: Relative path -> hash from the previous manifest
+
+    Returns:
+        Tuple of (files written, files removed)
+    """
+    written = 0
+    for name, content in assets.items():
+        path = OUTPUT_DIR / name
+        try:
+            if path.read_bytes() == content:
+                continue
+        except OSError:
+            pass
+        write_atomic(path, content)
+        written += 1
+
+    removed = 0
+    for name in set(previous_outputs) - set(assets):
+        try:
+            (OUTPUT_DIR / name).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return written, removed
+
+def main(argv=None):
     """Main execution."""
+    parser = argparse.ArgumentParser(description="Build the docs/assets/risk-register/ data files from the WoG YAML files.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the inputs are unchanged")
+    parser.add_argument('--sqlite', nargs='?', const=register_db.default_db_path(), metavar='PATH',
+                        help="Also write the register to a SQLite/FTS5 database "
+                             "(default path: %(const)s)")
+    parser.add_argument('--strict', action='store_true',
+                        help="Fail on register warnings (e.g. back-reference mismatches), not just errors")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    input_hashes = hash_inputs()
+    manifest = load_manifest()
+    source_version = sqlite_source_version(input_hashes) if args.sqlite is not None else None
+
+    db_up_to_date = args.sqlite is None or (
+        (register_db.read_db_meta(args.sqlite) or {}).get('source_version') == source_version)
+    if (not args.force and db_up_to_date and is_up_to_date(manifest, input_hashes)
+            and not (args.strict and manifest.get('warnings'))):
+        print(f"✓ Risk register data is up to date ({(time.perf_counter() - started) * 1000:.1f} ms)")
+        return 0
+
     print("Building risk register data...")
 
-    # Ensure output directory exists
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    # Validate every cross-reference before writing anything
+    try:
+        model = load_model()
+    except RuntimeError as e:
+        print(f"✗ Could not load the register, nothing was written\n{e}")
+        return 1
+    try:
+        register_compiler.check_issues(model.issues, strict=args.strict)
+    except register_compiler.RegisterValidationError as e:
+        print(f"✗ Register validation failed, nothing was written\n{e}")
+        return 1
+    if model.issues:
+        print(register_compiler.format_report(model.issues))
+    if model.normalized:
+        print(f"  Normalized {model.normalized} reference(s) to canonical IDs")
 
     # Build data
-    data = build_risk_register_data()
+    data = build_risk_register_data(model)
+    assets = build_web_assets(data)
+    entities = hash_entities(model, data)
+
+    # Write files only when they changed, so unchanged builds do not bust caches
+    written, removed = write_outputs(assets, (manifest or {}).get('outputs', {}))
 
-    # Write JSON
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_atomic(MANIFEST_FILE, json.dumps({
+        'format': MANIFEST_FORMAT,
+        'inputs': input_hashes,
+        'outputs': {name: hash_bytes(content) for name, content in assets.items()},
+        'entities': entities,
+        'warnings': len(model.issues),
+    }, indent=2, sort_keys=True).encode('utf-8'))
 
-    print(f"✓ Generated {OUTPUT_FILE}")
+    print(f"✓ Generated {OUTPUT_DIR} ({written} of {len(assets)} files written, {removed} removed)")
+    print(f"  - index.json: {len(assets['index.json']) / 1024:.1f} KB")
     print(f"  - {data['metadata']['total_risks']} risks")
     print(f"  - {data['metadata']['total_controls']} controls")
     print(f"  - {data['metadata']['total_elements']} elements")
 
+    # Report what changed since the previous build
+    if manifest is None:
+        print("  No previous build manifest; change report skipped")
+    else:
+        changes = diff_entities(manifest.get('entities', {}), entities)
+        if not changes:
+            print("  No risks, controls or elements changed")
+        for kind, kind_changes in changes.items():
+            for change, entity_ids in kind_changes.items():
+                if entity_ids:
+                    print(f"  {kind} {change} ({len(entity_ids)}): {', '.join(entity_ids)}")
+
+    if args.sqlite is not None:
+        if args.force or not db_up_to_date:
+            register_db.write_register_db(args.sqlite, data, source_version)
+            print(f"✓ Generated {args.sqlite}")
+        else:
+            print(f"✓ {args.sqlite} is up to date")
+
+    print(f"  Built in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return 0
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())